@@ -0,0 +1,49 @@
+"""
+Module API (routes serveur).
+
+Ce module expose des données calculées par le DataManager en JSON, pour les
+traitements de reporting, via le serveur Flask sous-jacent à Dash :
+1. GET /api/correlations : matrice de corrélation des métriques.
+   Paramètres (optionnels) : country, tag, platform (TikTok / YouTube), source (totals / history).
+"""
+
+import numpy as np
+from flask import jsonify, request
+
+from functions import data_manager
+
+CORRELATION_SOURCES = ("totals", "history")
+
+def register_api_routes(app):
+    """
+    Enregistre les routes API sur le serveur Flask de l'application.
+    Doit être appelé dans app.py après l'initialisation de l'app.
+    """
+    server = app.server
+
+    @server.route("/api/correlations")
+    def api_correlations():
+        """Matrice de corrélation (mise en cache par le DataManager) pour les filtres demandés."""
+        country = request.args.get("country", "all")
+        tag = request.args.get("tag", "all")
+        platform = request.args.get("platform", "all")
+        source = request.args.get("source", "totals")
+
+        if source not in CORRELATION_SOURCES:
+            return jsonify({"error": f"source doit valoir {' ou '.join(CORRELATION_SOURCES)}"}), 400
+        if platform != "all" and platform not in data_manager.home_platforms:
+            return jsonify({"error": f"plateforme inconnue : {platform}"}), 400
+        if country != "all" and country not in data_manager.get_unique_values("country"):
+            return jsonify({"error": f"pays inconnu : {country}"}), 400
+        if tag != "all" and tag not in data_manager.get_unique_values("tags"):
+            return jsonify({"error": f"tag inconnu : {tag}"}), 400
+
+        result = data_manager.get_correlation_matrix(country, tag, platform, source)
+        return jsonify({
+            "filters": {"country": country, "tag": tag, "platform": platform, "source": source},
+            "metrics": result["metrics"],
+            "labels": result["labels"],
+            "n": result["n"],
+            # NaN (corrélation indéfinie) -> null en JSON
+            "matrix": [[None if np.isnan(v) else round(float(v), 4) for v in row] for row in result["matrix"]],
+        })
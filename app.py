@@ -5,6 +5,7 @@ Ce module gère :
 1. L'initialisation de l'application.
 2. La structure globale (Layout) incluant la barre de navigation et le pied de page.
 3. La gestion des Stores (mémoire locale) pour l'authentification et les favoris.
+4. L'enregistrement des callbacks d'authentification et des routes API.
 """
 
 import dash
@@ -14,6 +15,9 @@ import dash_bootstrap_components as dbc
 # Import des données
 from constants import ALL_CREATORS
 
+# Import des routes API (reporting)
+from api import register_api_routes
+
 # Import du module d’authentification
 # On importe auth_status pour l'utiliser directement dans le layout
 from auth import (
@@ -77,6 +81,8 @@ def create_navbar():
                         dbc.NavLink("Accueil", href="/", active="exact", class_name="navbar-link"),
                         dbc.NavLink("Recherche", href="/search", active="exact", class_name="navbar-link"),
                         dbc.NavLink("Découverte", href="/discover", active="exact", class_name="navbar-link"),
+                        dbc.NavLink("Vidéos", href="/videos", active="exact", class_name="navbar-link"),
+                        dbc.NavLink("Corrélations", href="/correlations", active="exact", class_name="navbar-link"),
                         dbc.NavLink("Mes Favoris", href="/favorites", active="exact", class_name="navbar-link"),
                     ],
                     navbar=True,
@@ -173,6 +179,7 @@ app.layout = html.Div(
 # ============================================================
 
 register_auth_callbacks(app)
+register_api_routes(app)
 
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
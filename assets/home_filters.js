@@ -0,0 +1,190 @@
+// assets/home_filters.js
+// Gestion côté client des filtres de l'accueil (plateforme, thèmes, pays).
+// Les badges et pilules sont construits à partir du payload JSON envoyé avec le layout
+// (store "home-filter-payload") : aucun aller-retour serveur pour l'état de l'interface.
+
+(function() {
+    const noUpdate = () => window.dash_clientside.no_update;
+
+    // Équivalent JSON d'un composant Dash (html.Span, dbc.Button...)
+    function component(type, namespace, props) {
+        return {type: type, namespace: namespace, props: props};
+    }
+
+    function toggle(list, value) {
+        return list.includes(value) ? list.filter(v => v !== value) : list.concat([value]);
+    }
+
+    function selectableBadge(text, typeId, idKey, isSelected) {
+        return component("Button", "dash_bootstrap_components", {
+            children: text,
+            id: Object.assign({type: typeId}, idKey),
+            className: isSelected ? "theme-badge selected" : "theme-badge",
+            n_clicks: 0,
+            size: "sm"
+        });
+    }
+
+    function filterPill(labelPrefix, value, kind, filterValue) {
+        return component("Span", "dash_html_components", {
+            className: "platform-filter-badge",
+            children: [
+                labelPrefix + " : " + value,
+                component("Span", "dash_html_components", {
+                    children: " ✕",
+                    id: {type: "remove-filter", kind: kind, value: filterValue},
+                    className: "filter-close ms-2"
+                })
+            ]
+        });
+    }
+
+    // Identifiant du composant déclencheur (objet pour les IDs pattern-matching)
+    function triggeredId() {
+        const triggered = window.dash_clientside.callback_context.triggered || [];
+        if (!triggered.length || !triggered[0].prop_id || triggered[0].prop_id === ".") {
+            return {id: null, value: null};
+        }
+        const propId = triggered[0].prop_id;
+        const rawId = propId.slice(0, propId.lastIndexOf("."));
+        return {
+            id: rawId.startsWith("{") ? JSON.parse(rawId) : rawId,
+            value: triggered[0].value,
+            propId: propId
+        };
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        home: {
+            platformStyle: function(platform) {
+                const base = "platform-option";
+                return [
+                    platform === "TikTok" ? base + " selected" : base,
+                    platform === "YouTube" ? base + " selected" : base
+                ];
+            },
+
+            themeBadges: function(selected, payload) {
+                selected = selected || [];
+                return (payload.themes || []).map(
+                    t => selectableBadge(t, "theme-badge", {name: t}, selected.includes(t))
+                );
+            },
+
+            countryBadges: function(selected, payload) {
+                selected = selected || [];
+                return (payload.top_countries || []).map(
+                    c => selectableBadge(c.name, "country-badge", {iso: c.iso}, selected.includes(c.iso))
+                );
+            },
+
+            activeFilters: function(platform, themes, countries, payload) {
+                const names = payload.country_names || {};
+                const pills = [];
+                if (platform && platform !== "all") {
+                    pills.push(filterPill("Plateforme", platform, "platform", platform));
+                }
+                (themes || []).forEach(t => pills.push(filterPill("Thème", t, "theme", t)));
+                // L'ISO sert de valeur pour permettre la suppression correcte
+                (countries || []).forEach(iso => pills.push(filterPill("Pays", names[iso] || iso, "country", iso)));
+                if (!pills.length) {
+                    return component("Span", "dash_html_components", {
+                        children: "Aucun filtre appliqué", className: "text-muted small"
+                    });
+                }
+                return pills;
+            },
+
+            // Changement d'indicateur de la carte à partir des colonnes déjà reçues (sans serveur)
+            mapIndicator: function(indicator, mapData, figure) {
+                const column = mapData && mapData.columns && mapData.columns[indicator];
+                if (!column || !figure || !figure.data || !figure.data.length) {
+                    return noUpdate();
+                }
+                const trace = Object.assign({}, figure.data[0], {z: column.z, customdata: column.customdata});
+                const coloraxis = Object.assign({}, figure.layout.coloraxis, {
+                    cmin: column.cmin,
+                    cmax: column.cmax,
+                    colorbar: Object.assign({}, (figure.layout.coloraxis || {}).colorbar, {
+                        title: {text: mapData.labels[indicator] || indicator}
+                    })
+                });
+                return Object.assign({}, figure, {
+                    data: [trace].concat(figure.data.slice(1)),
+                    layout: Object.assign({}, figure.layout, {coloraxis: coloraxis})
+                });
+            },
+
+            // Exploration géographique : nœud courant (monde, région ou pays)
+            drillState: function(mapClick, nodeClicks, drillMode, drill) {
+                const trig = triggeredId();
+                if (trig.id === null) {
+                    return noUpdate();
+                }
+                if (trig.id === "world-map") {
+                    const point = mapClick && mapClick.points && mapClick.points[0];
+                    if (!drillMode || !point || !point.location) {
+                        return noUpdate();
+                    }
+                    return {level: "country", key: point.location};
+                }
+                if (trig.id.type === "drill-node" && trig.value) {
+                    return {level: trig.id.level, key: trig.id.key};
+                }
+                return noUpdate();
+            },
+
+            manageFilters: function(tkClick, ytClick, clearClick, rmClick, themeClick, countryClick, mapClick,
+                                    platform, themes, countries, drillMode) {
+                platform = platform || "all";
+                themes = themes || [];
+                countries = countries || [];
+
+                const trig = triggeredId();
+                if (trig.id === null) {
+                    return noUpdate();
+                }
+                // Pattern-matching : un composant recréé (n_clicks à 0) ne compte pas comme un clic
+                if (trig.propId.endsWith(".n_clicks") && !trig.value) {
+                    return noUpdate();
+                }
+
+                if (trig.id === "clear-filters") {
+                    return ["all", [], []];
+                }
+                if (trig.id === "select-tiktok") {
+                    return [platform !== "TikTok" ? "TikTok" : "all", themes, countries];
+                }
+                if (trig.id === "select-youtube") {
+                    return [platform !== "YouTube" ? "YouTube" : "all", themes, countries];
+                }
+                if (trig.id === "world-map") {
+                    const point = mapClick && mapClick.points && mapClick.points[0];
+                    // En mode exploration, le clic sur la carte ouvre le pays au lieu de filtrer
+                    if (drillMode || !point || !point.location) {
+                        return noUpdate();
+                    }
+                    return [platform, themes, toggle(countries, point.location)];
+                }
+
+                const kind = trig.id.type;
+                if (kind === "remove-filter") {
+                    if (trig.id.kind === "platform") {
+                        platform = "all";
+                    } else if (trig.id.kind === "theme") {
+                        themes = themes.filter(t => t !== trig.id.value);
+                    } else if (trig.id.kind === "country") {
+                        countries = countries.filter(c => c !== trig.id.value);
+                    }
+                } else if (kind === "theme-badge" && trig.id.name) {
+                    themes = toggle(themes, trig.id.name);
+                } else if (kind === "country-badge" && trig.id.iso) {
+                    countries = toggle(countries, trig.id.iso);
+                } else {
+                    return noUpdate();
+                }
+                return [platform, themes, countries];
+            }
+        }
+    });
+})();
@@ -3,6 +3,34 @@
 # Noms de mois pour les graphiques
 MONTH_NAMES = ["Jan", "Fév", "Mar", "Avr", "Mai", "Jun", "Jul", "Aoû", "Sep", "Oct", "Nov", "Déc"]
 
+# Date du premier relevé des historiques mensuels (les relevés sans clé "date" sont espacés d'un mois)
+HISTORY_START_DATE = "2024-01-01"
+
+# Métriques suivies dans les historiques
+HISTORY_METRICS = ["views", "likes", "shares", "comments", "followers", "videos"]
+
+# Métriques "jauge" (niveau instantané) : on garde la dernière valeur d'une période.
+# Les autres sont des compteurs : on somme leurs incréments sur la période.
+GAUGE_METRICS = ["followers"]
+
+# Métriques dérivées : formules évaluées sur les métriques de base (voir functions.compile_formula)
+# (ou, avec "growth", taux de croissance d'une métrique sur "window" périodes)
+DERIVED_METRICS = {
+    "engagement_rate": {"label": "Taux d'engagement (%)", "formula": "(likes + shares + comments) / views * 100"},
+    "likes_per_view": {"label": "Likes par vue (%)", "formula": "likes / views * 100"},
+    "shares_per_view": {"label": "Partages par vue (%)", "formula": "shares / views * 100"},
+    "views_per_video": {"label": "Vues par vidéo", "formula": "views / videos"},
+    "follower_growth": {"label": "Croissance abonnés (%)", "growth": "followers", "window": 3},
+}
+
+# Granularités disponibles pour l'axe X de l'analytique
+TIME_GRANULARITIES = {
+    "day": "Temps (Jour)",
+    "week": "Temps (Semaine)",
+    "month": "Temps (Mois)",
+    "quarter": "Temps (Trimestre)",
+}
+
 # ============================================================
 # 1. STATS PAYS (HOME)
 # ============================================================
@@ -48,6 +76,29 @@ COUNTRY_STATS = {
         "theme_split": {"Fitness": 0.25, "Gaming": 0.15, "Lifestyle": 0.25, "Music": 0.15, "Tech": 0.05, "Food": 0.10, "Fashion": 0.05, "Education": 0.00}
     },
 }
+
+# Source des statistiques pays de l'accueil :
+# "creators" = agrégats calculés depuis ALL_CREATORS (cohérents avec /search et /profile),
+# "static" = valeurs saisies à la main dans COUNTRY_STATS
+COUNTRY_STATS_SOURCE = "creators"
+
+# Code ISO-3 des pays tels qu'écrits dans les fiches créateurs
+COUNTRY_ISO = {
+    "France": "FRA", "USA": "USA", "United States": "USA", "Canada": "CAN", "Spain": "ESP",
+    "Germany": "DEU", "Japan": "JPN", "Brazil": "BRA", "United Kingdom": "GBR",
+}
+
+# Archétypes de croissance (pages Découverte / Recherche), du plus dynamique au moins dynamique :
+# clé -> (libellé, icône)
+GROWTH_ARCHETYPES = {
+    "explosive": ("Croissance explosive", "🚀"),
+    "steady": ("Croissance régulière", "📈"),
+    "plateau": ("En plateau", "⏸️"),
+}
+
+# Dossier des calculs persistés (listes de voisins des recommandations), relatif au projet
+CACHE_DIR = ".cache"
+
 THEMES = ["Fitness", "Gaming", "Lifestyle", "Music" , "Tech", "Food", "Fashion", "Education"]
 
 MAP_INDICATORS = {
@@ -65,7 +116,7 @@ ALL_CREATORS = [
     {
         "id": 1, "name": "Lucas FitPro", "username": "@lucas_fitpro", "avatar": "https://ui-avatars.com/api/?name=Lucas+FitPro&background=0D6EFD&color=fff",
         "bio": "Coach sportif. HIIT et nutrition.", "country": "France", "language": "Français", "region": "Europe", "tags": ["Fitness", "Lifestyle"],
-        "added_date": "03/10/2024", "is_new": False, "is_trending": False, "is_favorite": True,
+        "added_date": "03/10/2024", "is_new": False, "is_favorite": True,
         "totals": {"followers": 512000, "views": 27800000, "videos": 350, "likes": 1620000, "shares": 118000, "comments": 60000},
         "platforms": {
             "TikTok": {"active": "oui", "certified": "oui", "followers": 350000, "views": 18000000, "videos": 240, "likes": 1000000, "shares": 80000, "comments": 40000},
@@ -79,7 +130,7 @@ ALL_CREATORS = [
     {
         "id": 2, "name": "Melody Star", "username": "@melody_star", "avatar": "https://ui-avatars.com/api/?name=Melody+Star&background=E91E63&color=fff",
         "bio": "Chanteuse pop et covers.", "country": "USA", "language": "English", "region": "Amérique du Nord", "tags": ["Music"],
-        "added_date": "15/09/2024", "is_new": True, "is_trending": True, "is_favorite": False,
+        "added_date": "15/09/2024", "is_new": True, "is_favorite": False,
         "totals": {"followers": 920000, "views": 58400000, "videos": 190, "likes": 3500000, "shares": 210000, "comments": 120000},
         "platforms": {
             "YouTube": {"active": "oui", "certified": "oui", "followers": 920000, "views": 58400000, "videos": 190, "likes": 3500000, "shares": 210000, "comments": 120000}
@@ -91,7 +142,7 @@ ALL_CREATORS = [
     {
         "id": 3, "name": "TechGuru92", "username": "@techguru92", "avatar": "https://ui-avatars.com/api/?name=Tech+Guru&background=212529&color=fff",
         "bio": "Tests High-Tech et Gaming.", "country": "USA", "language": "English", "region": "Amérique du Nord", "tags": ["Tech", "Gaming"],
-        "added_date": "28/09/2024", "is_new": False, "is_trending": True, "is_favorite": True,
+        "added_date": "28/09/2024", "is_new": False, "is_favorite": True,
         "totals": {"followers": 890000, "views": 45200000, "videos": 156, "likes": 2100000, "shares": 150000, "comments": 80000},
         "platforms": {
             "YouTube": {"active": "oui", "certified": "non", "followers": 890000, "views": 45200000, "videos": 156, "likes": 2100000, "shares": 150000, "comments": 80000}
@@ -103,7 +154,7 @@ ALL_CREATORS = [
     {
         "id": 4, "name": "CuisinePassion", "username": "@cuisine_passion", "avatar": "https://ui-avatars.com/api/?name=Cuisine+Passion&background=FFC107&color=000",
         "bio": "Recettes faciles pour étudiants.", "country": "France", "language": "Français", "region": "Europe", "tags": ["Food", "Lifestyle"],
-        "added_date": "20/09/2024", "is_new": True, "is_trending": False, "is_favorite": False,
+        "added_date": "20/09/2024", "is_new": True, "is_favorite": False,
         "totals": {"followers": 123000, "views": 8700000, "videos": 98, "likes": 500000, "shares": 12000, "comments": 5000},
         "platforms": {
             "TikTok": {"active": "oui", "certified": "non", "followers": 123000, "views": 8700000, "videos": 98, "likes": 500000, "shares": 12000, "comments": 5000}
@@ -115,7 +166,7 @@ ALL_CREATORS = [
     {
         "id": 5, "name": "GamingKing", "username": "@gaming_king_br", "avatar": "https://ui-avatars.com/api/?name=Gaming+King&background=6610f2&color=fff",
         "bio": "Le roi du Battle Royale au Brésil.", "country": "Brazil", "language": "Portuguese", "region": "Amérique du Sud", "tags": ["Gaming"],
-        "added_date": "10/10/2024", "is_new": False, "is_trending": True, "is_favorite": False,
+        "added_date": "10/10/2024", "is_new": False, "is_favorite": False,
         "totals": {"followers": 2500000, "views": 150000000, "videos": 600, "likes": 12000000, "shares": 500000, "comments": 250000},
         "platforms": {
             "YouTube": {"active": "oui", "certified": "oui", "followers": 2500000, "views": 150000000, "videos": 600, "likes": 12000000, "shares": 500000, "comments": 250000}
@@ -127,7 +178,7 @@ ALL_CREATORS = [
     {
         "id": 6, "name": "Sophie Yoga", "username": "@sophie_yoga", "avatar": "https://ui-avatars.com/api/?name=Sophie+Yoga&background=20c997&color=fff",
         "bio": "Bien-être et méditation.", "country": "France", "language": "Français", "region": "Europe", "tags": ["Fitness", "Lifestyle"],
-        "added_date": "01/11/2024", "is_new": True, "is_trending": True, "is_favorite": True,
+        "added_date": "01/11/2024", "is_new": True, "is_favorite": True,
         "totals": {"followers": 45000, "views": 2100000, "videos": 45, "likes": 150000, "shares": 5000, "comments": 3000},
         "platforms": {
             "TikTok": {"active": "oui", "certified": "non", "followers": 45000, "views": 2100000, "videos": 45, "likes": 150000, "shares": 5000, "comments": 3000}
@@ -139,7 +190,7 @@ ALL_CREATORS = [
     {
         "id": 7, "name": "Tokyo Travel", "username": "@tokyo_vlog", "avatar": "https://ui-avatars.com/api/?name=Tokyo+Travel&background=fd7e14&color=fff",
         "bio": "Découverte du Japon authentique.", "country": "Japan", "language": "English", "region": "Asie", "tags": ["Lifestyle", "Education"],
-        "added_date": "12/08/2024", "is_new": False, "is_trending": False, "is_favorite": True,
+        "added_date": "12/08/2024", "is_new": False, "is_favorite": True,
         "totals": {"followers": 320000, "views": 18500000, "videos": 80, "likes": 980000, "shares": 45000, "comments": 15000},
         "platforms": {
             "YouTube": {"active": "oui", "certified": "oui", "followers": 200000, "views": 12000000, "videos": 30, "likes": 600000, "shares": 30000, "comments": 10000},
@@ -153,7 +204,7 @@ ALL_CREATORS = [
     {
         "id": 8, "name": "Science Explain", "username": "@sci_explain", "avatar": "https://ui-avatars.com/api/?name=Science+Ex&background=0dcaf0&color=fff",
         "bio": "La science expliquée simplement.", "country": "United Kingdom", "language": "English", "region": "Europe", "tags": ["Education", "Tech"],
-        "added_date": "05/05/2024", "is_new": False, "is_trending": True, "is_favorite": False,
+        "added_date": "05/05/2024", "is_new": False, "is_favorite": False,
         "totals": {"followers": 670000, "views": 42000000, "videos": 210, "likes": 3100000, "shares": 400000, "comments": 85000},
         "platforms": {
             "TikTok": {"active": "oui", "certified": "oui", "followers": 670000, "views": 42000000, "videos": 210, "likes": 3100000, "shares": 400000, "comments": 85000}
@@ -165,7 +216,7 @@ ALL_CREATORS = [
     {
         "id": 9, "name": "Fashion Spain", "username": "@fashion_es", "avatar": "https://ui-avatars.com/api/?name=Fashion+ES&background=d63384&color=fff",
         "bio": "Mode et tendances 2025.", "country": "Spain", "language": "Spanish", "region": "Europe", "tags": ["Fashion", "Lifestyle"],
-        "added_date": "22/10/2024", "is_new": True, "is_trending": False, "is_favorite": False,
+        "added_date": "22/10/2024", "is_new": True, "is_favorite": False,
         "totals": {"followers": 85000, "views": 3200000, "videos": 120, "likes": 250000, "shares": 10000, "comments": 8000},
         "platforms": {
             "TikTok": {"active": "oui", "certified": "non", "followers": 85000, "views": 3200000, "videos": 120, "likes": 250000, "shares": 10000, "comments": 8000}
@@ -177,7 +228,7 @@ ALL_CREATORS = [
     {
         "id": 10, "name": "Eco Life", "username": "@ecolife_de", "avatar": "https://ui-avatars.com/api/?name=Eco+Life&background=198754&color=fff",
         "bio": "Vivre durablement à Berlin.", "country": "Germany", "language": "German", "region": "Europe", "tags": ["Lifestyle", "Education"],
-        "added_date": "14/06/2024", "is_new": False, "is_trending": False, "is_favorite": True,
+        "added_date": "14/06/2024", "is_new": False, "is_favorite": True,
         "totals": {"followers": 150000, "views": 5600000, "videos": 75, "likes": 420000, "shares": 35000, "comments": 12000},
         "platforms": {
             "YouTube": {"active": "oui", "certified": "non", "followers": 150000, "views": 5600000, "videos": 75, "likes": 420000, "shares": 35000, "comments": 12000}
@@ -188,8 +239,6 @@ ALL_CREATORS = [
     }
 ]
 
-TRENDING_CREATORS = [c for c in ALL_CREATORS if c["is_trending"]]
-
 NEW_CREATORS = [c for c in ALL_CREATORS if c["is_new"]]
 TOP_VIDEOS = {
     "TikTok": [
@@ -209,25 +258,7 @@ TOP_VIDEOS = {
 }
 
 
-# 2. Nouveaux Tags (Pour l'onglet Nouveaux)
-NEW_TAGS = [
-    {"rank": 1, "name": "Micro-Learning", "creators": 45, "growth": "Nouveau"},
-    {"rank": 2, "name": "Slow Travel", "creators": 32, "growth": "Nouveau"},
-    {"rank": 3, "name": "Upcycling Déco", "creators": 28, "growth": "Nouveau"},
-    {"rank": 4, "name": "BookTok Fantasy", "creators": 150, "growth": "Nouveau"},
-]
-
-TRENDING_TOPICS = [
-    {"rank": 1, "name": "Intelligence Artificielle", "creators": 1250, "growth": "+45%"},
-    {"rank": 2, "name": "Cuisine Végétarienne", "creators": 890, "growth": "+32%"},
-    {"rank": 3, "name": "Mode Durable", "creators": 678, "growth": "+67%"},
-    {"rank": 4, "name": "Fitness à Domicile", "creators": 1456, "growth": "+23%"},
-    {"rank": 5, "name": "Art Digital", "creators": 567, "growth": "+78%"},
-    {"rank": 6, "name": "Développement Web", "creators": 789, "growth": "+56%"},
-]
-
 # Agrégats pour la page Découverte
-TRENDING_VIDEOS = TOP_VIDEOS["TikTok"] + TOP_VIDEOS["YouTube"]
 NEW_VIDEOS = TOP_VIDEOS["YouTube"][:2] + TOP_VIDEOS["TikTok"][:2] # Simulation
 
 THEMES_EVOLUTION = [
@@ -5,16 +5,41 @@ Ce module contient :
 1. Des fonctions de formatage et d'aide UI (Helpers).
 2. Des composants Dash réutilisables (Cartes Créateurs, Vidéos, KPIs).
 3. AnalyticsEngine : Classe gérant la création des graphiques Plotly.
-4. DataManager : Classe gérant le filtrage, le tri et l'agrégation des données.
+4. TimeSeriesStore : Historiques en colonnes NumPy, ré-échantillonnés par granularité,
+   et AnomalyDetector (z-scores robustes des variations).
+5. Métriques dérivées : mini-langage de formules compilé en évaluateurs NumPy.
+6. CreatorRollups / CreatorSketches : Agrégats pays / région / thème calculés depuis les créateurs
+   et comptages distincts HyperLogLog.
+7. TrendingEngine / TagTrendCounters : Scores de tendance (vitesse / accélération), top-k par
+   plateforme et tag, et compteurs de tags en fenêtres glissantes.
+8. CurveSimilarityIndex / CreatorRecommender : Créateurs similaires par forme des courbes
+   de croissance et recommandations à partir des favoris.
+9. GrowthArchetypes : Archétypes de croissance (k-means, mises à jour mini-batch).
+10. VideoStore / VideoSearchIndex : Vidéos par créateur et plateforme (index pré-triés par
+    métrique) et recherche plein texte (index inversé, BM25 + vues).
+11. DataManager : Classe gérant le filtrage, le tri et l'agrégation des données.
 """
 
+import os
+import re
+import heapq
+import hashlib
+import tempfile
+import threading
+import unicodedata
+from functools import lru_cache
 from dash import html, dcc
 import dash_bootstrap_components as dbc
 import plotly.graph_objs as go
+from plotly.colors import qualitative
 import numpy as np
 import pandas as pd
 
-from constants import ALL_CREATORS, COUNTRY_STATS, TOP_VIDEOS
+from constants import (
+    ALL_CREATORS, COUNTRY_STATS, COUNTRY_STATS_SOURCE, COUNTRY_ISO, THEMES, TOP_VIDEOS,
+    HISTORY_START_DATE, HISTORY_METRICS, GAUGE_METRICS, TIME_GRANULARITIES, MONTH_NAMES,
+    DERIVED_METRICS, CACHE_DIR, GROWTH_ARCHETYPES
+)
 
 # ==============================================================================
 # 1. HELPERS FORMATAGE & UI
@@ -39,6 +64,88 @@ def short_number(n):
         return (val[:-2] if val.endswith(".0") else val) + "K"
     return str(int(n))
 
+# Mémo des valeurs déjà formatées par short_numbers (vidé au-delà de la taille maximale)
+_SHORT_NUMBER_MEMO = {}
+_SHORT_NUMBER_MEMO_SIZE = 4096
+
+def short_numbers(values):
+    """
+    Version vectorisée de short_number pour un array NumPy, une Series pandas ou une liste.
+    Mêmes règles K/M, appliquées par masques de seuils et formatage groupé (np.char) ;
+    seules les valeurs distinctes encore inconnues du mémo sont formatées.
+    Retourne une liste de chaînes dans l'ordre de l'entrée (valeurs manquantes -> "0").
+    """
+    arr = np.asarray(values, dtype=float).ravel()
+    if arr.size == 0:
+        return []
+    arr = np.where(np.isnan(arr), 0.0, arr)
+    uniques, inverse = np.unique(arr, return_inverse=True)
+
+    keys = uniques.tolist()
+    todo = np.array([k for k in keys if k not in _SHORT_NUMBER_MEMO], dtype=float)
+    if todo.size:
+        mega = todo >= 1_000_000
+        kilo = (todo >= 1_000) & ~mega
+        scaled = np.where(mega, todo / 1_000_000, np.where(kilo, todo / 1_000, todo))
+        # Une seule décimale : ".0" ne peut apparaître qu'en fin de chaîne
+        decimals = np.char.replace(np.char.mod("%.1f", scaled), ".0", "")
+        integers = np.trunc(todo).astype(np.int64).astype(str)
+        text = np.char.add(
+            np.where(mega | kilo, decimals, integers),
+            np.where(mega, "M", np.where(kilo, "K", ""))
+        )
+        if len(_SHORT_NUMBER_MEMO) + todo.size > _SHORT_NUMBER_MEMO_SIZE:
+            _SHORT_NUMBER_MEMO.clear()
+        _SHORT_NUMBER_MEMO.update(zip(todo.tolist(), text.tolist()))
+
+    formatted = [_SHORT_NUMBER_MEMO.get(k) for k in keys]
+    if None in formatted:
+        # Mémo vidé entre-temps : formatage scalaire des manquants
+        formatted = [f if f is not None else short_number(k) for f, k in zip(formatted, keys)]
+    return [formatted[i] for i in inverse.ravel()]
+
+def lttb_indices(x, y, n_out):
+    """
+    Sous-échantillonnage Largest-Triangle-Three-Buckets.
+    Retourne les indices des points à conserver pour garder la forme visuelle
+    de la courbe avec au plus `n_out` points (premier et dernier inclus).
+
+    Args:
+        x (array-like): Abscisses numériques (positions ou timestamps).
+        y (array-like): Ordonnées.
+        n_out (int): Budget de points en sortie.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Découpage des points intérieurs en (n_out - 2) seaux contigus
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    counts = np.diff(edges)
+    # Moyennes de chaque seau calculées en une passe (le dernier point est exclu)
+    means_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    means_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # Pour le seau i, le point "suivant" est la moyenne du seau i+1 (ou le dernier point)
+    next_x = np.append(means_x[1:], x[-1])
+    next_y = np.append(means_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Aire (x2) du triangle formé par le point retenu, chaque candidat et la moyenne suivante
+        areas = np.abs(
+            (x[a] - next_x[i]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y[i] - y[a])
+        )
+        areas = np.where(np.isnan(areas), -1.0, areas)
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
 def get_creator_by_id(cid):
     """Récupère un objet créateur complet via son ID."""
     # Conversion en string pour comparaison robuste
@@ -78,11 +185,11 @@ def render_kpi_card(label, value, icon=None, color="text-dark"):
         ])
     )
 
-def make_stat_span(metric_key, value):
-    """Génère un span avec icône et valeur formatée."""
+def make_stat_span(metric_key, value, formatted=None):
+    """Génère un span avec icône et valeur formatée (`formatted` si déjà calculée en lot)."""
     METRIC_ICONS = {"followers": "👥", "views": "👁️", "likes": "👍", "shares": "↪", "videos": "🎬"}
     icon = METRIC_ICONS.get(metric_key, "")
-    return html.Span(f"{icon} {short_number(value)}", className="me-3")
+    return html.Span(f"{icon} {formatted if formatted is not None else short_number(value)}", className="me-3")
 
 def creator_avatar(c, size_class="creator-avatar"):
     """
@@ -96,7 +203,8 @@ def platform_block(name, stats, mode="search"):
     """
     Affiche un bloc de statistiques pour une plateforme donnée (dans la carte recherche).
     """
-    metrics = ["followers", "views", "likes", "shares", "videos"]
+    metrics = [m for m in ["followers", "views", "likes", "shares", "videos"] if m in stats]
+    formatted = short_numbers([stats.get(m) or 0 for m in metrics])
 
     # En-tête de la plateforme (nom + statut)
     header_children = [
@@ -113,9 +221,8 @@ def platform_block(name, stats, mode="search"):
             html.Div(
                 className="favorite-meta-row",
                 children=[
-                    make_stat_span(m, stats.get(m, 0))
-                    for m in metrics
-                    if m in stats
+                    make_stat_span(m, stats.get(m, 0), text)
+                    for m, text in zip(metrics, formatted)
                 ],
             ),
         ],
@@ -132,6 +239,7 @@ def render_creator_card_search(c, is_favorite=False, mode="search"):
     """
     totals = c.get("totals", {})
     global_metrics = ["followers", "views", "likes", "shares", "videos"]
+    stat_texts = short_numbers([totals.get(m) or 0 for m in global_metrics])
 
     # --- Gestion des Badges ---
     badges = []
@@ -144,7 +252,7 @@ def render_creator_card_search(c, is_favorite=False, mode="search"):
     # Badges New / Tendance / Favori
     if c.get("is_new"): 
         badges.append(html.Span("🆕 New", className="badge bg-info text-dark me-1"))
-    if c.get("is_trending"): 
+    if data_manager.trending.is_trending(c["id"]):
         badges.append(html.Span("🔥 Tendance", className="badge bg-warning text-dark me-1"))
     if is_favorite:
         badges.append(html.Span("❤️ Favori", className="badge bg-danger text-white ms-1"))
@@ -169,7 +277,7 @@ def render_creator_card_search(c, is_favorite=False, mode="search"):
                     ),
                     html.Div(
                         className="favorite-meta-row mt-2", 
-                        children=[make_stat_span(m, totals.get(m, 0)) for m in global_metrics]
+                        children=[make_stat_span(m, totals.get(m, 0), text) for m, text in zip(global_metrics, stat_texts)]
                     ),
                     html.Div(
                         className="creator-tags mt-2", 
@@ -223,10 +331,11 @@ def render_creator_card_compact(c, is_favorite=False):
     """
     totals = c.get("totals", {})
     compact_metrics = ["followers", "views", "likes"] 
+    stat_texts = short_numbers([totals.get(m) or 0 for m in compact_metrics])
     
     badges = []
     if c.get("is_new"): badges.append(html.Span("🆕 New", className="badge bg-info text-dark me-1"))
-    if c.get("is_trending"): badges.append(html.Span("🔥 Tendance", className="badge bg-warning text-dark me-1"))
+    if data_manager.trending.is_trending(c["id"]): badges.append(html.Span("🔥 Tendance", className="badge bg-warning text-dark me-1"))
     if is_favorite: badges.append(html.Span("❤️ Favori", className="badge bg-danger text-white ms-1"))
 
     # Gestion Avatar (Image vs Initiale) via classes CSS
@@ -258,7 +367,7 @@ def render_creator_card_compact(c, is_favorite=False):
                             
                             html.Div(
                                 className="d-flex align-items-center", 
-                                children=[make_stat_span(m, totals.get(m, 0)) for m in compact_metrics]
+                                children=[make_stat_span(m, totals.get(m, 0), text) for m, text in zip(compact_metrics, stat_texts)]
                             ),
                             html.Div(className="mt-1", children=badges)
                         ])
@@ -291,6 +400,7 @@ def render_video_card(video):
         thumb = html.Img(src=video.get("thumbnail"), className="img-fluid rounded-top video-card-thumb")
     else:
         thumb = html.Div("🎬", className="d-flex align-items-center justify-content-center bg-light rounded-top video-card-fallback")
+    views, likes = short_numbers([video.get("views") or 0, video.get("likes") or 0])
     
     return dbc.Card(
         className="h-100 shadow-sm border-0 hover-shadow", 
@@ -306,8 +416,8 @@ def render_video_card(video):
                     ),
                     html.Small(
                         [
-                            html.Span(["👁 ", f"{short_number(video.get('views'))}"], className="me-2"),
-                            html.Span(["👍 ", f"{short_number(video.get('likes'))}"], className="me-2"),
+                            html.Span(["👁 ", views], className="me-2"),
+                            html.Span(["👍 ", likes], className="me-2"),
                         ],
                         className="text-muted"
                     )
@@ -324,10 +434,38 @@ def render_video_card(video):
         ]
     )
 
+def render_anomaly_card(event):
+    """Carte d'alerte pour une anomalie d'historique (Découverte)."""
+    c = event["creator"]
+    is_spike = event["z"] > 0
+    label = {"views": "Vues", "followers": "Abonnés"}.get(event["metric"], event["metric"])
+    delta, median = short_numbers([event["delta"], event["median"]])
+    return dcc.Link(
+        href=f"/profile/{c['id']}",
+        className="text-decoration-none text-inherit",
+        children=dbc.Card(
+            className="mb-3 border shadow-sm hover-shadow h-100",
+            children=dbc.CardBody([
+                html.Div([
+                    html.Span("📈 Pic" if is_spike else "📉 Chute",
+                              className=f"badge {'bg-success' if is_spike else 'bg-danger'} me-2"),
+                    html.Span(c["name"], className="fw-bold text-dark"),
+                ], className="mb-1"),
+                html.Div(
+                    f"{label} · {pd.Timestamp(event['date']):%m/%Y} : {delta} (habituellement {median})",
+                    className="text-muted small"
+                ),
+                html.Div(f"z = {event['z']:+.1f}", className="text-muted small"),
+            ])
+        )
+    )
+
 def render_top_video_card(video, rank):
     """Carte ligne pour les Top Vidéos (Profil)."""
     thumb = html.Img(src=video.get("thumbnail"), className="top-video-thumb") if video.get("thumbnail") else html.Div("🎬", className="top-video-thumb")
     stats = [("👁", video.get('views')), ("👍", video.get('likes')), ("↪", video.get('shares')), ("💬", video.get('comments'))]
+    stats = [(icon, val) for icon, val in stats if val is not None]
+    formatted = short_numbers([val for _, val in stats])
     
     return html.Div(
         className="top-video-card", 
@@ -347,7 +485,7 @@ def render_top_video_card(video, rank):
                     ]),
                     html.Div(
                         className="top-video-stats", 
-                        children=[html.Span(f"{icon} {short_number(val)}") for icon, val in stats if val is not None]
+                        children=[html.Span(f"{icon} {text}") for (icon, _), text in zip(stats, formatted)]
                     )
                 ]
             )
@@ -366,18 +504,57 @@ class AnalyticsEngine:
     def __init__(self):
         self.labels = {
             "views": "Vues", "likes": "Likes", "shares": "Partages", 
-            "comments": "Commentaires", "followers": "Abonnés", "videos": "Vidéos"
+            "comments": "Commentaires", "followers": "Abonnés", "videos": "Vidéos",
+            **{k: d["label"] for k, d in DERIVED_METRICS.items()}
         }
         self.metric_colors = {
             "views": "#0d6efd", "likes": "#dc3545", "shares": "#198754", 
-            "comments": "#ffc107", "followers": "#6f42c1", "videos": "#fd7e14"
+            "comments": "#ffc107", "followers": "#6f42c1", "videos": "#fd7e14",
+            "engagement_rate": "#d63384", "likes_per_view": "#e35d6a", "shares_per_view": "#479f76",
+            "views_per_video": "#20c997", "follower_growth": "#8c68cd"
         }
+        # Budget de points par trace (sous-échantillonnage LTTB selon la largeur du graphique)
+        self.default_width = 800
+        self.points_per_px = 1.0
+        self.min_points = 100
+        # Au-delà de ce nombre de points, rendu WebGL (Scattergl) au lieu de SVG
+        self.webgl_threshold = 1000
+        # Comparaison multi-créateurs : nombre maximal de créateurs superposés et palette
+        self.max_compare = 8
+        self.compare_palette = qualitative.Plotly
+
+    def build_figure(self, creator, mode, x_axis, y_metrics, num, den, platform, advanced, compare_mode=None,
+                     width=None, x_range=None, period=None, formula=None, compare_ids=None):
+        """
+        Construit l'objet go.Figure complet.
 
-    def build_figure(self, creator, mode, x_axis, y_metrics, num, den, platform, advanced, compare_mode=None):
-        """Construit l'objet go.Figure complet."""
+        Args:
+            width (int): Largeur du graphique en pixels (détermine le budget de points).
+            x_range (tuple): Fenêtre visible (zoom) ; les points sont re-sélectionnés
+                en pleine résolution dans cette fenêtre.
+            period (tuple): Plage de mois (start, end) sélectionnée sur le profil, surlignée
+                avec ses totaux.
+            formula (str): Formule personnalisée (mode "formula"), ex: "views / videos".
+            compare_ids (list): Créateurs superposés quand compare_mode == "creators"
+                (au plus `max_compare`).
+        """
         fig = go.Figure()
         advanced = advanced or []
         y_metrics = y_metrics or ["views"]
+        if mode == "formula":
+            try:
+                compile_formula(formula)
+            except ValueError as e:
+                fig.add_annotation(text=f"Formule invalide : {e}", showarrow=False, font=dict(color="#dc3545"))
+                fig.update_layout(template="plotly_white", xaxis_visible=False, yaxis_visible=False)
+                return fig
+        view = {
+            "budget": max(self.min_points, int((width or self.default_width) * self.points_per_px)),
+            "x_range": x_range,
+            "granularity": x_axis if x_axis in TIME_GRANULARITIES else "month",
+            "overlays": [a for a in advanced if parse_overlay(a)],
+            "formula": formula,
+        }
         
         # 1. Groupe de référence (Comparaison)
         ref_group_type = None
@@ -393,7 +570,7 @@ class AnalyticsEngine:
         # 2. Données Créateur
         target_platforms = []
         if platform == "combined":
-            self._process_combined_view(fig, creator, mode, x_axis, y_metrics, num, den, advanced, ref_group_type, ref_value)
+            self._process_combined_view(fig, creator, mode, x_axis, y_metrics, num, den, advanced, ref_group_type, ref_value, view)
         else:
             if platform == "both": 
                 target_platforms = ["youtube", "tiktok"]
@@ -402,84 +579,140 @@ class AnalyticsEngine:
 
             for p_name in target_platforms:
                 # Trace principale
-                history = creator.get("history", {}).get(p_name, [])
-                if not history: continue
+                series = data_manager.get_series(creator["id"], p_name, view["granularity"], view["overlays"])
+                if not series: continue
                 
                 label_prefix = p_name.capitalize()
                 dash_style = "dash" if (platform == "both" and p_name == "tiktok") else "solid"
                 
-                self._add_traces_for_data(fig, history, label_prefix, mode, x_axis, y_metrics, num, den, advanced, dash_style)
+                self._add_traces_for_data(fig, series, label_prefix, mode, x_axis, y_metrics, num, den, advanced, dash_style, view=view)
 
                 # Trace comparaison (si activée)
                 if ref_group_type and ref_value:
-                    avg_history = data_manager.get_average_history(ref_group_type, ref_value, p_name, y_metrics)
-                    if avg_history:
+                    avg_series = data_manager.get_average_history(ref_group_type, ref_value, p_name, granularity=view["granularity"])
+                    if avg_series:
                         avg_prefix = f"Moy. {ref_value} ({label_prefix})"
-                        self._add_traces_for_data(fig, avg_history, avg_prefix, mode, x_axis, y_metrics, num, den, [], "dot", is_comparison=True)
+                        self._add_traces_for_data(fig, avg_series, avg_prefix, mode, x_axis, y_metrics, num, den, [], "dot", is_comparison=True, view=view)
+
+        # Anomalies détectées (pics / chutes) marquées sur les courbes de valeurs
+        if mode == "values":
+            for p_name in (target_platforms or ["combined"]):
+                self._add_anomaly_markers(fig, creator, p_name, y_metrics, view)
+
+        # 3. Comparaison avec des créateurs choisis (une seule tranche, un seul lot de traces)
+        if compare_mode == "creators" and compare_ids:
+            ids = [i for i in compare_ids if str(i) != str(creator.get("id"))][:self.max_compare]
+            batch = data_manager.get_series_batch(ids, "combined" if platform == "both" else platform, view["granularity"])
+            if batch:
+                self._add_creator_overlays(fig, batch, mode, y_metrics, num, den, view)
 
         fig.update_layout(
             template="plotly_white", 
             margin=dict(l=20, r=20, t=30, b=45), 
             showlegend=True,
             legend=dict(orientation="h", y=-0.1), 
-            hovermode="x unified"
+            hovermode="x unified",
+            # Conserve le zoom de l'utilisateur entre deux rafraîchissements du même créateur
+            uirevision=str(creator.get("id")) if creator else None
         )
+        if mode == "values" and any(parse_overlay(k)[0] == "growth" for k in view["overlays"]):
+            # Les taux de croissance (%) ont leur propre échelle, à droite
+            fig.update_layout(yaxis2=dict(overlaying="y", side="right", title="Croissance (%)", showgrid=False))
+
+        period = data_manager.normalize_period(period)
+        if period is not None:
+            self._highlight_period(fig, creator, platform, period)
+        if x_range is not None:
+            fig.update_xaxes(range=list(x_range))
         return fig
 
-    def _process_combined_view(self, fig, creator, mode, x_axis, y_metrics, num, den, advanced, ref_group_type, ref_value):
+    def _add_anomaly_markers(self, fig, creator, platform, y_metrics, view):
+        """Marqueurs des anomalies (lues dans le cache du détecteur) : ▲ pic, ▼ chute."""
+        anomalies = data_manager.anomalies.creator_anomalies(creator["id"], platform, view["granularity"])
+        metrics = [m for m in y_metrics if m in anomalies]
+        if not metrics:
+            return
+        series = data_manager.get_series(creator["id"], platform, view["granularity"])
+        x, y, z, symbols, texts = [], [], [], [], []
+        for m in metrics:
+            periods, scores = anomalies[m]
+            x.extend(series["dates"][periods])
+            y.extend(series["values"][m][periods])
+            symbols.extend("triangle-up" if s > 0 else "triangle-down" for s in scores)
+            texts.extend(f"{self.labels.get(m, m)} : {'pic' if s > 0 else 'chute'} (z = {s:+.1f})" for s in scores)
+        fig.add_trace(go.Scatter(
+            x=x, y=y, mode="markers", name="Anomalies", hovertext=texts, hoverinfo="text",
+            marker=dict(symbol=symbols, size=12, color="#dc3545", line=dict(width=1, color="#ffffff"))
+        ))
+
+    def _highlight_period(self, fig, creator, platform, period):
+        """Surligne la plage sélectionnée et affiche ses totaux (lus dans les sommes préfixes)."""
+        start, end = period
+        x0, x1 = data_manager.get_period_bounds(start, end)
+        totals = data_manager.get_range_totals(creator["id"], "combined" if platform == "both" else platform, start, end)
+        views_text, likes_text = short_numbers([totals["views"], totals["likes"]])
+        fig.add_vrect(
+            x0=str(x0), x1=str(x1),
+            fillcolor="#0d6efd", opacity=0.06, line_width=0,
+            annotation_text=f"Sur la période : {views_text} vues · {likes_text} likes",
+            annotation_position="top left"
+        )
+
+    def _process_combined_view(self, fig, creator, mode, x_axis, y_metrics, num, den, advanced, ref_group_type, ref_value, view=None):
         """Logique spécifique pour le mode Combiné (somme des plateformes)."""
         # Créateur combiné
-        agg_history = self._aggregate_platforms(creator.get("history", {}), ["youtube", "tiktok"])
-        self._add_traces_for_data(fig, agg_history, "Global", mode, x_axis, y_metrics, num, den, advanced, "solid")
+        series = data_manager.get_series(creator["id"], "combined", view["granularity"], view["overlays"])
+        if series:
+            self._add_traces_for_data(fig, series, "Global", mode, x_axis, y_metrics, num, den, advanced, "solid", view=view)
         
         # Comparaison combinée
         if ref_group_type and ref_value:
-            avg_history = data_manager.get_average_history(ref_group_type, ref_value, "combined", y_metrics)
-            if avg_history:
-                self._add_traces_for_data(fig, avg_history, f"Moy. {ref_value}", mode, x_axis, y_metrics, num, den, [], "dot", is_comparison=True)
-
-    def _aggregate_platforms(self, history_dict, platforms):
-        """Fusionne les historiques (somme) de plusieurs plateformes."""
-        month_names = ["Jan", "Fév", "Mar", "Avr", "Mai", "Jun", "Jul", "Aoû", "Sep", "Oct", "Nov", "Déc"]
-        agg = []
-        for i in range(12): # Simulation sur 12 mois
-            row = {"month": month_names[i]}
-            for m in ["views", "likes", "shares", "comments", "followers", "videos"]:
-                row[m] = 0
-            
-            for p in platforms:
-                p_hist = history_dict.get(p, [])
-                if i < len(p_hist):
-                    for m in row.keys():
-                        if m != "month":
-                            row[m] += p_hist[i].get(m, 0)
-            agg.append(row)
-        return agg
-
-    def _add_traces_for_data(self, fig, history, label_prefix, mode, x_axis, y_metrics, num, den, advanced, dash_style, is_comparison=False):
-        """Ajoute les courbes au graphique selon le mode (Valeur, Ratio, Progression)."""
-        months = [d["month"] for d in history]
-        # x_vals = list(range(len(months))) # Si besoin d'index numérique
+            avg_series = data_manager.get_average_history(ref_group_type, ref_value, "combined", granularity=view["granularity"])
+            if avg_series:
+                self._add_traces_for_data(fig, avg_series, f"Moy. {ref_value}", mode, x_axis, y_metrics, num, den, [], "dot", is_comparison=True, view=view)
+
+    def _add_traces_for_data(self, fig, series, label_prefix, mode, x_axis, y_metrics, num, den, advanced, dash_style, is_comparison=False, view=None):
+        """
+        Ajoute les courbes au graphique selon le mode (Valeur, Ratio, Progression).
+        `series` provient de la couche séries temporelles : {"dates": ..., "values": {métrique: array}}.
+        """
+        dates = series["dates"]
+        values = series["values"]
+
+        # Mode FORMULE (métrique personnalisée compilée)
+        if mode == "formula" and view and view.get("formula"):
+            y_vals = compile_formula(view["formula"])(values) * np.ones(len(dates))
+            trace_name = f"{label_prefix} {view['formula']}"
+            color = "#6c757d" if is_comparison else "#343a40"
+            self._plot_line(fig, dates, y_vals, trace_name, color, advanced, dash_style, is_comparison, view)
+            if not is_comparison:
+                self._plot_overlays(fig, dates, y_vals, None, trace_name, color, view)
+            return
 
         # Mode RATIO
         if mode == "ratio" and num and den:
-            y_vals = [(d.get(num,0)/d.get(den,1) if d.get(den,0)>0 else 0) for d in history]
+            n_vals, d_vals = evaluate_metric(num, values), evaluate_metric(den, values)
+            if n_vals is None or d_vals is None:
+                return
+            y_vals = np.divide(n_vals, d_vals, out=np.zeros(len(dates)), where=d_vals > 0)
             trace_name = f"{label_prefix} {self.labels.get(num,num)}/{self.labels.get(den,den)}"
             color = "#6c757d" if is_comparison else "#343a40"
-            self._plot_line(fig, months, y_vals, trace_name, color, advanced, dash_style, is_comparison)
+            self._plot_line(fig, dates, y_vals, trace_name, color, advanced, dash_style, is_comparison, view)
+            if not is_comparison:
+                self._plot_overlays(fig, dates, y_vals, None, trace_name, color, view)
             return
 
         # Mode VALEURS ou PROGRESSION
         for m in y_metrics:
-            raw_vals = [d.get(m, 0) for d in history]
+            raw_vals = evaluate_metric(m, values)
+            if raw_vals is None:
+                continue
             
             if mode == "progression":
-                y_vals = [0]
-                for i in range(1, len(raw_vals)):
-                    prev = raw_vals[i-1]
-                    curr = raw_vals[i]
-                    pct = ((curr - prev) / prev * 100) if prev > 0 else 0
-                    y_vals.append(pct)
+                # Variation en % d'une période à l'autre (0 pour la première période)
+                prev = raw_vals[:-1]
+                pct = np.divide(raw_vals[1:] - prev, prev, out=np.zeros(len(prev)), where=prev > 0) * 100
+                y_vals = np.concatenate(([0.0], pct))
                 suffix = "(%)"
             else:
                 y_vals = raw_vals
@@ -489,16 +722,109 @@ class AnalyticsEngine:
             color = "#adb5bd" if is_comparison else self.metric_colors.get(m, "#000000")
             
             final_name = f"{label_prefix} {lbl} {suffix}"
-            self._plot_line(fig, months, y_vals, final_name, color, advanced, dash_style, is_comparison)
+            self._plot_line(fig, dates, y_vals, final_name, color, advanced, dash_style, is_comparison, view)
+            if not is_comparison:
+                # En mode valeurs, les overlays viennent du cache de la couche séries temporelles
+                cached = (
+                    {k: o[m] for k, o in series.get("overlays", {}).items()}
+                    if mode == "values" and m not in DERIVED_METRICS else None
+                )
+                self._plot_overlays(fig, dates, y_vals, cached, final_name, color, view)
 
-    def _plot_line(self, fig, x_labels, y_vals, name, color, advanced, dash_style, is_comparison):
+    def _add_creator_overlays(self, fig, batch, mode, y_metrics, num, den, view):
+        """
+        Superpose plusieurs créateurs en un seul passage.
+        `batch` contient des matrices (créateurs × périodes) par métrique : les valeurs affichées
+        sont calculées pour tous les créateurs à la fois, puis les traces sont ajoutées en un lot.
+        """
+        dates, values = batch["dates"], batch["values"]
+
+        if mode == "formula" and view.get("formula"):
+            curves = [(view["formula"], compile_formula(view["formula"])(values) * np.ones(values["views"].shape))]
+        elif mode == "ratio" and num and den:
+            n_vals, d_vals = evaluate_metric(num, values), evaluate_metric(den, values)
+            y = np.divide(n_vals, d_vals, out=np.zeros(n_vals.shape), where=d_vals > 0)
+            curves = [(f"{self.labels.get(num, num)}/{self.labels.get(den, den)}", y)]
+        else:
+            curves = []
+            for m in y_metrics:
+                y = evaluate_metric(m, values)
+                if y is None:
+                    continue
+                if mode == "progression":
+                    prev = y[:, :-1]
+                    pct = np.divide(y[:, 1:] - prev, prev, out=np.zeros(prev.shape), where=prev > 0) * 100
+                    y = np.hstack((np.zeros((y.shape[0], 1)), pct))
+                curves.append((self.labels.get(m, m), y))
+
+        # Dates converties en chaînes une seule fois ; chaque trace y lit ses propres indices LTTB
+        date_str = np.datetime_as_string(dates, unit="D")
+        traces = []
+        dash_styles = ["solid", "dash", "dot", "dashdot", "longdash"]
+        for m_idx, (label, matrix) in enumerate(curves):
+            for row, name in enumerate(batch["names"]):
+                color = self.compare_palette[row % len(self.compare_palette)]
+                selected = self._select_points(dates, matrix[row], view)
+                trace_cls = go.Scattergl if len(dates) > self.webgl_threshold else go.Scatter
+                traces.append(trace_cls(
+                    x=date_str[selected], y=matrix[row][selected], mode="lines", name=f"{name} {label}",
+                    line=dict(color=color, dash=dash_styles[m_idx % len(dash_styles)], width=2),
+                    opacity=0.8, legendgroup=name,
+                    hovertemplate=f"<b>{name} {label}</b><br>Val: %{{y:,.2f}}<extra></extra>"
+                ))
+        fig.add_traces(traces)
+
+    def _plot_overlays(self, fig, dates, y_vals, cached, name, color, view=None):
+        """
+        Dessine les overlays glissants sélectionnés (moyennes mobiles, croissance glissante).
+        `cached` contient les séries pré-calculées ; sinon (modes progression et ratio),
+        la moyenne mobile est calculée sur la série affichée.
+        """
+        view = view or {}
+        for key in view.get("overlays", []):
+            kind, window = parse_overlay(key)
+            if cached is not None:
+                o_vals = cached.get(key)
+            elif kind == "ma":
+                o_vals = rolling_mean(y_vals, window)
+            else:
+                # Une croissance de pourcentages ou de ratios n'a pas de sens
+                o_vals = None
+            if o_vals is None:
+                continue
+
+            x_plot, y_plot = self._reduce_points(dates, np.asarray(o_vals, dtype=float), view)
+            trace_cls = go.Scattergl if len(o_vals) > self.webgl_threshold else go.Scatter
+            label = f"MM{window}" if kind == "ma" else f"Croiss. {window}p (%)"
+            fig.add_trace(trace_cls(
+                x=np.datetime_as_string(x_plot, unit="D"), y=y_plot, mode="lines",
+                name=f"{label} {name}",
+                line=dict(color=color, dash="dashdot" if kind == "ma" else "dot", width=1.5),
+                yaxis="y2" if kind == "growth" else "y",
+                hovertemplate=f"<b>{label} {name}</b><br>Val: %{{y:,.2f}}<extra></extra>"
+            ))
+
+    def _plot_line(self, fig, dates, y_vals, name, color, advanced, dash_style, is_comparison, view=None):
         """Helper bas niveau pour dessiner une ligne Plotly."""
+        view = view or {}
         opacity = 0.6 if is_comparison else 1.0
         width = 2 if is_comparison else 3
-        
-        fig.add_trace(go.Scatter(
-            x=x_labels, y=y_vals, mode='lines+markers', name=name,
-            line=dict(shape='spline', smoothing=1.3, color=color, dash=dash_style, width=width),
+        y_vals = np.asarray(y_vals, dtype=float)
+
+        # Séries longues : WebGL + tracé linéaire (le lissage spline n'est pas supporté en GL)
+        use_gl = len(y_vals) > self.webgl_threshold
+        x_plot, y_plot = self._reduce_points(dates, y_vals, view)
+
+        line = dict(color=color, dash=dash_style, width=width)
+        if use_gl:
+            trace_cls, trace_mode = go.Scattergl, 'lines'
+        else:
+            trace_cls, trace_mode = go.Scatter, 'lines+markers'
+            line.update(shape='spline', smoothing=1.3)
+
+        fig.add_trace(trace_cls(
+            x=np.datetime_as_string(x_plot, unit="D"), y=y_plot, mode=trace_mode, name=name,
+            line=line,
             opacity=opacity,
             hovertemplate=f"<b>{name}</b><br>Val: %{{y:,.2f}}<extra></extra>"
         ))
@@ -510,19 +836,19 @@ class AnalyticsEngine:
                 slope, intercept = np.polyfit(X, y_vals, 1)
                 
                 if "reg" in advanced:
+                    # Une droite : ses deux extrémités suffisent, quelle que soit la longueur de la série
                     fig.add_trace(go.Scatter(
-                        x=x_labels, y=slope*X+intercept, 
+                        x=np.datetime_as_string(dates[[0, -1]], unit="D"), y=slope*X[[0, -1]]+intercept, 
                         mode='lines', 
                         line=dict(dash='dot', width=1, color=color), 
                         name=f"Tend. {name}", showlegend=False, hoverinfo='skip'
                     ))
                 
                 if "forecast" in advanced:
-                    month_names = ["Jan", "Fév", "Mar", "Avr", "Mai", "Jun", "Jul", "Aoû", "Sep", "Oct", "Nov", "Déc"]
-                    next_months = [f"{month_names[k % 12]} (Prév)" for k in range(3)]
+                    next_dates = TimeSeriesStore.next_periods(dates[-1], view.get("granularity", "month"), 3)
                     next_Y = slope * np.arange(len(y_vals), len(y_vals)+3) + intercept
                     fig.add_trace(go.Scatter(
-                        x=next_months, y=next_Y, 
+                        x=np.datetime_as_string(next_dates, unit="D"), y=next_Y, 
                         mode='lines+markers', 
                         line=dict(dash='dash', color=color), 
                         name=f"Prév. {name}", hovertemplate="%{y:,.2f}"
@@ -530,9 +856,1691 @@ class AnalyticsEngine:
             except Exception: 
                 pass
 
+    def _reduce_points(self, dates, y_vals, view=None):
+        """
+        Restreint la série à la fenêtre zoomée (si fournie) puis la sous-échantillonne
+        par LTTB pour respecter le budget de points de la vue.
+        """
+        selected = self._select_points(dates, y_vals, view)
+        return dates[selected], y_vals[selected]
+
+    def _select_points(self, dates, y_vals, view=None):
+        """Indices des points conservés par _reduce_points (fenêtre zoomée puis LTTB)."""
+        view = view or {}
+        x_num = dates.astype("datetime64[D]").astype(float)
+        start, end = 0, len(y_vals)
+        x_range = view.get("x_range")
+        if x_range is not None:
+            lo, hi = (
+                (pd.Timestamp(v) - pd.Timestamp(0)) / pd.Timedelta(days=1) for v in x_range
+            )
+            # Marge d'un point de chaque côté pour que la ligne rejoigne les bords
+            start = max(int(np.searchsorted(x_num, lo)) - 1, 0)
+            end = min(int(np.searchsorted(x_num, hi, side="right")) + 1, len(y_vals))
+
+        return start + lttb_indices(x_num[start:end], y_vals[start:end], view.get("budget", self.min_points))
+
+
+# ==============================================================================
+# 4. SÉRIES TEMPORELLES
+# ==============================================================================
+
+def parse_overlay(key):
+    """Décode une option d'overlay glissant ("ma6" -> ("ma", 6), "growth3" -> ("growth", 3))."""
+    match = re.fullmatch(r"(ma|growth)(\d+)", str(key or ""))
+    return (match.group(1), int(match.group(2))) if match else None
+
+def rolling_mean(values, window):
+    """
+    Moyenne mobile sur le dernier axe par convolution de sommes cumulées :
+    mean[t] = (csum[t] - csum[t - window]) / window. NaN tant que la fenêtre est incomplète.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if 0 < window <= values.shape[-1]:
+        csum = np.cumsum(values, axis=-1)
+        out[..., window - 1:] = csum[..., window - 1:]
+        out[..., window:] -= csum[..., :-window]
+        out[..., window - 1:] /= window
+    return out
+
+def rolling_growth(values, window):
+    """Taux de croissance glissant (%) sur `window` périodes : (v[t] - v[t - window]) / v[t - window]."""
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if 0 < window < values.shape[-1]:
+        prev, curr = values[..., :-window], values[..., window:]
+        out[..., window:] = np.divide(curr - prev, prev, out=np.full(prev.shape, np.nan), where=prev > 0) * 100
+    return out
+
+def set_row(array, row, values):
+    """Remplace la ligne `row` d'un tableau, ou l'ajoute en fin si `row` vaut sa longueur."""
+    if row < len(array):
+        array[row] = values
+        return array
+    return np.concatenate((array, np.asarray(values)[None]), axis=0)
+
+class TimeSeriesStore:
+    """
+    Couche séries temporelles des historiques créateurs.
+    Les relevés sont alignés sur un axe de dates réel commun et stockés en colonnes NumPy
+    (créateurs × plateformes × métriques × dates), puis ré-échantillonnés par granularité
+    (jour, semaine, mois, trimestre) avec mise en cache.
+    La mise à jour d'un créateur (upsert / remove) ne recalcule que sa ligne, dans le cube
+    comme dans les ré-échantillonnages déjà en cache.
+    """
+    def __init__(self, creators):
+        self.platforms = ["youtube", "tiktok"]
+        self.metrics = list(HISTORY_METRICS)
+        self.gauge_mask = np.array([m in GAUGE_METRICS for m in self.metrics])
+        self.version = 0
+        self.rebuild(creators)
+
+    def rebuild(self, creators):
+        """(Re)construit le cube des historiques et vide les caches de ré-échantillonnage."""
+        self.creator_ids = [str(c["id"]) for c in creators]
+        self.row_of = {cid: i for i, cid in enumerate(self.creator_ids)}
+
+        parsed = [self._parse(c) for c in creators]
+        all_dates = [d for records in parsed for d, _ in records.values()]
+        self.dates = np.unique(np.concatenate(all_dates)) if all_dates else np.array([], dtype="datetime64[D]")
+
+        shape = (len(creators), len(self.platforms), len(self.metrics), len(self.dates))
+        self.levels = np.zeros(shape)
+        self.present = np.zeros(shape[:2], dtype=bool)
+        for row, records in enumerate(parsed):
+            self.levels[row], self.present[row] = self._align(records)
+
+        self.version += 1
+        self._resampled = {}
+
+    def _parse(self, creator):
+        """Relevés triés d'un créateur : {indice de plateforme: (dates, métriques × relevés)}."""
+        parsed = {}
+        for p_idx, p_name in enumerate(self.platforms):
+            records = creator.get("history", {}).get(p_name, [])
+            if records:
+                dates = self._record_dates(records)
+                vals = np.array([[rec.get(m, 0) for rec in records] for m in self.metrics], dtype=float)
+                order = np.argsort(dates, kind="stable")
+                parsed[p_idx] = (dates[order], vals[:, order])
+        return parsed
+
+    def _align(self, parsed):
+        """Niveaux (plateformes × métriques × dates) et présence d'un créateur sur l'axe commun."""
+        levels = np.zeros((len(self.platforms), len(self.metrics), len(self.dates)))
+        present = np.zeros(len(self.platforms), dtype=bool)
+        for p_idx, (dates, vals) in parsed.items():
+            # Report du dernier relevé connu sur l'axe commun (0 avant le premier relevé)
+            idx = np.searchsorted(dates, self.dates, side="right") - 1
+            levels[p_idx] = np.where(idx >= 0, vals[:, np.clip(idx, 0, None)], 0.0)
+            present[p_idx] = True
+        return levels, present
+
+    def upsert(self, creator):
+        """
+        Ajoute ou remplace la ligne d'un créateur et ses lignes ré-échantillonnées en cache.
+        Retourne False sans rien modifier si ses relevés sortent de l'axe de dates commun :
+        l'appelant doit alors reconstruire le cube (rebuild).
+        """
+        parsed = self._parse(creator)
+        if any(not np.isin(dates, self.dates).all() for dates, _ in parsed.values()):
+            return False
+        cid = str(creator["id"])
+        row = self.row_of.get(cid, len(self.creator_ids))
+        if row == len(self.creator_ids):
+            self.creator_ids.append(cid)
+            self.row_of[cid] = row
+        levels, present = self._align(parsed)
+        self.levels = set_row(self.levels, row, levels)
+        self.present = set_row(self.present, row, present)
+
+        for granularity, res in self._resampled.items():
+            _, levels, increments, prefix = self._resample_block(self.levels[row:row + 1], granularity)
+            if row < len(res["prefix"]):
+                res["prefix_total"] -= res["prefix"][row]
+            res["prefix_total"] += prefix[0]
+            for key, block in (("levels", levels), ("increments", increments), ("prefix", prefix)):
+                res[key] = set_row(res[key], row, block[0])
+            if "stacked" in res:
+                stacked = np.concatenate((levels, levels.sum(axis=1, keepdims=True)), axis=1)
+                res["stacked"] = set_row(res["stacked"], row, stacked[0])
+                for key, overlay in res.get("overlays", {}).items():
+                    kind, window = parse_overlay(key)
+                    func = rolling_mean if kind == "ma" else rolling_growth
+                    res["overlays"][key] = set_row(overlay, row, func(stacked, window)[0])
+        self.version += 1
+        return True
+
+    def remove(self, creator_id):
+        """
+        Retire la ligne d'un créateur (cube et ré-échantillonnages en cache) ; retourne l'ancienne
+        ligne, ou None si le créateur est inconnu. L'axe de dates commun est conservé.
+        """
+        row = self.row_of.get(str(creator_id))
+        if row is None:
+            return None
+        del self.creator_ids[row]
+        self.row_of = {cid: i for i, cid in enumerate(self.creator_ids)}
+        self.levels = np.delete(self.levels, row, axis=0)
+        self.present = np.delete(self.present, row, axis=0)
+
+        for res in self._resampled.values():
+            res["prefix_total"] -= res["prefix"][row]
+            for key in ("levels", "increments", "prefix", "stacked"):
+                if key in res:
+                    res[key] = np.delete(res[key], row, axis=0)
+            for key, overlay in res.get("overlays", {}).items():
+                res["overlays"][key] = np.delete(overlay, row, axis=0)
+        self.version += 1
+        return row
+
+    def _record_dates(self, records):
+        """Dates des relevés : clé "date" si présente, sinon un relevé par mois depuis HISTORY_START_DATE."""
+        start = np.datetime64(HISTORY_START_DATE, "M")
+        return np.array(
+            [np.datetime64(rec["date"], "D") if rec.get("date") else (start + i).astype("datetime64[D]")
+             for i, rec in enumerate(records)],
+            dtype="datetime64[D]"
+        )
+
+    @staticmethod
+    def bucket_keys(dates, granularity):
+        """Clé entière de période pour chaque date (semaines commençant le lundi)."""
+        if granularity == "day":
+            return dates.astype("datetime64[D]").astype(np.int64)
+        if granularity == "week":
+            # Le 01/01/1970 est un jeudi : décalage de 3 jours pour caler les semaines sur le lundi
+            return (dates.astype("datetime64[D]").astype(np.int64) + 3) // 7
+        months = dates.astype("datetime64[M]").astype(np.int64)
+        if granularity == "quarter":
+            return months // 3
+        return months
+
+    @staticmethod
+    def bucket_start(keys, granularity):
+        """Date de début de chaque période à partir de sa clé."""
+        if granularity == "day":
+            return keys.astype("datetime64[D]")
+        if granularity == "week":
+            return (keys * 7 - 3).astype("datetime64[D]")
+        if granularity == "quarter":
+            return (keys * 3).astype("datetime64[M]").astype("datetime64[D]")
+        return keys.astype("datetime64[M]").astype("datetime64[D]")
+
+    @staticmethod
+    def next_periods(last_date, granularity, count):
+        """Dates des `count` périodes suivant `last_date` (utilisé pour les prévisions)."""
+        steps = np.arange(1, count + 1)
+        if granularity == "day":
+            return np.datetime64(last_date, "D") + steps
+        if granularity == "week":
+            return np.datetime64(last_date, "D") + 7 * steps
+        month = np.datetime64(last_date, "M")
+        step = 3 if granularity == "quarter" else 1
+        return (month + step * steps).astype("datetime64[D]")
+
+    def resample(self, granularity):
+        """
+        Ré-échantillonne tout le cube à la granularité demandée (résultat mis en cache).
+        Compteurs : somme des incréments de la période. Jauges : dernière valeur de la période.
+        Retourne un dict {"dates", "levels", "increments"}.
+        """
+        cached = self._resampled.get(granularity)
+        if cached is not None:
+            return cached
+
+        dates, levels, increments, prefix = self._resample_block(self.levels, granularity)
+        result = {
+            "dates": dates,
+            "levels": levels,
+            "increments": increments,
+            "prefix": prefix,
+            # Préfixes sommés sur tous les créateurs (plateformes × métriques × dates+1)
+            "prefix_total": prefix.sum(axis=0),
+        }
+        self._resampled[granularity] = result
+        return result
+
+    def _resample_block(self, block, granularity):
+        """Ré-échantillonne un bloc de lignes du cube : (dates, niveaux, incréments, sommes préfixes)."""
+        keys = self.bucket_keys(self.dates, granularity)
+        if len(keys) == 0:
+            dates, levels, increments = self.dates, block.copy(), block.copy()
+        else:
+            # Dates triées : chaque période est un bloc contigu [starts[i], ends[i]]
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            ends = np.r_[starts[1:], len(keys)] - 1
+
+            native_inc = np.diff(block, axis=-1, prepend=0.0)
+            increments = np.add.reduceat(native_inc, starts, axis=-1)
+            levels = np.cumsum(increments, axis=-1)
+            gauges = block[:, :, self.gauge_mask][..., ends]
+            levels[:, :, self.gauge_mask] = gauges
+            increments[:, :, self.gauge_mask] = np.diff(gauges, axis=-1, prepend=0.0)
+            dates = self.bucket_start(keys[starts], granularity)
+
+        # Sommes préfixes des incréments : le total d'une plage [i, j] vaut prefix[j + 1] - prefix[i]
+        prefix = np.zeros(levels.shape[:-1] + (levels.shape[-1] + 1,))
+        np.cumsum(increments, axis=-1, out=prefix[..., 1:])
+        return dates, levels, increments, prefix
+
+    def overlay(self, granularity, key):
+        """
+        Overlay glissant ("maN" ou "growthN") calculé en un lot sur tout le cube
+        (créateurs × [plateformes..., combiné] × métriques × dates) et mis en cache
+        avec la série de base de la granularité.
+        """
+        res = self.resample(granularity)
+        cache = res.setdefault("overlays", {})
+        if key not in cache:
+            if "stacked" not in res:
+                # Dernier "slot" plateforme = somme des plateformes (vue combinée)
+                res["stacked"] = np.concatenate([res["levels"], res["levels"].sum(axis=1, keepdims=True)], axis=1)
+            kind, window = parse_overlay(key)
+            func = rolling_mean if kind == "ma" else rolling_growth
+            cache[key] = func(res["stacked"], window)
+        return cache[key]
+
+    def platform_slice(self, platform):
+        """Indices de plateforme à sommer pour un filtre ("combined", "youtube", "TikTok"...)."""
+        if platform in ("combined", "both", "all"):
+            return list(range(len(self.platforms)))
+        key = (platform or "").lower()
+        return [self.platforms.index(key)] if key in self.platforms else []
+
+    def to_series(self, dates, block):
+        """Convertit un bloc (métriques × dates) en série consommable par AnalyticsEngine."""
+        return {"dates": dates, "values": {m: block[i] for i, m in enumerate(self.metrics)}}
+
+
+class AnomalyDetector:
+    """
+    Détection d'anomalies (pics viraux, chutes brutales) sur les historiques.
+    Les variations d'une période à l'autre de tout le cube (créateurs × [plateformes..., combiné]
+    × métriques × périodes) sont centrées sur leur médiane et divisées par 1.4826 × MAD
+    (z-score robuste, insensible aux pics eux-mêmes) ; si la MAD est nulle, l'écart absolu moyen
+    (× 1.2533) prend le relais. Les résultats sont mis en cache par granularité pour la version
+    courante des données, calculés à la construction (refresh) ; la statistique étant propre à
+    chaque ligne, la mise à jour d'un créateur (upsert / remove) ne recalcule que la sienne.
+    """
+    def __init__(self, timeseries, metrics=("views", "followers"), threshold=3.5):
+        self.timeseries = timeseries
+        self.metrics = list(metrics)
+        self.threshold = threshold
+        self._cache = {}
+        self.refresh()
+
+    def refresh(self):
+        """Recalcule toutes les granularités pour la version courante des historiques."""
+        self._cache = {}
+        self.version = self.timeseries.version
+        for granularity in TIME_GRANULARITIES:
+            self.detect(granularity)
+
+    def _in_step(self):
+        """
+        Le cache suit-il les historiques à une mise à jour près ? Sinon il est vidé
+        (recalcul complet à la prochaine lecture) et la mise à jour ligne à ligne est inutile.
+        """
+        if self.version == self.timeseries.version - 1:
+            self.version = self.timeseries.version
+            return True
+        self._cache = {}
+        self.version = self.timeseries.version
+        return False
+
+    def upsert(self, creator_id):
+        """Recalcule les anomalies d'un créateur (ligne à jour dans le cube) pour les granularités en cache."""
+        if not self._in_step():
+            return
+        cid = str(creator_id)
+        row = self.timeseries.row_of[cid]
+        for granularity, result in self._cache.items():
+            update = self._compute(granularity, rows=[row])
+            for key in ("deltas", "z", "flags"):
+                result[key] = set_row(result[key], row, update[key][0])
+            events = [e for e in result["events"] if e["creator_id"] != cid] + update["events"]
+            result["events"] = sorted(events, key=lambda e: -abs(e["z"]))
+
+    def remove(self, creator_id, row):
+        """Retire la ligne `row` (ancienne ligne du créateur) et ses évènements des granularités en cache."""
+        if not self._in_step():
+            return
+        cid = str(creator_id)
+        for result in self._cache.values():
+            for key in ("deltas", "z", "flags"):
+                result[key] = np.delete(result[key], row, axis=0)
+            result["events"] = [e for e in result["events"] if e["creator_id"] != cid]
+
+    def slot(self, platform):
+        """Indice de plateforme dans le cube de détection (dernier = plateformes cumulées)."""
+        ts = self.timeseries
+        key = (platform or "").lower()
+        return ts.platforms.index(key) if key in ts.platforms else len(ts.platforms)
+
+    def detect(self, granularity="month"):
+        """{"dates", "deltas", "z", "flags", "events"} pour la granularité (lu dans le cache)."""
+        if self.version != self.timeseries.version:
+            self._cache = {}
+            self.version = self.timeseries.version
+        if granularity not in self._cache:
+            self._cache[granularity] = self._compute(granularity)
+        return self._cache[granularity]
+
+    def _compute(self, granularity, rows=None):
+        """Détection sur tout le cube, ou sur les lignes `rows` seules (mêmes clés, lignes dans l'ordre de `rows`)."""
+        ts = self.timeseries
+        res = ts.resample(granularity)
+        rows = np.arange(len(ts.creator_ids)) if rows is None else np.asarray(rows)
+        increments = res["increments"][rows][:, :, [ts.metrics.index(m) for m in self.metrics]]
+        increments = np.concatenate((increments, increments.sum(axis=1, keepdims=True)), axis=1)
+        # La première période contient le niveau initial : seules les suivantes sont des variations
+        deltas = increments[..., 1:]
+        med = np.median(deltas, axis=-1, keepdims=True)
+        spread = np.abs(deltas - med)
+        scale = 1.4826 * np.median(spread, axis=-1, keepdims=True)
+        scale = np.where(scale > 0, scale, 1.2533 * spread.mean(axis=-1, keepdims=True))
+        z = np.zeros(increments.shape)
+        np.divide(deltas - med, scale, out=z[..., 1:], where=scale > 0)
+        flags = np.abs(z) > self.threshold
+
+        platforms = [p.capitalize() for p in ts.platforms] + ["combined"]
+        flagged, slots, metrics, periods = np.nonzero(flags)
+        order = np.argsort(-np.abs(z[flagged, slots, metrics, periods]), kind="stable")
+        events = [
+            {
+                "creator_id": ts.creator_ids[rows[r]], "platform": platforms[p], "metric": self.metrics[m],
+                "date": res["dates"][t], "z": float(z[r, p, m, t]),
+                "delta": float(increments[r, p, m, t]), "median": float(med[r, p, m, 0]),
+            }
+            for r, p, m, t in zip(flagged[order], slots[order], metrics[order], periods[order])
+        ]
+        return {"dates": res["dates"], "deltas": increments, "z": z, "flags": flags, "events": events}
+
+    def creator_anomalies(self, creator_id, platform, granularity="month"):
+        """{métrique: (indices de périodes, z-scores)} des anomalies d'un créateur sur une plateforme."""
+        row = self.timeseries.row_of.get(str(creator_id))
+        if row is None:
+            return {}
+        result = self.detect(granularity)
+        slot = self.slot(platform)
+        out = {}
+        for m_idx, metric in enumerate(self.metrics):
+            periods = np.flatnonzero(result["flags"][row, slot, m_idx])
+            if len(periods):
+                out[metric] = (periods, result["z"][row, slot, m_idx, periods])
+        return out
+
+    def latest(self, k=6, platform="combined"):
+        """Anomalies les plus fortes (|z| décroissant) sur une plateforme ; lecture du cache mensuel."""
+        events = [e for e in self.detect("month")["events"] if e["platform"] == platform]
+        return events[:k]
+
+# ==============================================================================
+# 5. MÉTRIQUES DÉRIVÉES (FORMULES)
+# ==============================================================================
+
+_FORMULA_TOKEN = re.compile(r"\s*(?:(\d+(?:\.\d*)?|\.\d+)|([A-Za-z_]\w*)|(.))")
+
+def _tokenize_formula(formula):
+    """Découpe une formule en jetons ("num", valeur), ("name", nom) ou ("op", caractère)."""
+    tokens = []
+    for number, name, op in _FORMULA_TOKEN.findall(formula):
+        if number:
+            tokens.append(("num", float(number)))
+        elif name:
+            tokens.append(("name", name))
+        elif op.strip():
+            if op not in "+-*/()":
+                raise ValueError(f"Caractère non autorisé : '{op}'")
+            tokens.append(("op", op))
+    return tokens
+
+class _FormulaParser:
+    """
+    Analyseur descendant récursif du mini-langage de formules :
+        expr   := term (("+" | "-") term)*
+        term   := factor (("*" | "/") factor)*
+        factor := ("+" | "-") factor | nombre | métrique | "(" expr ")"
+    Produit directement une fonction Python évaluant la formule sur des tableaux NumPy.
+    """
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _take(self):
+        token = self._peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        node = self._expr()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Jeton inattendu : '{self._peek()[1]}'")
+        return node
+
+    def _expr(self):
+        node = self._term()
+        while self._peek() in (("op", "+"), ("op", "-")):
+            op = self._take()[1]
+            left, right = node, self._term()
+            node = (lambda l, r: lambda v: l(v) + r(v))(left, right) if op == "+" else \
+                   (lambda l, r: lambda v: l(v) - r(v))(left, right)
+        return node
+
+    def _term(self):
+        node = self._factor()
+        while self._peek() in (("op", "*"), ("op", "/")):
+            op = self._take()[1]
+            left, right = node, self._factor()
+            node = (lambda l, r: lambda v: l(v) * r(v))(left, right) if op == "*" else \
+                   (lambda l, r: lambda v: _safe_divide(l(v), r(v)))(left, right)
+        return node
+
+    def _factor(self):
+        kind, value = self._take()
+        if (kind, value) == ("op", "-"):
+            inner = self._factor()
+            return lambda v: -inner(v)
+        if (kind, value) == ("op", "+"):
+            return self._factor()
+        if kind == "num":
+            return lambda v: value
+        if kind == "name":
+            if value not in HISTORY_METRICS:
+                raise ValueError(f"Métrique inconnue : '{value}'")
+            return lambda v: np.asarray(v.get(value, 0.0), dtype=float)
+        if (kind, value) == ("op", "("):
+            node = self._expr()
+            if self._take() != ("op", ")"):
+                raise ValueError("Parenthèse fermante manquante")
+            return node
+        raise ValueError("Formule incomplète" if kind is None else f"Jeton inattendu : '{value}'")
+
+def _safe_divide(num, den):
+    """Division élément par élément, 0 là où le dénominateur est nul."""
+    num, den = np.broadcast_arrays(np.asarray(num, dtype=float), np.asarray(den, dtype=float))
+    return np.divide(num, den, out=np.zeros(num.shape), where=den != 0)
+
+@lru_cache(maxsize=256)
+def compile_formula(formula):
+    """
+    Compile une formule (ex: "(likes+shares+comments)/views*100") en évaluateur vectorisé.
+    L'évaluateur prend un dict {métrique: array} et retourne un array.
+    Le résultat est mis en cache : une formule n'est analysée qu'une fois.
+    Lève ValueError si la formule est invalide.
+    """
+    tokens = _tokenize_formula(formula or "")
+    if not tokens:
+        raise ValueError("Formule vide")
+    return _FormulaParser(tokens).parse()
+
+def evaluate_metric(metric, values):
+    """
+    Valeurs d'une métrique de base ou dérivée (DERIVED_METRICS) à partir d'un dict {métrique: array}.
+    Une métrique de croissance ("growth") est calculée sur le dernier axe (axe du temps).
+    """
+    if metric in DERIVED_METRICS:
+        spec = DERIVED_METRICS[metric]
+        if "growth" in spec:
+            base = values.get(spec["growth"])
+            return None if base is None else rolling_growth(base, spec["window"])
+        return np.asarray(compile_formula(spec["formula"])(values), dtype=float)
+    if metric in values:
+        return np.asarray(values[metric], dtype=float)
+    return None
+
+
+# ==============================================================================
+# 6. AGRÉGATS MATÉRIALISÉS (PAYS / RÉGION / THÈME)
+# ==============================================================================
+
+class CreatorRollups:
+    """
+    Agrégats des créateurs par pays, région et thème (vues, vidéos, likes, partages,
+    commentaires, créateurs distincts, répartitions plateformes et thèmes).
+
+    Chaque créateur contribue une matrice plateforme × métrique à ses groupes :
+    un pays, une région, et ses thèmes (poids 1/k pour k thèmes). Les sommes par groupe
+    sont des réductions groupées (np.add.at) à la construction, puis maintenues
+    incrémentalement : un créateur modifié retire son ancienne contribution et ajoute la nouvelle.
+    """
+    levels = ("country", "region", "theme")
+
+    def __init__(self, creators, metrics, platforms):
+        self.metrics = list(metrics)
+        self.platforms = list(platforms)
+        self.rebuild(creators)
+
+    def rebuild(self, creators):
+        """Recalcule tous les agrégats à partir de la liste complète des créateurs."""
+        self.keys = {lvl: [] for lvl in self.levels}
+        self.index = {lvl: {} for lvl in self.levels}
+        self.names = {lvl: {} for lvl in self.levels}
+        n_p, n_m, n_t = len(self.platforms), len(self.metrics), len(THEMES)
+        self.sums = {lvl: np.zeros((0, n_p, n_m)) for lvl in self.levels}
+        self.counts = {lvl: np.zeros(0) for lvl in self.levels}
+        self.theme_views = {lvl: np.zeros((0, n_t)) for lvl in self.levels}
+        for t in THEMES:
+            self._group("theme", t, t)
+
+        self.contrib = {str(c["id"]): self._contribution(c) for c in creators}
+        entries = list(self.contrib.values())
+        if not entries:
+            return
+        values = np.stack([e["values"] for e in entries])
+        theme_w = np.stack([e["theme_weights"] for e in entries])
+        views = values[:, :, self.metrics.index("views")].sum(axis=1)
+
+        for lvl in self.levels:
+            # Triplets (créateur, groupe, poids) puis sommes groupées
+            triples = [(i, self._group(lvl, key, name), w) for i, e in enumerate(entries) for key, name, w in e["groups"][lvl]]
+            if not triples:
+                continue
+            rows, groups, weights = (np.array(x) for x in zip(*triples))
+            np.add.at(self.sums[lvl], groups, weights[:, None, None] * values[rows])
+            np.add.at(self.counts[lvl], groups, 1)
+            np.add.at(self.theme_views[lvl], groups, (weights * views[rows])[:, None] * theme_w[rows])
+
+    def _contribution(self, creator):
+        """Contribution d'un créateur : matrice plateforme × métrique et groupes d'appartenance."""
+        platforms = creator.get("platforms", {})
+        values = np.array(
+            [[platforms.get(p, {}).get(m) or 0 for m in self.metrics] for p in self.platforms], dtype=float
+        )
+        themes = [t for t in dict.fromkeys(creator.get("tags", [])) if t in THEMES]
+        theme_weights = np.zeros(len(THEMES))
+        for t in themes:
+            theme_weights[THEMES.index(t)] = 1.0 / len(themes)
+
+        country = creator.get("country")
+        iso = COUNTRY_ISO.get(country, country)
+        country_name = COUNTRY_STATS.get(iso, {}).get("name", country)
+        region = creator.get("region")
+        return {
+            "values": values,
+            "theme_weights": theme_weights,
+            "groups": {
+                "country": [(iso, country_name, 1.0)] if iso else [],
+                "region": [(region, region, 1.0)] if region else [],
+                "theme": [(t, t, 1.0 / len(themes)) for t in themes],
+            },
+        }
+
+    def _group(self, level, key, name):
+        """Indice du groupe `key` (créé avec des agrégats nuls s'il est nouveau)."""
+        idx = self.index[level].get(key)
+        if idx is None:
+            idx = len(self.keys[level])
+            self.index[level][key] = idx
+            self.keys[level].append(key)
+            self.names[level][key] = name
+            self.sums[level] = np.concatenate((self.sums[level], np.zeros((1,) + self.sums[level].shape[1:])))
+            self.counts[level] = np.append(self.counts[level], 0.0)
+            self.theme_views[level] = np.vstack((self.theme_views[level], np.zeros(len(THEMES))))
+        return idx
+
+    def _apply(self, entry, sign):
+        """Ajoute (sign=1) ou retire (sign=-1) la contribution d'un créateur ; retourne les pays touchés."""
+        views = entry["values"][:, self.metrics.index("views")].sum()
+        for lvl in self.levels:
+            for key, name, w in entry["groups"][lvl]:
+                g = self._group(lvl, key, name)
+                self.sums[lvl][g] += sign * w * entry["values"]
+                self.counts[lvl][g] += sign
+                self.theme_views[lvl][g] += sign * w * views * entry["theme_weights"]
+        return {key for key, _, _ in entry["groups"]["country"]}
+
+    def upsert(self, creator):
+        """Ajoute ou met à jour un créateur. Retourne les codes pays dont les agrégats ont changé."""
+        cid = str(creator["id"])
+        touched = self._apply(self.contrib[cid], -1) if cid in self.contrib else set()
+        self.contrib[cid] = self._contribution(creator)
+        return touched | self._apply(self.contrib[cid], 1)
+
+    def remove(self, creator_id):
+        """Retire un créateur. Retourne les codes pays dont les agrégats ont changé."""
+        entry = self.contrib.pop(str(creator_id), None)
+        return self._apply(entry, -1) if entry else set()
+
+    def stats(self, level, key):
+        """Agrégats d'un groupe au format de COUNTRY_STATS (métriques, créateurs, répartitions)."""
+        g = self.index[level][key]
+        per_platform = self.sums[level][g]
+        totals = per_platform.sum(axis=0)
+        views = per_platform[:, self.metrics.index("views")]
+        total_views = views.sum()
+        if total_views > 0:
+            platform_split = dict(zip(self.platforms, (views / total_views).tolist()))
+            theme_split = dict(zip(THEMES, (self.theme_views[level][g] / total_views).tolist()))
+        else:
+            platform_split = {p: 1.0 / len(self.platforms) for p in self.platforms}
+            theme_split = {t: 0.0 for t in THEMES}
+        return {
+            "name": self.names[level][key],
+            **{m: int(round(v)) for m, v in zip(self.metrics, totals.tolist())},
+            "creators": int(round(self.counts[level][g])),
+            "platform_split": platform_split,
+            "theme_split": theme_split,
+        }
+
+    def country_stats(self):
+        """Dictionnaire {ISO: stats} au format de COUNTRY_STATS."""
+        return {iso: self.stats("country", iso) for iso in self.keys["country"]}
+
+    def table(self, level):
+        """DataFrame des agrégats d'un niveau (une ligne par groupe), classé par vues."""
+        rows = [{"key": key, **self.stats(level, key)} for key in self.keys[level]]
+        df = pd.DataFrame(rows)
+        return df.sort_values("views", ascending=False) if not df.empty else df
+
+
+class CreatorSketches:
+    """
+    Sketches HyperLogLog des identifiants de créateurs par pays × plateforme × thème
+    (plus un slot "tous thèmes"). Les registres sont denses (uint8, 2^precision par sketch) :
+    fusionner une sélection multi-pays / multi-thèmes est un maximum sur les axes choisis,
+    et le comptage distinct reste en mémoire constante quel que soit le nombre de créateurs.
+    Erreur relative typique : 1.04 / sqrt(2^precision) (~1.6 % pour precision=12).
+    """
+    def __init__(self, creators, platforms, precision=12):
+        self.precision = precision
+        self.m = 1 << precision
+        self.platforms = list(platforms)
+        self.rebuild(creators)
+
+    def rebuild(self, creators):
+        """Reconstruit tous les sketches (un HyperLogLog ne permet pas de retirer un élément)."""
+        self.isos = []
+        self.index = {}
+        self.registers = np.zeros((0, len(self.platforms), len(THEMES) + 1, self.m), dtype=np.uint8)
+        self._update([cell for c in creators for cell in self._cells(c)])
+
+    def add(self, creator):
+        """Ajoute un créateur aux sketches de son pays, de ses plateformes et de ses thèmes."""
+        self._update(self._cells(creator))
+
+    def _hash(self, creator_id):
+        """Registre et rang (position du premier bit à 1) de l'identifiant haché sur 64 bits."""
+        h = int.from_bytes(hashlib.blake2b(str(creator_id).encode(), digest_size=8).digest(), "big")
+        rest_bits = 64 - self.precision
+        rest = h & ((1 << rest_bits) - 1)
+        return h >> rest_bits, rest_bits - rest.bit_length() + 1
+
+    def _cells(self, creator):
+        """Cellules (pays, plateforme, thème, registre, rang) touchées par un créateur."""
+        country = creator.get("country")
+        iso = COUNTRY_ISO.get(country, country)
+        if not iso:
+            return []
+        row = self.index.get(iso)
+        if row is None:
+            row = self.index[iso] = len(self.isos)
+            self.isos.append(iso)
+        bucket, rank = self._hash(creator["id"])
+        p_idx = [i for i, p in enumerate(self.platforms) if p in creator.get("platforms", {})]
+        t_idx = [len(THEMES)] + [THEMES.index(t) for t in set(creator.get("tags", [])) if t in THEMES]
+        return [(row, p, t, bucket, rank) for p in p_idx for t in t_idx]
+
+    def _update(self, cells):
+        """Applique un lot de cellules : maximum groupé des rangs dans les registres (np.maximum.at)."""
+        missing = len(self.isos) - len(self.registers)
+        if missing > 0:
+            self.registers = np.concatenate(
+                (self.registers, np.zeros((missing,) + self.registers.shape[1:], dtype=np.uint8))
+            )
+        if cells:
+            rows, ps, ts, buckets, ranks = np.array(cells, dtype=np.int64).T
+            np.maximum.at(self.registers, (rows, ps, ts, buckets), ranks.astype(np.uint8))
+
+    def _estimate(self, registers):
+        """Estimation HyperLogLog (avec correction petites cardinalités) sur le dernier axe."""
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        raw = alpha * self.m ** 2 / np.exp2(-registers.astype(float)).sum(axis=-1)
+        zeros = (registers == 0).sum(axis=-1)
+        linear = self.m * np.log(self.m / np.maximum(zeros, 1))
+        return np.where((raw <= 2.5 * self.m) & (zeros > 0), linear, raw)
+
+    def _select(self, platform, themes):
+        """Registres pays × m fusionnés sur les plateformes et thèmes sélectionnés."""
+        p_idx = [self.platforms.index(platform)] if platform in self.platforms else list(range(len(self.platforms)))
+        t_idx = [THEMES.index(t) for t in (themes or []) if t in THEMES] or [len(THEMES)]
+        return self.registers[:, p_idx][:, :, t_idx].max(axis=(1, 2))
+
+    def count(self, isos=None, platform="all", themes=None):
+        """Nombre estimé de créateurs distincts sur la sélection (pays, plateforme, thèmes)."""
+        merged = self._select(platform, themes)
+        rows = [self.index[iso] for iso in isos if iso in self.index] if isos is not None else list(range(len(self.isos)))
+        if not rows:
+            return 0
+        return int(round(float(self._estimate(merged[rows].max(axis=0)))))
+
+    def count_by_country(self, isos, platform="all", themes=None):
+        """Créateurs distincts estimés pour chaque pays de `isos` (0 pour un pays inconnu)."""
+        estimates = np.rint(self._estimate(self._select(platform, themes))) if self.isos else np.zeros(0)
+        return np.array([estimates[self.index[iso]] if iso in self.index else 0 for iso in isos], dtype=float)
+
+
+# ==============================================================================
+# 7. TENDANCES (CROISSANCE RÉCENTE, COMPTEURS DE TAGS)
+# ==============================================================================
+
+class TrendingEngine:
+    """
+    Classement des tendances à partir de la croissance récente des historiques.
+    Pour chaque créateur et plateforme (all, TikTok, YouTube), seuls les trois derniers niveaux
+    mensuels de la métrique suivie sont conservés :
+        vitesse = dernier incrément / taille, accélération = (incrément - incrément précédent) / taille,
+    la taille étant le niveau en début de période (normalisation : un petit créateur qui double
+    passe devant un gros qui gagne 1 %).
+    Les scores sont mis à jour à chaque nouvelle période (push_period) ou modification de créateur,
+    et les top-k sont tenus dans des tas par (plateforme, tag). Le badge « Tendance » est réservé
+    aux `badge_k` premiers, pour rester distinctif sur un petit catalogue.
+    """
+    def __init__(self, timeseries, creators, platforms, metric="views", k=10, badge_k=3, accel_weight=0.5):
+        self.timeseries = timeseries
+        self.platforms = ["all"] + list(platforms)
+        self.metric = metric
+        self.k = k
+        self.badge_k = badge_k
+        self.accel_weight = accel_weight
+        self.rebuild(creators)
+
+    def rebuild(self, creators):
+        """Reconstruit fenêtres, scores et tas depuis le cube de séries temporelles."""
+        ts = self.timeseries
+        self.creator_ids = [str(c["id"]) for c in creators]
+        self.row_of = {cid: i for i, cid in enumerate(self.creator_ids)}
+        self.creator_tags = [list(c.get("tags", [])) for c in creators]
+        self.tag_names = sorted({t for tags in self.creator_tags for t in tags})
+        self.tag_index = {t: i for i, t in enumerate(self.tag_names)}
+
+        rows = [ts.row_of[cid] for cid in self.creator_ids]
+        self.window = self._window(ts.resample("month")["levels"][rows][:, :, ts.metrics.index(self.metric)])
+        present = ts.present[rows][:, [ts.platforms.index(p.lower()) for p in self.platforms[1:]]]
+        self.present = np.concatenate((present.any(axis=1, keepdims=True), present), axis=1)
+
+        self.tag_matrix = np.zeros((len(self.creator_ids), len(self.tag_names)))
+        for row, tags in enumerate(self.creator_tags):
+            self.tag_matrix[row, [self.tag_index[t] for t in tags]] = 1.0
+        self._score_all()
+
+    def _window(self, levels):
+        """Trois derniers niveaux par (all, plateformes) : (... × plateformes ts × T) → (... × 3 × 3)."""
+        ts = self.timeseries
+        idx = [ts.platforms.index(p.lower()) for p in self.platforms[1:]]
+        slots = np.concatenate((levels.sum(axis=-2, keepdims=True), levels[..., idx, :]), axis=-2)
+        pad = max(0, 3 - slots.shape[-1])
+        if pad:
+            slots = np.concatenate((np.zeros(slots.shape[:-1] + (pad,)), slots), axis=-1)
+        return slots[..., -3:]
+
+    def _scores(self, window):
+        """Vitesse, accélération et score d'un bloc de fenêtres (dernier axe = 3 niveaux)."""
+        last_inc = window[..., 2] - window[..., 1]
+        prev_inc = window[..., 1] - window[..., 0]
+        size = np.maximum(window[..., 1], 1.0)
+        velocity = last_inc / size
+        acceleration = (last_inc - prev_inc) / size
+        return velocity, acceleration, velocity + self.accel_weight * acceleration
+
+    def _score_all(self):
+        """Recalcule tous les scores et reconstruit les tas."""
+        self.velocity, self.acceleration, self.score = self._scores(self.window)
+        self.heaps = {}
+        for platform in self.platforms:
+            self._build_heap(platform, None)
+            for tag in self.tag_names:
+                self._build_heap(platform, tag)
+
+    def _group_rows(self, platform, tag):
+        """Lignes des créateurs présents sur la plateforme (et portant le tag)."""
+        mask = self.present[:, self.platforms.index(platform)]
+        if tag is not None:
+            mask = mask & (self.tag_matrix[:, self.tag_index[tag]] > 0)
+        return np.flatnonzero(mask)
+
+    def _build_heap(self, platform, tag):
+        """Tas min des k meilleurs scores (score, id) du groupe (plateforme, tag)."""
+        slot = self.platforms.index(platform)
+        rows = self._group_rows(platform, tag)
+        if len(rows) > self.k:
+            rows = rows[np.argpartition(-self.score[rows, slot], self.k - 1)[:self.k]]
+        heap = [(float(self.score[r, slot]), self.creator_ids[r]) for r in rows]
+        heapq.heapify(heap)
+        self.heaps[(platform, tag)] = heap
+
+    def _offer(self, platform, tag, row):
+        """Propose le créateur `row` au tas (plateforme, tag) après modification de son score."""
+        key = (platform, tag)
+        heap = self.heaps.get(key, [])
+        cid = self.creator_ids[row]
+        slot = self.platforms.index(platform)
+        if any(member == cid for _, member in heap):
+            # Un score qui baisse peut faire sortir le créateur du top-k : reconstruction du groupe
+            self._build_heap(platform, tag)
+            return
+        if not self.present[row, slot]:
+            return
+        if tag is not None and not self.tag_matrix[row, self.tag_index[tag]]:
+            # Tag retiré au créateur : il ne peut pas entrer dans le top-k de ce tag
+            return
+        entry = (float(self.score[row, slot]), cid)
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+        self.heaps[key] = heap
+
+    def push_period(self, levels):
+        """
+        Nouvelle période pour tous les créateurs : `levels` (créateurs × plateformes ts),
+        niveaux de la métrique suivie dans l'ordre de `creator_ids`.
+        """
+        new = self._window(np.asarray(levels, dtype=float)[..., None])[..., -1]
+        self.window = np.concatenate((self.window[..., 1:], new[..., None]), axis=-1)
+        self._score_all()
+
+    def upsert(self, creator):
+        """Ajoute ou met à jour un créateur (le cube de séries temporelles doit être à jour)."""
+        ts = self.timeseries
+        cid = str(creator["id"])
+        tags = [t for t in creator.get("tags", []) if t in self.tag_index]
+        if any(t not in self.tag_index for t in creator.get("tags", [])) or cid not in self.row_of:
+            # Nouveau créateur ou nouveau tag : les lignes et colonnes changent
+            creators = [{"id": c, "tags": t} for c, t in zip(self.creator_ids, self.creator_tags)]
+            self.rebuild([c for c in creators if c["id"] != cid] + [{"id": cid, "tags": creator.get("tags", [])}])
+            return
+
+        row = self.row_of[cid]
+        ts_row = ts.row_of[cid]
+        old_tags = self.creator_tags[row]
+        self.window[row] = self._window(ts.resample("month")["levels"][ts_row][:, ts.metrics.index(self.metric)])
+        present = ts.present[ts_row][[ts.platforms.index(p.lower()) for p in self.platforms[1:]]]
+        self.present[row] = np.r_[present.any(), present]
+        self.creator_tags[row] = tags
+        self.tag_matrix[row] = 0.0
+        self.tag_matrix[row, [self.tag_index[t] for t in tags]] = 1.0
+
+        self.velocity[row], self.acceleration[row], self.score[row] = self._scores(self.window[row])
+        for platform in self.platforms:
+            for tag in [None] + sorted(set(old_tags) | set(tags)):
+                self._offer(platform, tag, row)
+
+    def remove(self, creator_id):
+        """Retire un créateur (reconstruction : les lignes sont décalées)."""
+        cid = str(creator_id)
+        if cid in self.row_of:
+            creators = [{"id": c, "tags": t} for c, t in zip(self.creator_ids, self.creator_tags) if c != cid]
+            self.rebuild(creators)
+
+    def top_creators(self, platform="all", tag=None, k=None):
+        """[(id, score)] des créateurs en tendance, du plus fort au plus faible (O(k log k))."""
+        heap = self.heaps.get((platform, tag), [])
+        return [(cid, score) for score, cid in heapq.nlargest(k or self.k, heap)]
+
+    def is_trending(self, creator_id, platform="all"):
+        """Le créateur fait-il partie des `badge_k` premiers de la plateforme ?"""
+        cid = str(creator_id)
+        return any(member == cid for member, _ in self.top_creators(platform, k=self.badge_k))
+
+    def creator_score(self, creator_id, platform="all"):
+        """Score de tendance d'un créateur (0 si inconnu)."""
+        row = self.row_of.get(str(creator_id))
+        return 0.0 if row is None else float(self.score[row, self.platforms.index(platform)])
+
+class TagTrendCounters:
+    """
+    Compteurs de tendance par tag en fenêtres glissantes.
+    Chaque tag dispose d'un tampon circulaire de 2 × window périodes (mois) comptant les créateurs
+    actifs, les nouvelles vidéos et les vues. Les sommes de la fenêtre courante et de la fenêtre
+    précédente sont tenues à jour à chaque événement (O(1)) et à chaque changement de période,
+    d'où la croissance d'une fenêtre sur l'autre sans relecture des historiques.
+    """
+    COUNTERS = ["creators", "videos", "views"]
+
+    def __init__(self, window=3):
+        self.window = window
+        self.size = 2 * window
+        self.tag_names = []
+        self.tag_index = {}
+        self.buffer = np.zeros((0, self.size, len(self.COUNTERS)))
+        self.current = np.zeros((0, len(self.COUNTERS)))
+        self.previous = np.zeros((0, len(self.COUNTERS)))
+        self.head = None  # Clé de la période la plus récente
+        self._rankings = {}
+
+    def _row(self, tag):
+        """Ligne du tag (ajoutée à la volée pour un tag inconnu)."""
+        row = self.tag_index.get(tag)
+        if row is None:
+            row = self.tag_index[tag] = len(self.tag_names)
+            self.tag_names.append(tag)
+            self.buffer = np.concatenate((self.buffer, np.zeros((1,) + self.buffer.shape[1:])))
+            self.current = np.concatenate((self.current, np.zeros((1, len(self.COUNTERS)))))
+            self.previous = np.concatenate((self.previous, np.zeros((1, len(self.COUNTERS)))))
+        return row
+
+    def advance(self, bucket):
+        """Fait glisser les fenêtres jusqu'à la période `bucket` (coût indépendant du nombre d'événements)."""
+        if self.head is None or bucket - self.head >= self.size:
+            self.buffer[:] = 0.0
+            self.current[:] = 0.0
+            self.previous[:] = 0.0
+            self.head = bucket
+            self._rankings = {}
+            return
+        while self.head < bucket:
+            self.head += 1
+            # La période head - window passe de la fenêtre courante à la précédente
+            moving = self.buffer[:, (self.head - self.window) % self.size]
+            self.current -= moving
+            self.previous += moving
+            # La période head - 2 × window (même case que la nouvelle période) sort du tampon
+            expired = self.head % self.size
+            self.previous -= self.buffer[:, expired]
+            self.buffer[:, expired] = 0.0
+            self._rankings = {}
+
+    def record(self, tag, bucket, creators=0, videos=0, views=0):
+        """
+        Enregistre l'activité d'un tag sur la période `bucket` (O(1)).
+        `creators` compte les créateurs actifs : un relevé par créateur et par période.
+        """
+        if self.head is None or bucket > self.head:
+            self.advance(bucket)
+        age = self.head - bucket
+        if age >= self.size:
+            return
+        row = self._row(tag)
+        values = (creators, videos, views)
+        self.buffer[row, bucket % self.size] += values
+        if age < self.window:
+            self.current[row] += values
+        else:
+            self.previous[row] += values
+        self._rankings = {}
+
+    def growth(self, tag, counter="views"):
+        """Croissance (%) de la fenêtre courante sur la précédente (None si la précédente est vide)."""
+        row = self.tag_index.get(tag)
+        col = self.COUNTERS.index(counter)
+        if row is None or self.previous[row, col] <= 0:
+            return None
+        return (self.current[row, col] - self.previous[row, col]) / self.previous[row, col] * 100
+
+    def _ranking(self, kind, counter):
+        """Ordre des tags mis en cache jusqu'au prochain événement : les requêtes lisent les k premiers."""
+        key = (kind, counter)
+        if key not in self._rankings:
+            col = self.COUNTERS.index(counter)
+            cur, prev = self.current[:, col], self.previous[:, col]
+            if kind == "new":
+                rows, scores = np.flatnonzero((prev <= 0) & (cur > 0)), cur
+            else:
+                # Seuls les tags en hausse sont « en tendance » (un tag en recul n'est pas classé)
+                rows = np.flatnonzero((prev > 0) & (cur > prev))
+                scores = np.zeros(len(cur))
+                scores[rows] = (cur[rows] - prev[rows]) / prev[rows]
+            self._rankings[key] = rows[np.argsort(-scores[rows], kind="stable")].tolist()
+        return self._rankings[key]
+
+    def _card(self, rank, row, growth):
+        """Entrée au format de render_topic_card (créateurs actifs sur la dernière période)."""
+        active = self.buffer[row, self.head % self.size, self.COUNTERS.index("creators")]
+        return {"rank": rank, "name": self.tag_names[row], "creators": int(active), "growth": growth}
+
+    def top(self, k=6, counter="views"):
+        """Tags en plus forte croissance, au format attendu par render_topic_card."""
+        col = self.COUNTERS.index(counter)
+        return [
+            self._card(rank, row, f"{(self.current[row, col] / self.previous[row, col] - 1) * 100:+.0f}%")
+            for rank, row in enumerate(self._ranking("trending", counter)[:k], start=1)
+        ]
+
+    def new_tags(self, k=4, counter="views"):
+        """Tags apparus dans la fenêtre courante (aucune activité dans la précédente)."""
+        return [
+            self._card(rank, row, "Nouveau")
+            for rank, row in enumerate(self._ranking("new", counter)[:k], start=1)
+        ]
+
+# ==============================================================================
+# 8. CRÉATEURS SIMILAIRES & RECOMMANDATIONS
+# ==============================================================================
+
+class CurveSimilarityIndex:
+    """
+    Voisins les plus proches par forme de courbe de croissance.
+    Chaque créateur est décrit par ses historiques mensuels (plateformes cumulées) centrés-réduits
+    par métrique : seule la forme compte, pas la taille. (Un passage en log rendrait identiques
+    toutes les courbes en puissance du temps, d'où un z-score sur les niveaux bruts.)
+    Les vecteurs étant normalisés, la similarité cosinus de tout le catalogue est un produit
+    matriciel, calculé par blocs de lignes avec un top-k (argpartition) par bloc.
+    Les listes de voisins sont mises en cache et recalculées quand les historiques changent.
+    """
+    def __init__(self, timeseries, metrics=("followers", "views", "likes"), k=10, block=1024):
+        self.timeseries = timeseries
+        self.metrics = list(metrics)
+        self.k = k
+        self.block = block
+        self.version = None
+
+    def _features(self):
+        """Matrice créateurs × (métriques × mois) : z-score par métrique, puis norme L2 unitaire."""
+        ts = self.timeseries
+        levels = ts.resample("month")["levels"].sum(axis=1)[:, [ts.metrics.index(m) for m in self.metrics]]
+        std = levels.std(axis=-1, keepdims=True)
+        curves = np.divide(levels - levels.mean(axis=-1, keepdims=True), std,
+                           out=np.zeros_like(levels), where=std > 0)
+        features = curves.reshape(len(curves), -1)
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        return np.divide(features, norms, out=np.zeros_like(features), where=norms > 0)
+
+    def _build(self):
+        """Top-k voisins de tous les créateurs, bloc par bloc (mémoire bornée à block × créateurs)."""
+        features = self._features()
+        n = len(features)
+        k = min(self.k, max(n - 1, 0))
+        self.neighbours = np.zeros((n, k), dtype=int)
+        self.similarities = np.zeros((n, k))
+        for start in range(0, n, self.block):
+            stop = min(start + self.block, n)
+            sims = features[start:stop] @ features.T
+            # Le créateur lui-même est exclu de ses voisins
+            sims[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+            if k == 0:
+                continue
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            top_sims = np.take_along_axis(sims, top, axis=1)
+            order = np.argsort(-top_sims, axis=1, kind="stable")
+            self.neighbours[start:stop] = np.take_along_axis(top, order, axis=1)
+            self.similarities[start:stop] = np.take_along_axis(top_sims, order, axis=1)
+        self.version = self.timeseries.version
+
+    def similar(self, creator_id, k=None):
+        """[(id, similarité cosinus)] des créateurs dont la courbe est la plus proche."""
+        if self.version != self.timeseries.version:
+            self._build()
+        row = self.timeseries.row_of.get(str(creator_id))
+        if row is None:
+            return []
+        ids = self.timeseries.creator_ids
+        return [
+            (ids[j], float(s))
+            for j, s in zip(self.neighbours[row][:k or self.k], self.similarities[row][:k or self.k])
+        ]
+
+class CreatorRecommender:
+    """
+    Recommandations à partir d'un ensemble de favoris.
+    Les créateurs sont décrits par des matrices denses (créateurs × tags normalisée L2,
+    one-hot pays et langue) et par leur taux d'engagement centré-réduit. Le profil des favoris
+    est la moyenne de leurs lignes ; le score pondéré de tout le catalogue est donc un produit
+    matrice-vecteur, et le top-k est extrait par argpartition. Résultats mis en cache par ensemble de favoris.
+
+    Pour les grands catalogues, un thread d'arrière-plan calcule (ou relit sur disque) les
+    `neighbours_k` plus proches voisins de chaque créateur ; seule l'union des listes de voisins
+    des favoris est alors notée avec le profil moyen. Le résultat est approché : les scores sont
+    ceux du passage complet, mais un créateur proche du profil moyen sans figurer dans aucune
+    liste de voisins d'un favori est manqué (d'autant plus que `neighbours_k` est petit devant le
+    catalogue). Le passage complet reste utilisé tant que les listes ne sont pas prêtes.
+    La mise à jour d'un créateur (upsert / remove) remplace sa ligne et ne recalcule que les
+    listes de voisins qu'elle peut modifier.
+    """
+    WEIGHTS = {"tags": 0.6, "country": 0.15, "language": 0.15, "engagement": 0.1}
+
+    def __init__(self, creators, engagement, k=6, cache_path=None, neighbours_k=20, block=1024):
+        self.k = k
+        self.cache_path = cache_path
+        self.neighbours_k = neighbours_k
+        self.block = block
+        self.generation = 0
+        # Protège le cache et les listes de voisins, remplacés par le thread d'arrière-plan
+        self._lock = threading.Lock()
+        self.rebuild(creators, engagement)
+
+    @staticmethod
+    def _one_hot(values):
+        """Matrice one-hot (lignes × modalités) d'une liste de valeurs catégorielles, et index des modalités."""
+        index = {v: i for i, v in enumerate(sorted(set(values)))}
+        matrix = np.zeros((len(values), len(index)))
+        matrix[np.arange(len(values)), [index[v] for v in values]] = 1.0
+        return matrix, index
+
+    @staticmethod
+    def _standardize(engagement):
+        """Taux d'engagement centré-réduit (NaN -> 0)."""
+        engagement = np.nan_to_num(np.asarray(engagement, dtype=float))
+        std = engagement.std()
+        return (engagement - engagement.mean()) / std if std > 0 else np.zeros_like(engagement)
+
+    def rebuild(self, creators, engagement):
+        """(Re)construit les matrices de caractéristiques et vide le cache."""
+        self.creator_ids = [str(c["id"]) for c in creators]
+        self.row_of = {cid: i for i, cid in enumerate(self.creator_ids)}
+
+        tag_lists = [c.get("tags", []) for c in creators]
+        self.tag_index = {t: i for i, t in enumerate(sorted({t for tags in tag_lists for t in tags}))}
+        tags = np.zeros((len(creators), len(self.tag_index)))
+        for row, tag_list in enumerate(tag_lists):
+            tags[row, [self.tag_index[t] for t in tag_list]] = 1.0
+        norms = np.linalg.norm(tags, axis=1, keepdims=True)
+        self.tags = np.divide(tags, norms, out=np.zeros_like(tags), where=norms > 0)
+
+        self.country, self.country_index = self._one_hot([c.get("country", "") for c in creators])
+        self.language, self.language_index = self._one_hot([c.get("language", "") for c in creators])
+        self.engagement = self._standardize(engagement)
+
+        # Listes de voisins : invalidées puis recalculées en arrière-plan pour ce catalogue
+        with self._lock:
+            self._cache = {}
+            self.generation += 1
+            self.neighbour_lists = None
+        self._start_job()
+
+    def _start_job(self):
+        """Lance le calcul des listes de voisins en arrière-plan pour la génération courante."""
+        if self.cache_path:
+            self.job = threading.Thread(target=self._neighbour_job, args=(self.generation,), daemon=True)
+            self.job.start()
+
+    def _encode(self, matrix, index, values):
+        """Ligne binaire des modalités `values` ; une modalité inconnue ajoute une colonne nulle à la matrice."""
+        for value in values:
+            if value not in index:
+                index[value] = matrix.shape[1]
+                matrix = np.concatenate((matrix, np.zeros((len(matrix), 1))), axis=1)
+        row = np.zeros(matrix.shape[1])
+        row[[index[v] for v in values]] = 1.0
+        return matrix, row
+
+    def upsert(self, creator, engagement):
+        """
+        Ajoute ou remplace la ligne d'un créateur. `engagement` couvre tout le catalogue (ordre de
+        creator_ids après ajout) : sa standardisation est recalculée, c'est un simple vecteur.
+        """
+        cid = str(creator["id"])
+        row = self.row_of.get(cid, len(self.creator_ids))
+        tags, tag_row = self._encode(self.tags, self.tag_index, list(dict.fromkeys(creator.get("tags", []))))
+        country, country_row = self._encode(self.country, self.country_index, [creator.get("country", "")])
+        language, language_row = self._encode(self.language, self.language_index, [creator.get("language", "")])
+        norm = np.linalg.norm(tag_row)
+
+        # Nouvelles matrices assignées d'un bloc : le job d'arrière-plan lit un instantané cohérent
+        self.tags = set_row(tags, row, tag_row / norm if norm > 0 else tag_row)
+        self.country = set_row(country, row, country_row)
+        self.language = set_row(language, row, language_row)
+        self.engagement = self._standardize(engagement)
+        if row == len(self.creator_ids):
+            self.creator_ids = self.creator_ids + [cid]
+            self.row_of[cid] = row
+        self._patch_neighbours(changed=row)
+
+    def remove(self, creator_id, engagement):
+        """Retire la ligne d'un créateur ; `engagement` couvre le catalogue restant."""
+        row = self.row_of.get(str(creator_id))
+        if row is None:
+            return
+        self.creator_ids = self.creator_ids[:row] + self.creator_ids[row + 1:]
+        self.row_of = {cid: i for i, cid in enumerate(self.creator_ids)}
+        self.tags = np.delete(self.tags, row, axis=0)
+        self.country = np.delete(self.country, row, axis=0)
+        self.language = np.delete(self.language, row, axis=0)
+        self.engagement = self._standardize(engagement)
+        self._patch_neighbours(removed=row)
+
+    def _patch_neighbours(self, changed=None, removed=None):
+        """
+        Met à jour les listes de voisins après la modification de la ligne `changed` ou le retrait
+        de la ligne `removed` : seules les listes qui contenaient cette ligne, ou qu'elle intègre
+        désormais, sont recalculées. Les scores des autres listes gardent l'ancienne standardisation
+        de l'engagement : ils ne servent qu'à choisir les candidats, re-notés à chaque recommandation.
+        Listes pas encore prêtes : le job d'arrière-plan est relancé.
+        """
+        with self._lock:
+            # Listes retirées pendant la mise à jour : les lectures passent par le catalogue complet
+            self._cache = {}
+            self.generation += 1
+            lists, self.neighbour_lists = self.neighbour_lists, None
+        if lists is None:
+            self._start_job()
+            return
+
+        features = self._features()
+        neighbours, scores = lists
+        n = len(features[0])
+        k = min(self.neighbours_k, max(n - 1, 0))
+        if k != neighbours.shape[1]:
+            # Petit catalogue : la longueur des listes change, recalcul complet
+            lists = self.compute_neighbours(features, k)
+        else:
+            if removed is not None:
+                affected = np.flatnonzero((neighbours == removed).any(axis=1))
+                neighbours = np.delete(neighbours, removed, axis=0)
+                scores = np.delete(scores, removed, axis=0)
+                affected = affected[affected != removed]
+                affected = affected - (affected > removed)
+                neighbours = neighbours - (neighbours > removed)
+            else:
+                if changed == len(neighbours):
+                    neighbours = np.concatenate((neighbours, np.zeros((1, k), dtype=neighbours.dtype)))
+                    scores = np.concatenate((scores, np.zeros((1, k))))
+                # Score du créateur modifié vu depuis chaque ligne (matrice symétrique)
+                column = self._pair_scores(features, [changed])[0]
+                column[changed] = -np.inf
+                affected = np.flatnonzero(
+                    (neighbours == changed).any(axis=1) | (column > (scores[:, -1] if k else np.inf))
+                )
+                affected = np.union1d(affected, [changed])
+            if k and len(affected):
+                neighbours[affected], scores[affected] = self.compute_neighbours(features, k, rows=affected)
+            lists = (neighbours, scores)
+        with self._lock:
+            self.neighbour_lists = lists
+            self._cache = {}
+
+    def _features(self):
+        """Instantané des matrices (une reconstruction les remplace sans les modifier en place)."""
+        return self.creator_ids, self.tags, self.country, self.language, self.engagement
+
+    def fingerprint(self, features):
+        """Empreinte du catalogue et des pondérations : valide les voisins persistés."""
+        ids, *matrices = features
+        digest = hashlib.sha1("\n".join(ids).encode())
+        for matrix in matrices:
+            digest.update(np.ascontiguousarray(matrix).tobytes())
+        digest.update(repr(sorted(self.WEIGHTS.items())).encode())
+        return digest.hexdigest()
+
+    def _pair_scores(self, features, rows):
+        """Scores (len(rows) × créateurs) de chaque ligne de `rows` prise seule comme profil."""
+        _, tags, country, language, engagement = features
+        w = self.WEIGHTS
+        return (
+            w["tags"] * (tags[rows] @ tags.T)
+            + w["country"] * (country[rows] @ country.T)
+            + w["language"] * (language[rows] @ language.T)
+            + w["engagement"] * np.exp(-np.abs(engagement[rows, None] - engagement[None, :]))
+        )
+
+    def compute_neighbours(self, features, k, rows=None):
+        """Top-k voisins de chaque créateur (ou des lignes `rows`) pris seul comme profil, par blocs de lignes."""
+        n = len(features[1])
+        rows = np.arange(n) if rows is None else np.asarray(rows)
+        k = min(k, max(n - 1, 0))
+        neighbours = np.zeros((len(rows), k), dtype=np.int64)
+        scores = np.zeros((len(rows), k))
+        for start in range(0, len(rows), self.block):
+            stop = min(start + self.block, len(rows))
+            block = self._pair_scores(features, rows[start:stop])
+            block[np.arange(stop - start), rows[start:stop]] = -np.inf
+            if k == 0:
+                continue
+            top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(block, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            neighbours[start:stop] = np.take_along_axis(top, order, axis=1)
+            scores[start:stop] = np.take_along_axis(top_scores, order, axis=1)
+        return neighbours, scores
+
+    def _neighbour_job(self, generation):
+        """
+        Job d'arrière-plan : relit les voisins persistés s'ils correspondent au catalogue courant,
+        sinon les calcule et les enregistre (écriture atomique). Ignoré si le catalogue a changé entre-temps.
+        """
+        features = self._features()
+        fingerprint = self.fingerprint(features)
+        lists = None
+        try:
+            with np.load(self.cache_path) as saved:
+                if str(saved["fingerprint"]) == fingerprint:
+                    lists = (saved["neighbours"], saved["scores"])
+        except (OSError, KeyError, ValueError):
+            lists = None
+
+        if lists is None:
+            lists = self.compute_neighbours(features, self.neighbours_k)
+            directory = os.path.dirname(self.cache_path)
+            os.makedirs(directory, exist_ok=True)
+            # Fichier temporaire propre à ce job : deux workers ne s'écrasent pas avant le renommage
+            with tempfile.NamedTemporaryFile(dir=directory, suffix=".npz", delete=False) as tmp:
+                np.savez(tmp, fingerprint=fingerprint, neighbours=lists[0], scores=lists[1])
+            try:
+                os.replace(tmp.name, self.cache_path)
+            except OSError:
+                os.unlink(tmp.name)
+                raise
+
+        with self._lock:
+            if generation == self.generation:
+                self.neighbour_lists = lists
+                self._cache = {}
+
+    def scores(self, rows, candidates=None):
+        """Score de similarité avec le profil moyen des lignes `rows` (tout le catalogue ou `candidates`)."""
+        w = self.WEIGHTS
+        subset = slice(None) if candidates is None else candidates
+        tag_profile = self.tags[rows].mean(axis=0)
+        tag_norm = np.linalg.norm(tag_profile)
+        return (
+            w["tags"] * (self.tags[subset] @ (tag_profile / tag_norm if tag_norm > 0 else tag_profile))
+            + w["country"] * (self.country[subset] @ self.country[rows].mean(axis=0))
+            + w["language"] * (self.language[subset] @ self.language[rows].mean(axis=0))
+            + w["engagement"] * np.exp(-np.abs(self.engagement[subset] - self.engagement[rows].mean()))
+        )
+
+    def recommend(self, favorite_ids, k=None):
+        """
+        [(id, score)] des k meilleurs créateurs hors favoris, triés par score décroissant
+        (exact sur tout le catalogue, approché sur les listes de voisins une fois prêtes).
+        """
+        k = k or self.k
+        key = (frozenset(str(i) for i in favorite_ids or []), k)
+        with self._lock:
+            cache, lists = self._cache, self.neighbour_lists
+            if key in cache:
+                return cache[key]
+
+        rows = [self.row_of[cid] for cid in key[0] if cid in self.row_of]
+        result = []
+        if rows:
+            if lists is not None:
+                # Candidats : union des listes de voisins des favoris, notée avec le profil moyen
+                # (approché : un créateur absent de toutes ces listes ne peut pas être recommandé)
+                candidates = np.setdiff1d(lists[0][rows].ravel(), rows)
+            else:
+                # Listes de voisins pas encore prêtes : passage vectorisé sur tout le catalogue
+                candidates = np.setdiff1d(np.arange(len(self.creator_ids)), rows)
+            scores = self.scores(rows, candidates)
+            order = np.arange(len(candidates))
+            if len(candidates) > k:
+                order = np.argpartition(-scores, k - 1)[:k]
+            order = order[np.argsort(-scores[order], kind="stable")]
+            result = [(self.creator_ids[candidates[i]], float(scores[i])) for i in order]
+
+        with self._lock:
+            # Le cache a pu être remplacé pendant le calcul : on n'alimente que le cache courant
+            if cache is self._cache:
+                cache[key] = result
+        return result
 
 # ==============================================================================
-# 4. GESTIONNAIRE DE DONNÉES (DATA MANAGER)
+# 9. ARCHÉTYPES DE CROISSANCE (K-MEANS)
+# ==============================================================================
+
+class GrowthArchetypes:
+    """
+    Regroupement des créateurs en archétypes de croissance (GROWTH_ARCHETYPES).
+    Caractéristiques : courbes mensuelles d'abonnés et de vues (plateformes cumulées) divisées
+    par leur dernière valeur, donc comparables quelle que soit la taille du créateur.
+    Un k-means complet (initialisation k-means++) est lancé à la construction ; les nouvelles
+    données passent ensuite par des mises à jour mini-batch des centroïdes (taux 1 / effectif).
+    Les centroïdes sont nommés selon la part de la valeur finale gagnée sur les derniers mois :
+    les pages ne lisent que les étiquettes stockées.
+    """
+    def __init__(self, timeseries, archetypes, metrics=("followers", "views"), recent=3, n_iter=50, seed=0):
+        self.timeseries = timeseries
+        self.archetypes = list(archetypes)
+        self.metrics = list(metrics)
+        self.recent = recent
+        self.n_iter = n_iter
+        self.rng = np.random.default_rng(seed)
+        self.fit()
+
+    def features(self, creator_ids=None):
+        """Courbes normalisées (créateurs × (métriques × mois)) pour les ids donnés (tous par défaut)."""
+        ts = self.timeseries
+        ids = ts.creator_ids if creator_ids is None else [str(c) for c in creator_ids]
+        levels = ts.resample("month")["levels"][[ts.row_of[c] for c in ids]].sum(axis=1)
+        curves = levels[:, [ts.metrics.index(m) for m in self.metrics]]
+        last = curves[..., -1:]
+        curves = np.divide(curves, last, out=np.zeros_like(curves), where=last > 0)
+        return curves.reshape(len(ids), -1)
+
+    def _init_centroids(self, X, k):
+        """Initialisation k-means++ : chaque centre tiré proportionnellement à la distance au plus proche."""
+        centroids = [X[self.rng.integers(len(X))]]
+        for _ in range(1, k):
+            dist = ((X[:, None, :] - np.array(centroids)[None]) ** 2).sum(axis=-1).min(axis=1)
+            total = dist.sum()
+            idx = self.rng.choice(len(X), p=dist / total) if total > 0 else self.rng.integers(len(X))
+            centroids.append(X[idx])
+        return np.array(centroids)
+
+    def _assign(self, X):
+        """Centroïde le plus proche de chaque ligne (distances au carré développées : une multiplication)."""
+        dist = (X ** 2).sum(axis=1)[:, None] - 2 * X @ self.centroids.T + (self.centroids ** 2).sum(axis=1)[None]
+        return dist.argmin(axis=1)
+
+    def fit(self):
+        """k-means complet (Lloyd) sur tout le catalogue."""
+        X = self.features()
+        self.creator_ids = list(self.timeseries.creator_ids)
+        k = min(len(self.archetypes), len(X))
+        if k == 0:
+            self.centroids, self.counts, self.labels = np.zeros((0, X.shape[1])), np.zeros(0), {}
+            self.names = []
+            return
+        self.centroids = self._init_centroids(X, k)
+        for _ in range(self.n_iter):
+            assignment = self._assign(X)
+            onehot = np.eye(k)[assignment]
+            counts = onehot.sum(axis=0)
+            # Un centroïde vide garde sa position
+            new = np.divide(onehot.T @ X, counts[:, None], out=self.centroids.copy(), where=counts[:, None] > 0)
+            if np.allclose(new, self.centroids):
+                break
+            self.centroids = new
+        assignment = self._assign(X)
+        self.counts = np.bincount(assignment, minlength=k).astype(float)
+        self.assignment = dict(zip(self.creator_ids, assignment.tolist()))
+        self._name_centroids()
+
+    def partial_fit(self, creator_ids):
+        """Mini-batch : affecte les créateurs donnés et déplace leurs centroïdes (taux 1 / effectif)."""
+        creator_ids = [str(c) for c in creator_ids]
+        if not len(self.centroids):
+            self.fit()
+            return
+        X = self.features(creator_ids)
+        for cid, x, cluster in zip(creator_ids, X, self._assign(X)):
+            old = self.assignment.get(cid)
+            if old is not None:
+                self.counts[old] = max(self.counts[old] - 1, 0)
+            self.counts[cluster] += 1
+            self.centroids[cluster] += (x - self.centroids[cluster]) / self.counts[cluster]
+            self.assignment[cid] = int(cluster)
+        self._name_centroids()
+
+    def remove(self, creator_id):
+        """Oublie l'affectation d'un créateur retiré."""
+        cluster = self.assignment.pop(str(creator_id), None)
+        self.labels.pop(str(creator_id), None)
+        if cluster is not None:
+            self.counts[cluster] = max(self.counts[cluster] - 1, 0)
+
+    def _name_centroids(self):
+        """Nomme les centroïdes : plus forte part gagnée sur les `recent` derniers mois = premier archétype."""
+        curves = self.centroids.reshape(len(self.centroids), len(self.metrics), -1)
+        recent = min(self.recent, curves.shape[-1] - 1)
+        gain = (curves[..., -1] - curves[..., -1 - recent]).mean(axis=1) if recent > 0 else np.zeros(len(curves))
+        self.names = [None] * len(curves)
+        for archetype, cluster in zip(self.archetypes, np.argsort(-gain, kind="stable")):
+            self.names[cluster] = archetype
+        self.labels = {cid: self.names[cluster] for cid, cluster in self.assignment.items()}
+
+    def label(self, creator_id):
+        """Archétype d'un créateur (None si inconnu)."""
+        return self.labels.get(str(creator_id))
+
+# ==============================================================================
+# 10. VIDÉOS (INDEX PRÉ-TRIÉS PAR CRÉATEUR, RECHERCHE PLEIN TEXTE)
+# ==============================================================================
+
+class VideoStore:
+    """
+    Vidéos rangées par (créateur, plateforme), avec une clé "combined" toutes plateformes.
+    Pour chaque liste, les métriques sont stockées en colonnes NumPy et un index trié par
+    métrique décroissante est précalculé : une page triée est une tranche d'index (l'ordre
+    croissant parcourt le même index à l'envers), sans tri à l'affichage.
+    """
+    METRICS = ["views", "likes", "shares", "comments"]
+
+    def __init__(self, creators, videos_by_platform):
+        self.rebuild(creators, videos_by_platform)
+
+    def rebuild(self, creators, videos_by_platform):
+        """(Re)construit toutes les listes depuis {plateforme: [vidéo...]} (vidéos liées par @username)."""
+        id_of = {c.get("username"): str(c["id"]) for c in creators}
+        grouped = {}
+        for platform, videos in videos_by_platform.items():
+            for video in videos:
+                cid = id_of.get(video.get("creator"))
+                if cid is not None:
+                    grouped.setdefault((cid, platform), []).append(video)
+        self.lists = {}
+        self.platforms_of = {}
+        for (cid, platform), videos in grouped.items():
+            self.add_videos(cid, platform, videos)
+
+    def _index(self, videos):
+        """Colonnes de métriques et index triés (décroissants, stables) d'une liste de vidéos."""
+        columns = {m: np.array([v.get(m) or 0 for v in videos], dtype=np.int64) for m in self.METRICS}
+        order = {m: np.argsort(-col, kind="stable") for m, col in columns.items()}
+        return {"videos": videos, "columns": columns, "order": order}
+
+    def add_videos(self, creator_id, platform, videos):
+        """Ajoute des vidéos à un créateur et ré-indexe ses listes (plateforme et combinée)."""
+        cid = str(creator_id)
+        current = self.lists.get((cid, platform), {"videos": []})["videos"]
+        self.lists[(cid, platform)] = self._index(current + list(videos))
+        platforms = self.platforms_of.setdefault(cid, [])
+        if platform not in platforms:
+            platforms.append(platform)
+        combined = [v for p in platforms for v in self.lists[(cid, p)]["videos"]]
+        self.lists[(cid, "combined")] = self._index(combined)
+
+    def count(self, creator_id, platform="combined"):
+        """Nombre de vidéos d'un créateur sur une plateforme ("combined" = toutes)."""
+        entry = self.lists.get((str(creator_id), platform))
+        return len(entry["videos"]) if entry else 0
+
+    def page(self, creator_id, platform="combined", metric="views", order="desc", page=1, per_page=3):
+        """Vidéos de la page demandée, triées par `metric` : tranche de l'index pré-trié."""
+        entry = self.lists.get((str(creator_id), platform))
+        if entry is None:
+            return []
+        index = entry["order"].get(metric, entry["order"]["views"])
+        if order != "desc":
+            index = index[::-1]
+        start = (max(page, 1) - 1) * per_page
+        return [entry["videos"][i] for i in index[start:start + per_page]]
+
+def parse_duration(text):
+    """Durée "MM:SS" ou "HH:MM:SS" en secondes (0 si absente ou invalide)."""
+    try:
+        seconds = 0
+        for part in str(text or "").split(":"):
+            seconds = seconds * 60 + int(part)
+        return seconds
+    except ValueError:
+        return 0
+
+def tokenize_text(text):
+    """Jetons en minuscules, sans accents (ex: "Vlog Japon" -> ["vlog", "japon"])."""
+    text = unicodedata.normalize("NFKD", str(text or "").lower())
+    return re.findall(r"[a-z0-9]+", text.encode("ascii", "ignore").decode())
+
+class VideoSearchIndex:
+    """
+    Index inversé plein texte des vidéos (titre, @username du créateur, plateforme).
+    Chaque jeton pointe vers ses listes (id de vidéo, fréquence) ; l'ajout d'une vidéo ne touche
+    que ses propres jetons (construction incrémentale). Classement : BM25 normalisé par le meilleur
+    score, combiné aux vues (log) ; filtres de plateforme, de durée et de vues sur les candidats.
+    """
+    def __init__(self, k1=1.2, b=0.75, views_weight=0.3):
+        self.k1 = k1
+        self.b = b
+        self.views_weight = views_weight
+        self.videos = []
+        self.postings = {}
+        self.lengths = []
+        self.total_length = 0
+        self.durations = []
+        self.views = []
+
+    def add(self, video):
+        """Indexe une vidéo (O(nombre de jetons))."""
+        doc = len(self.videos)
+        tokens = (tokenize_text(video.get("title")) + tokenize_text(video.get("creator"))
+                  + tokenize_text(video.get("platform")))
+        counts = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            self.postings.setdefault(token, []).append((doc, tf))
+        self.videos.append(video)
+        self.lengths.append(len(tokens))
+        self.total_length += len(tokens)
+        self.durations.append(parse_duration(video.get("duration")))
+        self.views.append(video.get("views") or 0)
+        return doc
+
+    def add_many(self, videos):
+        """Indexe une liste de vidéos."""
+        for video in videos:
+            self.add(video)
+
+    def _bm25(self, tokens):
+        """{id: score BM25} des vidéos contenant au moins un jeton de la requête."""
+        n = len(self.videos)
+        avg_length = self.total_length / n if n else 0.0
+        scores = {}
+        for token in set(tokens):
+            postings = self.postings.get(token, [])
+            if not postings:
+                continue
+            idf = np.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, tf in postings:
+                norm = 1 - self.b + self.b * self.lengths[doc] / avg_length if avg_length else 1.0
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        return scores
+
+    def search(self, query="", platform="all", duration=None, views=None, k=None):
+        """
+        [(vidéo, score)] triées par pertinence.
+        `duration` et `views` sont des bornes (min, max) incluses (None = pas de borne) ;
+        sans requête, toutes les vidéos filtrées sont classées par vues.
+        """
+        tokens = tokenize_text(query)
+        text_scores = self._bm25(tokens) if tokens else {doc: 0.0 for doc in range(len(self.videos))}
+
+        def within(value, bounds):
+            low, high = bounds or (None, None)
+            return (low is None or value >= low) and (high is None or value <= high)
+
+        candidates = [
+            doc for doc in text_scores
+            if (platform == "all" or self.videos[doc].get("platform") == platform)
+            and within(self.durations[doc], duration) and within(self.views[doc], views)
+        ]
+        if not candidates:
+            return []
+        text = np.array([text_scores[doc] for doc in candidates])
+        popularity = np.log1p(np.array([self.views[doc] for doc in candidates], dtype=float))
+        text = text / text.max() if text.max() > 0 else text
+        popularity = popularity / popularity.max() if popularity.max() > 0 else popularity
+        scores = text + self.views_weight * popularity
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [(self.videos[candidates[i]], float(scores[i])) for i in order]
+
+# ==============================================================================
+# 11. GESTIONNAIRE DE DONNÉES (DATA MANAGER)
 # ==============================================================================
 
 class DataManager:
@@ -542,16 +2550,55 @@ class DataManager:
     """
     def __init__(self):
         self.creators = ALL_CREATORS
+        # Historiques alignés sur un axe de dates commun (colonnes NumPy)
+        self.timeseries = TimeSeriesStore(self.creators)
+
+        self.home_metrics = ["views", "videos", "likes", "shares", "comments", "creators"]
+        self.home_platforms = ["TikTok", "YouTube"]
+
+        # Agrégats pays / région / thème calculés depuis les créateurs
+        self.rollups = CreatorRollups(self.creators, [m for m in self.home_metrics if m != "creators"], self.home_platforms)
+        self.country_stats = self.rollups.country_stats() if COUNTRY_STATS_SOURCE == "creators" else COUNTRY_STATS
+        # Comptages distincts de créateurs (pays × plateforme × thème)
+        self.sketches = CreatorSketches(self.creators, self.home_platforms)
+        # Métriques dérivées précalculées par créateur et par plateforme
+        self._compute_derived_columns()
+        # Anomalies des historiques (pics / chutes), calculées une fois par version des données
+        self.anomalies = AnomalyDetector(self.timeseries)
+        # Tendances : scores de croissance récente et top-k par plateforme / tag
+        self.trending = TrendingEngine(self.timeseries, self.creators, self.home_platforms)
+        # Compteurs de tags en fenêtres glissantes (fenêtre de 3 mois comparée à la précédente)
+        self.tag_window = 3
+        self.tag_trends = self._build_tag_trends()
+        # Créateurs similaires (voisins calculés à la première demande, puis mis en cache)
+        self.similarity = CurveSimilarityIndex(self.timeseries)
+        # Archétypes de croissance (k-means sur les courbes normalisées)
+        self.archetypes = GrowthArchetypes(self.timeseries, GROWTH_ARCHETYPES)
+        # Recommandations des favoris (tags, pays, langue, engagement)
+        self.recommender = CreatorRecommender(
+            self.creators, self.derived_columns["engagement_rate"][:, 0],
+            cache_path=os.path.join(os.path.dirname(os.path.abspath(__file__)), CACHE_DIR, "neighbours.npz")
+        )
+
+        # Vidéos par créateur / plateforme (onglet Top Vidéos du profil)
+        self.videos = VideoStore(self.creators, TOP_VIDEOS)
+        # Recherche plein texte des vidéos (page Vidéos)
+        self.video_index = VideoSearchIndex()
+        for platform_videos in TOP_VIDEOS.values():
+            self.video_index.add_many(platform_videos)
 
         # Préparation du DataFrame pour la carte du monde
-        data_list = []
-        for iso, stats in COUNTRY_STATS.items():
-            row = {k: v for k, v in stats.items() if k not in ["platform_split", "theme_split"]}
-            row["iso_alpha"] = iso
-            data_list.append(row)
+        self._build_df_initial()
 
-        self.df_initial = pd.DataFrame(data_list)
-        self.df_initial = self._calculate_ranks(self.df_initial)
+        # Matrices pays × (métrique, plateforme, thème) et cube KPI pour les agrégations de l'accueil
+        self.cube_platforms = ["all"] + self.home_platforms
+        # Sous-ensembles de thèmes : bit i du masque <=> THEMES[i] sélectionné (masque 0 = aucun filtre)
+        self.theme_bits = ((np.arange(1 << len(THEMES))[:, None] >> np.arange(len(THEMES))) & 1).astype(float)
+        self._build_country_matrices()
+
+        # Hiérarchie géographique (monde → région → pays) et top-k créateurs par nœud
+        self.drill_k = 10
+        self._build_hierarchy()
 
         # Calcul des totaux globaux pour l'accueil
         platform_totals = {"tiktok": 0, "youtube": 0}
@@ -563,6 +2610,163 @@ class DataManager:
                     platform_totals[key] += videos
         self.global_platforms = platform_totals
 
+    def _compute_derived_columns(self):
+        """
+        Précalcule les métriques dérivées (DERIVED_METRICS) de tous les créateurs en un passage vectorisé :
+        derived_columns[métrique] est une matrice créateurs × (all, TikTok, YouTube).
+        Les formules sont évaluées sur les matrices de métriques de base ; les croissances
+        sont lues sur les derniers mois du cube de séries temporelles.
+        """
+        self.derived_platforms = ["all"] + self.home_platforms
+        self.creator_row = {str(c["id"]): i for i, c in enumerate(self.creators)}
+        # Colonnes de base conservées pour les corrélations ; le cache des matrices est invalidé
+        self.metric_columns, self.derived_columns = self._derived_rows(self.creators)
+        self._correlations = {}
+
+    def _derived_rows(self, creators):
+        """Métriques de base et dérivées ({métrique: créateurs × (all, plateformes)}) des `creators`."""
+        n_c, n_p, n_m = len(creators), len(self.home_platforms), len(HISTORY_METRICS)
+        base = np.array([
+            [[c.get("platforms", {}).get(p, {}).get(m) or 0 for m in HISTORY_METRICS] for p in self.home_platforms]
+            for c in creators
+        ], dtype=float).reshape(n_c, n_p, n_m)
+        base = np.concatenate((base.sum(axis=1, keepdims=True), base), axis=1)
+        values = {m: base[:, :, k] for k, m in enumerate(HISTORY_METRICS)}
+
+        # Historiques mensuels alignés sur le même ordre (créateurs × (all, TikTok, YouTube) × mois)
+        ts = self.timeseries
+        levels = ts.resample("month")["levels"][[ts.row_of[str(c["id"])] for c in creators]]
+        p_idx = [ts.platforms.index(p.lower()) for p in self.home_platforms]
+        history = np.concatenate((levels.sum(axis=1, keepdims=True), levels[:, p_idx]), axis=1)
+        history = {m: history[:, :, k] for k, m in enumerate(ts.metrics)}
+
+        derived = {}
+        for metric, spec in DERIVED_METRICS.items():
+            if "growth" in spec:
+                derived[metric] = evaluate_metric(metric, history)[..., -1]
+            else:
+                derived[metric] = evaluate_metric(metric, values)
+        return values, derived
+
+    def _update_derived_row(self, creator):
+        """Recalcule les métriques d'un seul créateur (ligne remplacée, ou ajoutée en fin)."""
+        row = self.creator_row.setdefault(str(creator["id"]), len(self.creator_row))
+        values, derived = self._derived_rows([creator])
+        for columns, update in ((self.metric_columns, values), (self.derived_columns, derived)):
+            for metric, block in update.items():
+                columns[metric] = set_row(columns[metric], row, block[0])
+        self._correlations = {}
+
+    def _remove_derived_row(self, creator_id):
+        """Retire la ligne d'un créateur des métriques précalculées."""
+        row = self.creator_row.get(str(creator_id))
+        if row is None:
+            return
+        self.creator_row = {str(c["id"]): i for i, c in enumerate(self.creators)}
+        for columns in (self.metric_columns, self.derived_columns):
+            for metric in columns:
+                columns[metric] = np.delete(columns[metric], row, axis=0)
+        self._correlations = {}
+
+    def get_correlation_matrix(self, country="all", tag="all", platform="all", source="totals"):
+        """
+        Matrice de corrélation (Pearson) entre métriques de base et dérivées, à travers les créateurs filtrés.
+        source="totals" : une ligne par créateur (totaux) ; source="history" : une ligne par créateur
+        et par mois (incréments mensuels, hors métriques de croissance).
+        Résultat mis en cache par combinaison de filtres connus : {"metrics", "labels", "matrix", "n"}.
+        """
+        key = (country, tag, platform, source)
+        if key in self._correlations:
+            return self._correlations[key]
+
+        slot = self.derived_platforms.index(platform) if platform in self.home_platforms else 0
+        mask = np.array([
+            (country == "all" or c.get("country") == country)
+            and (tag == "all" or tag in c.get("tags", []))
+            and (platform == "all" or platform in c.get("platforms", {}))
+            for c in self.creators
+        ], dtype=bool).reshape(len(self.creators))
+
+        if source == "history":
+            metrics = list(HISTORY_METRICS) + [m for m, spec in DERIVED_METRICS.items() if "growth" not in spec]
+            ts = self.timeseries
+            increments = ts.resample("month")["increments"][[ts.row_of[str(c["id"])] for c in self.creators]]
+            increments = increments[:, ts.platform_slice("all" if slot == 0 else platform)].sum(axis=1)
+            # La première période contient le niveau initial : seules les suivantes sont des incréments
+            block = increments[mask][..., 1:]
+            values = {m: block[:, ts.metrics.index(m)].ravel() for m in HISTORY_METRICS}
+            columns = [evaluate_metric(m, values) for m in metrics]
+        else:
+            metrics = list(HISTORY_METRICS) + list(DERIVED_METRICS)
+            columns = [
+                (self.metric_columns[m] if m in self.metric_columns else self.derived_columns[m])[mask, slot]
+                for m in metrics
+            ]
+
+        X = np.column_stack(columns) if columns and len(columns[0]) else np.zeros((0, len(metrics)))
+        X = X[np.isfinite(X).all(axis=1)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            centered = X - X.mean(axis=0) if len(X) else X
+            cov = centered.T @ centered
+            std = np.sqrt(np.diag(cov))
+            matrix = cov / np.outer(std, std) if len(X) > 1 else np.full((len(metrics), len(metrics)), np.nan)
+        matrix[~np.isfinite(matrix)] = np.nan
+
+        labels = [analytics_engine.labels.get(m, m) for m in metrics]
+        result = {"metrics": metrics, "labels": labels, "matrix": matrix, "n": len(X)}
+        # Filtres inconnus (valeurs libres) : pas de mise en cache, le cache reste borné
+        if (country == "all" or country in self.get_unique_values("country")) \
+                and (tag == "all" or tag in self.get_unique_values("tags")) \
+                and (platform == "all" or platform in self.home_platforms) \
+                and source in ("totals", "history"):
+            self._correlations[key] = result
+        return result
+
+    def get_trending_creators(self, platform="all", tag=None, k=None):
+        """Créateurs en tendance (classement du TrendingEngine), du plus fort score au plus faible."""
+        by_id = {str(c["id"]): c for c in self.creators}
+        return [by_id[cid] for cid, _ in self.trending.top_creators(platform, tag, k) if cid in by_id]
+
+    def get_similar_creators(self, creator_id, k=4):
+        """[(créateur, similarité)] des créateurs à la courbe de croissance la plus proche."""
+        by_id = {str(c["id"]): c for c in self.creators}
+        return [(by_id[cid], sim) for cid, sim in self.similarity.similar(creator_id, k) if cid in by_id]
+
+    def get_recommendations(self, favorite_ids, k=6):
+        """Créateurs recommandés pour un ensemble de favoris, du plus pertinent au moins pertinent."""
+        by_id = {str(c["id"]): c for c in self.creators}
+        return [by_id[cid] for cid, _ in self.recommender.recommend(favorite_ids, k) if cid in by_id]
+
+    def get_archetype_creators(self, archetype, k=None):
+        """Créateurs d'un archétype de croissance, par vues décroissantes."""
+        members = [c for c in self.creators if self.archetypes.label(c["id"]) == archetype]
+        members.sort(key=lambda c: -(c.get("totals", {}).get("views") or 0))
+        return members[:k] if k else members
+
+    def get_recent_anomalies(self, k=6):
+        """Anomalies les plus fortes du catalogue, enrichies du créateur (pour la page Découverte)."""
+        by_id = {str(c["id"]): c for c in self.creators}
+        return [dict(e, creator=by_id[e["creator_id"]]) for e in self.anomalies.latest(k) if e["creator_id"] in by_id]
+
+    def add_videos(self, videos):
+        """Ingestion de nouvelles vidéos : index pré-triés des créateurs et index plein texte."""
+        id_of = {c.get("username"): str(c["id"]) for c in self.creators}
+        grouped = {}
+        for video in videos:
+            self.video_index.add(video)
+            cid = id_of.get(video.get("creator"))
+            if cid is not None:
+                grouped.setdefault((cid, video.get("platform")), []).append(video)
+        for (cid, platform), platform_videos in grouped.items():
+            self.videos.add_videos(cid, platform, platform_videos)
+
+    def get_trending_videos(self, k=None):
+        """Top vidéos classées par le score de tendance de leur créateur."""
+        score_of = {c.get("username"): self.trending.creator_score(c["id"]) for c in self.creators}
+        videos = [v for platform_videos in TOP_VIDEOS.values() for v in platform_videos]
+        videos = sorted(videos, key=lambda v: (-score_of.get(v.get("creator"), float("-inf")), -(v.get("views") or 0)))
+        return videos[:k] if k else videos
+
     def _calculate_ranks(self, df):
         """Ajoute une colonne de rang basée sur les vues."""
         if df.empty: return df
@@ -575,48 +2779,349 @@ class DataManager:
         df['rank_label'] = "#" + df['rank'].astype(str)
         return df
 
-    def get_filtered_df(self, platform="all", themes=None, countries=None):
+    def _build_df_initial(self):
+        """DataFrame brut des pays (sans pondération), classé par vues."""
+        data_list = []
+        for iso, stats in self.country_stats.items():
+            row = {k: v for k, v in stats.items() if k not in ["platform_split", "theme_split"]}
+            row["iso_alpha"] = iso
+            data_list.append(row)
+
+        self.df_initial = pd.DataFrame(data_list)
+        self.df_initial = self._calculate_ranks(self.df_initial)
+
+    def _country_rows(self, isos):
+        """Lignes (métriques, répartition plateformes, répartition thèmes) des pays `isos`."""
+        n = len(isos)
+        metrics = np.array(
+            [[self.country_stats[iso].get(m, 0) for m in self.home_metrics] for iso in isos], dtype=float
+        ).reshape(n, len(self.home_metrics))
+        platform_split = np.array([
+            [self.country_stats[iso].get("platform_split", {"TikTok": 0.5, "YouTube": 0.5}).get(p, 0) for p in self.home_platforms]
+            for iso in isos
+        ], dtype=float).reshape(n, len(self.home_platforms))
+        theme_split = np.array([
+            [self.country_stats[iso].get("theme_split", {}).get(t, 0) for t in THEMES] for iso in isos
+        ], dtype=float).reshape(n, len(THEMES))
+        return metrics, platform_split, theme_split
+
+    def _cube_block(self, metrics, platform_split, theme_split):
         """
-        Retourne un DataFrame filtré pour la carte (Home).
-        Applique des coefficients de pondération (splits) si une plateforme est choisie.
+        Bloc du cube KPI pour quelques pays : plateforme (all, TikTok, YouTube) × masque de thèmes × pays × métrique.
+        Le coefficient thème d'un masque est la somme des parts des thèmes sélectionnés (1 pour le masque vide).
+        """
+        theme_coeff = self.theme_bits @ theme_split.T
+        theme_coeff[0] = 1.0
+        platform_coeff = np.vstack((np.ones(len(metrics)), platform_split.T))
+        return (
+            platform_coeff[:, None, :, None] * theme_coeff[None, :, :, None] * metrics[None, None, :, :]
+        )
+
+    def _build_country_matrices(self):
+        """
+        Précalcule, à partir des statistiques pays (country_stats) :
+        - country_metrics : pays × métrique (home_metrics),
+        - country_platform_split : pays × plateforme (TikTok, YouTube ; 0.5 / 0.5 par défaut),
+        - country_theme_split : pays × thème (THEMES),
+        - kpi_cube : plateforme × masque de thèmes × pays × métrique (3 × 256 × pays × métriques).
+        """
+        self.country_isos = list(self.country_stats.keys())
+        self.country_index = {iso: i for i, iso in enumerate(self.country_isos)}
+        self.country_names = [self.country_stats[iso].get("name", iso) for iso in self.country_isos]
+        self.country_metrics, self.country_platform_split, self.country_theme_split = self._country_rows(self.country_isos)
+        self.kpi_cube = self._cube_block(self.country_metrics, self.country_platform_split, self.country_theme_split)
+
+    def update_country_stats(self, iso, stats):
+        """
+        Met à jour (ou ajoute) les statistiques d'un pays dans country_stats
+        et ne recalcule que sa tranche du cube KPI.
+        """
+        self.country_stats[iso] = stats
+        metrics, platform_split, theme_split = self._country_rows([iso])
+        block = self._cube_block(metrics, platform_split, theme_split)
+        idx = self.country_index.get(iso)
+        if idx is None:
+            self.country_index[iso] = len(self.country_isos)
+            self.country_isos.append(iso)
+            self.country_names.append(stats.get("name", iso))
+            self.country_metrics = np.vstack((self.country_metrics, metrics))
+            self.country_platform_split = np.vstack((self.country_platform_split, platform_split))
+            self.country_theme_split = np.vstack((self.country_theme_split, theme_split))
+            self.kpi_cube = np.concatenate((self.kpi_cube, block), axis=2)
+        else:
+            self.country_names[idx] = stats.get("name", iso)
+            self.country_metrics[idx] = metrics[0]
+            self.country_platform_split[idx] = platform_split[0]
+            self.country_theme_split[idx] = theme_split[0]
+            self.kpi_cube[:, :, idx] = block[:, :, 0]
+        self._build_df_initial()
+
+    def upsert_creator(self, creator):
+        """
+        Ajoute ou met à jour un créateur : historiques, anomalies, métriques dérivées et
+        recommandations ne recalculent que sa ligne, les agrégats (rollups) sont mis à jour
+        incrémentalement, puis seules les tranches des pays touchés sont recalculées pour l'accueil.
+        """
+        ids = [str(c["id"]) for c in self.creators]
+        if str(creator["id"]) in ids:
+            # Retrait de l'ancienne activité des tags tant que les historiques sont ceux de l'ancienne fiche
+            self._record_tag_activity(self.creators[ids.index(str(creator["id"]))], sign=-1)
+            self.creators[ids.index(str(creator["id"]))] = creator
+            # Un sketch ne peut pas oublier l'ancienne appartenance du créateur
+            self.sketches.rebuild(self.creators)
+        else:
+            self.creators.append(creator)
+            self.sketches.add(creator)
+        if self.timeseries.upsert(creator):
+            # Seule la ligne du créateur est recalculée dans les structures qui en dépendent
+            self.anomalies.upsert(creator["id"])
+            self._update_derived_row(creator)
+            self.recommender.upsert(creator, self.derived_columns["engagement_rate"][:, 0])
+        else:
+            # Relevés hors de l'axe de dates commun : reconstruction complète
+            self.timeseries.rebuild(self.creators)
+            self.anomalies.refresh()
+            self._compute_derived_columns()
+            self.recommender.rebuild(self.creators, self.derived_columns["engagement_rate"][:, 0])
+        self._refresh_countries(self.rollups.upsert(creator))
+        self._record_tag_activity(creator)
+        self.trending.upsert(creator)
+        self.archetypes.partial_fit([creator["id"]])
+
+    def remove_creator(self, creator_id):
+        """Retire un créateur et met à jour les agrégats des pays touchés."""
+        for c in self.creators:
+            if str(c["id"]) == str(creator_id):
+                self._record_tag_activity(c, sign=-1)
+        self.creators[:] = [c for c in self.creators if str(c["id"]) != str(creator_id)]
+        self.sketches.rebuild(self.creators)
+        row = self.timeseries.remove(creator_id)
+        if row is not None:
+            self.anomalies.remove(creator_id, row)
+            self._remove_derived_row(creator_id)
+            self.recommender.remove(creator_id, self.derived_columns["engagement_rate"][:, 0])
+        self._refresh_countries(self.rollups.remove(creator_id))
+        self.trending.remove(creator_id)
+        self.archetypes.remove(creator_id)
+
+    def _refresh_countries(self, isos):
+        """Propage les agrégats des pays `isos` vers l'accueil."""
+        if COUNTRY_STATS_SOURCE == "creators":
+            for iso in isos:
+                self.update_country_stats(iso, self.rollups.stats("country", iso))
+        self._build_hierarchy()
+
+    def _tag_activity(self, size):
+        """Clés des `size` derniers mois, et vidéos / vues mensuelles (créateurs du cube × mois)."""
+        ts = self.timeseries
+        res = ts.resample("month")
+        increments = res["increments"][..., -size:].sum(axis=1)
+        buckets = ts.bucket_keys(res["dates"], "month")[-size:]
+        return buckets.tolist(), increments[:, ts.metrics.index("videos")], increments[:, ts.metrics.index("views")]
+
+    def _build_tag_trends(self):
+        """
+        Initialise les compteurs de tags depuis les historiques mensuels : seuls les 2 × window
+        derniers mois comptent, sommés par tag en un produit matriciel (tags × créateurs).
+        """
+        counters = TagTrendCounters(window=self.tag_window)
+        buckets, videos, views = self._tag_activity(counters.size)
+        if not buckets:
+            return counters
+        ts = self.timeseries
+        tags = sorted({t for c in self.creators for t in c.get("tags", [])})
+        tag_index = {t: i for i, t in enumerate(tags)}
+        membership = np.zeros((len(tags), len(ts.creator_ids)))
+        for c in self.creators:
+            membership[[tag_index[t] for t in c.get("tags", [])], ts.row_of[str(c["id"])]] = 1.0
+        per_tag = np.stack((membership @ (videos > 0), membership @ videos, membership @ views), axis=-1)
+
+        counters.advance(buckets[-1])
+        for tag, row in tag_index.items():
+            for t, bucket in enumerate(buckets):
+                counters.record(tag, bucket, *per_tag[row, t])
+        return counters
+
+    def _record_tag_activity(self, creator, sign=1):
+        """Ajoute (sign=1) ou retire (sign=-1) l'activité mensuelle d'un créateur des compteurs de tags."""
+        row = self.timeseries.row_of.get(str(creator["id"]))
+        if row is None:
+            return
+        buckets, videos, views = self._tag_activity(self.tag_trends.size)
+        for t, bucket in enumerate(buckets):
+            for tag in creator.get("tags", []):
+                self.tag_trends.record(
+                    tag, bucket, creators=sign * int(videos[row, t] > 0),
+                    videos=sign * videos[row, t], views=sign * views[row, t],
+                )
+
+    def _build_hierarchy(self):
+        """
+        Précalcule la hiérarchie d'exploration monde → région → pays → créateur :
+        - drill_children : enfants de chaque nœud ("world" -> régions, "region" -> pays),
+        - drill_top : top-k créateurs (vues, id) par (niveau, clé, plateforme, thème ou None).
+        Une étape d'exploration est alors une lecture de ces listes, sans parcourir les créateurs.
+        """
+        children = {("world", None): set()}
+        parents = {}
+        lists = {}
+        for c in self.creators:
+            iso = COUNTRY_ISO.get(c.get("country"), c.get("country"))
+            region = c.get("region")
+            nodes = [("world", None)]
+            if region:
+                children[("world", None)].add(region)
+                children.setdefault(("region", region), set()).add(iso)
+                parents.setdefault(("country", iso), ("region", region))
+                parents[("region", region)] = ("world", None)
+                nodes.append(("region", region))
+            if iso:
+                nodes.append(("country", iso))
+            themes = [None] + [t for t in dict.fromkeys(c.get("tags", [])) if t in THEMES]
+            for platform in self.cube_platforms:
+                score = self._creator_views(c, platform)
+                if platform != "all" and score <= 0:
+                    continue
+                for level, key in nodes:
+                    for theme in themes:
+                        lists.setdefault((level, key, platform, theme), []).append((score, str(c["id"])))
+
+        self.drill_children = {node: sorted(keys) for node, keys in children.items()}
+        self.drill_parent = parents
+        self.drill_top = {node: heapq.nlargest(self.drill_k, entries) for node, entries in lists.items()}
+
+    def _creator_views(self, creator, platform):
+        """Vues d'un créateur sur une plateforme ("all" = toutes plateformes)."""
+        platforms = creator.get("platforms", {})
+        if platform == "all":
+            return sum(pstats.get("views") or 0 for pstats in platforms.values())
+        return platforms.get(platform, {}).get("views") or 0
+
+    def get_drill_node(self, level, key, platform="all", themes=None, k=5):
+        """
+        Nœud d'exploration géographique pour les filtres plateforme / thèmes de l'accueil :
+        {"level", "key", "name", "views", "creators", "path": [...], "children": [...], "top": [(créateur, vues)]}.
+        Les vues des nœuds sont pondérées comme sur la carte (répartitions plateforme et thèmes).
+        Le top d'une sélection multi-thèmes fusionne les top-k précalculés de chaque thème.
+        """
+        platform = platform if platform in self.home_platforms else "all"
+        themes = [t for t in (themes or []) if t in THEMES]
+
+        if themes:
+            merged = heapq.merge(
+                *(self.drill_top.get((level, key, platform, t), []) for t in themes), reverse=True
+            )
+            top, seen = [], set()
+            for score, cid in merged:
+                if cid not in seen:
+                    seen.add(cid)
+                    top.append((score, cid))
+                if len(top) == k:
+                    break
+        else:
+            top = self.drill_top.get((level, key, platform, None), [])[:k]
+
+        child_level = {"world": "region", "region": "country"}.get(level)
+        children = [
+            self._drill_summary(child_level, child, platform, themes)
+            for child in self.drill_children.get((level, key), [])
+        ]
+        children.sort(key=lambda n: n["views"], reverse=True)
+        node = self._drill_summary(level, key, platform, themes) if level != "world" else {
+            "level": "world", "key": None, "name": "Monde",
+            "views": sum(n["views"] for n in children), "creators": sum(n["creators"] for n in children),
+        }
+        by_id = {str(c["id"]): c for c in self.creators}
+        # Fil d'Ariane : ancêtres du nœud, de la racine au parent
+        path, parent = [], self.drill_parent.get((level, key))
+        while parent is not None:
+            p_level, p_key = parent
+            path.insert(0, {"level": p_level, "key": p_key,
+                            "name": "Monde" if p_level == "world" else self.rollups.names[p_level].get(p_key, p_key)})
+            parent = self.drill_parent.get(parent)
+        node["path"] = path
+        node["children"] = children
+        node["top"] = [(by_id[cid], score) for score, cid in top if cid in by_id]
+        return node
+
+    def _drill_summary(self, level, key, platform, themes):
+        """Résumé (nom, vues pondérées, créateurs) d'une région ou d'un pays, lu dans les agrégats."""
+        if key in self.rollups.index[level]:
+            stats = self.rollups.stats(level, key)
+        else:
+            stats = {"name": self.country_stats.get(key, {}).get("name", key), "views": 0, "creators": 0}
+        coeff = 1.0
+        if platform in self.home_platforms:
+            coeff *= stats.get("platform_split", {}).get(platform, 0)
+        if themes:
+            coeff *= sum(stats.get("theme_split", {}).get(t, 0) for t in themes)
+        return {
+            "level": level, "key": key, "name": stats["name"],
+            "views": stats["views"] * coeff, "creators": stats["creators"],
+        }
+
+    def theme_mask(self, themes):
+        """Masque binaire d'un sous-ensemble de THEMES (les thèmes inconnus sont ignorés)."""
+        return sum(1 << THEMES.index(t) for t in set(themes or []) if t in THEMES)
+
+    def get_home_aggregates(self, platform="all", themes=None, countries=None, period=None):
+        """
+        Agrégations de l'accueil en un seul calcul matriciel :
+        - "df" : DataFrame par pays pour la carte (avec rangs),
+        - "kpis" : totaux des métriques sur les pays sélectionnés (créateurs distincts via HyperLogLog),
+        - "platform_videos" : vidéos par plateforme (toutes plateformes confondues), pour les boutons.
+        Les coefficients plateforme et thèmes sont lus dans le cube KPI (une tranche pays × métrique),
+        la période est un produit diffusé et le filtre pays un masque de lignes.
         """
         themes = themes or []
         countries = countries or []
-        rows = []
-        
-        for iso, stats in COUNTRY_STATS.items():
-            if countries and iso not in countries: continue
-            
-            base_data = {k: v for k, v in stats.items() if k not in ["platform_split", "theme_split"]}
-            base_data["iso_alpha"] = iso
-            
-            # Calcul du coefficient de réduction
-            coeff = 1.0
-            p_split = stats.get("platform_split", {"TikTok": 0.5, "YouTube": 0.5})
-            
-            if platform == "TikTok": 
-                coeff *= p_split.get("TikTok", 0)
-            elif platform == "YouTube": 
-                coeff *= p_split.get("YouTube", 0)
-            
-            if themes:
-                t_split = stats.get("theme_split", {})
-                theme_share = sum(t_split.get(t, 0) for t in themes)
-                coeff *= theme_share
-            
-            # Application du coefficient
-            metrics = ["views", "videos", "likes", "shares", "comments", "creators"]
-            for m in metrics:
-                if m in base_data: 
-                    base_data[m] = int(base_data[m] * coeff)
-            rows.append(base_data)
-            
-        dff = pd.DataFrame(rows)
-        # Sécurité pour colonnes manquantes
-        for col in ["views", "videos", "likes", "shares", "comments", "creators"]:
-            if col not in dff.columns: dff[col] = 0
-            
-        return self._calculate_ranks(dff)
+        period = self.normalize_period(period)
+
+        p_slot = self.cube_platforms.index(platform) if platform in self.home_platforms else 0
+        t_mask = self.theme_mask(themes)
+        if countries:
+            mask = np.isin(self.country_isos, countries)
+        else:
+            mask = np.ones(len(self.country_isos), dtype=bool)
+
+        # Tranche du cube, pondérée par la part d'activité de la période
+        share = self._home_period_share(platform, period)
+        values = np.trunc(self.kpi_cube[p_slot, t_mask] * share[None, :])[mask]
+
+        # Volumes de vidéos par plateforme, toutes plateformes confondues
+        all_share = share if p_slot == 0 else self._home_period_share("all", period)
+        v_idx = self.home_metrics.index("videos")
+        videos = np.trunc(self.kpi_cube[0, t_mask, :, v_idx] * all_share[v_idx])[mask]
+        platform_videos = videos @ self.country_platform_split[mask]
+
+        kpis = dict(zip(self.home_metrics, values.sum(axis=0).astype(np.int64).tolist()))
+        if COUNTRY_STATS_SOURCE == "creators":
+            # Créateurs distincts : fusion des sketches HyperLogLog plutôt qu'un volume pondéré
+            selected = list(np.asarray(self.country_isos, dtype=object)[mask])
+            values[:, self.home_metrics.index("creators")] = self.sketches.count_by_country(selected, platform, themes)
+            kpis["creators"] = self.sketches.count(selected, platform, themes)
+
+        dff = pd.DataFrame(values.astype(np.int64), columns=self.home_metrics)
+        dff.insert(0, "name", np.asarray(self.country_names, dtype=object)[mask])
+        dff["iso_alpha"] = np.asarray(self.country_isos, dtype=object)[mask]
+        return {
+            "df": self._calculate_ranks(dff),
+            "kpis": kpis,
+            "platform_videos": {p.lower(): float(v) for p, v in zip(self.home_platforms, platform_videos)},
+        }
+
+    def _home_period_share(self, platform, period):
+        """Vecteur des parts d'activité de la période, aligné sur home_metrics (1 hors historique)."""
+        period_share = self.get_period_share(platform, *period) if period else {}
+        return np.array([period_share.get(m, 1.0) for m in self.home_metrics])
+
+    def get_filtered_df(self, platform="all", themes=None, countries=None, period=None):
+        """
+        Retourne un DataFrame filtré pour la carte (Home).
+        Applique des coefficients de pondération (splits) si une plateforme est choisie,
+        et la part d'activité de la plage de périodes `period` (start, end) si fournie.
+        """
+        return self.get_home_aggregates(platform, themes, countries, period)["df"]
 
     def get_kpi_stats(self, dff):
         """Somme les colonnes du DataFrame filtré pour obtenir les KPIs globaux."""
@@ -632,11 +3137,13 @@ class DataManager:
             return sorted({c.get("region") for c in self.creators if c.get("region")})
         if key == "language": 
             return sorted({c.get("language") for c in self.creators if c.get("language")})
+        if key == "country": 
+            return sorted({c.get("country") for c in self.creators if c.get("country")})
         if key == "tags": 
             return sorted({t for c in self.creators for t in c.get("tags", [])})
         return []
 
-    def filter_creators(self, query, platform, region, theme, lang, certif, active):
+    def filter_creators(self, query, platform, region, theme, lang, certif, active, archetype="all"):
         """Filtre la liste principale des créateurs (Page Recherche)."""
         query = (query or "").lower()
         filtered = []
@@ -654,6 +3161,7 @@ class DataManager:
             if lang != "all" and c.get("language") != lang: continue
             if certif != "all" and is_certif != certif: continue
             if active != "all" and is_active != active: continue
+            if archetype != "all" and self.archetypes.label(c["id"]) != archetype: continue
             
             filtered.append(c)
         return filtered
@@ -661,71 +3169,155 @@ class DataManager:
     def sort_creators(self, creators_list, sort_value):
         """Trie la liste des créateurs selon la clé fournie (ex: views_desc)."""
         sort_value = sort_value or "views_desc"
-        metric, order = sort_value.split("_")
+        metric, order = sort_value.rsplit("_", 1)
         reverse = (order == "desc")
+
+        if metric in DERIVED_METRICS:
+            # Métrique dérivée : lecture de la colonne précalculée (les valeurs manquantes en dernier)
+            rows = np.array([self.creator_row.get(str(c["id"]), -1) for c in creators_list], dtype=int)
+            column = self.derived_columns[metric][:, 0]
+            scores = np.where(rows >= 0, column[rows] if len(column) else np.nan, np.nan)
+            scores = np.nan_to_num(scores, nan=-np.inf if reverse else np.inf)
+            order_idx = np.argsort(-scores if reverse else scores, kind="stable")
+            creators_list[:] = [creators_list[i] for i in order_idx]
+            return creators_list
         
         creators_list.sort(key=lambda x: x.get("totals", {}).get(metric, 0), reverse=reverse)
         return creators_list
 
-    def get_average_history(self, group_type, group_value, platform, metrics_list=None):
+    def get_series(self, creator_id, platform, granularity="month", overlays=None):
+        """
+        Série temporelle d'un créateur pour une plateforme ("combined", "youtube", "TikTok"...)
+        à la granularité demandée. Retourne None si la plateforme n'a pas d'historique.
+        `overlays` (ex: ["ma3", "growth3"]) ajoute les séries glissantes lues dans le cache.
+        """
+        ts = self.timeseries
+        row = ts.row_of.get(str(creator_id))
+        p_idx = ts.platform_slice(platform)
+        if row is None or not p_idx or not ts.present[row, p_idx].any():
+            return None
+        res = ts.resample(granularity)
+        series = ts.to_series(res["dates"], res["levels"][row, p_idx].sum(axis=0))
+        if overlays:
+            slot = p_idx[0] if len(p_idx) == 1 else len(ts.platforms)
+            series["overlays"] = {
+                key: dict(zip(ts.metrics, ts.overlay(granularity, key)[row, slot]))
+                for key in overlays if parse_overlay(key)
+            }
+        return series
+
+    def get_series_batch(self, creator_ids, platform, granularity="month"):
+        """
+        Séries de plusieurs créateurs en une seule tranche du cube :
+        {"dates": array, "ids": [...], "names": [...], "values": {métrique: array (créateurs × périodes)}}.
+        Retourne None si aucun créateur n'est connu ou si la plateforme est invalide.
+        """
+        ts = self.timeseries
+        pairs = [(str(cid), ts.row_of[str(cid)]) for cid in creator_ids or [] if str(cid) in ts.row_of]
+        p_idx = ts.platform_slice(platform)
+        if not pairs or not p_idx:
+            return None
+        ids, rows = zip(*pairs)
+        res = ts.resample(granularity)
+        block = res["levels"][np.ix_(rows, p_idx)].sum(axis=1)
+        names = {str(c["id"]): c["name"] for c in self.creators}
+        return {
+            "dates": res["dates"],
+            "ids": list(ids),
+            "names": [names.get(i, i) for i in ids],
+            "values": {m: block[:, k] for k, m in enumerate(ts.metrics)},
+        }
+
+    def normalize_period(self, period, granularity="month"):
+        """
+        Borne une plage de périodes [start, end] (indices inclus) à l'historique disponible.
+        Retourne None si la plage est absente ou couvre tout l'historique.
+        """
+        n_periods = self.get_period_count(granularity)
+        if not period or n_periods == 0:
+            return None
+        start = min(max(int(period[0]), 0), n_periods - 1)
+        end = min(max(int(period[1]), start), n_periods - 1)
+        if start == 0 and end == n_periods - 1:
+            return None
+        return start, end
+
+    def get_period_count(self, granularity="month"):
+        """Nombre de périodes de l'historique à la granularité demandée."""
+        return len(self.timeseries.resample(granularity)["dates"])
+
+    def get_period_marks(self, granularity="month", max_marks=12):
+        """Libellés des périodes pour un RangeSlider ({index: "Mar 24"}), espacés pour rester lisibles."""
+        dates = self.timeseries.resample(granularity)["dates"]
+        step = max(1, -(-len(dates) // max_marks))
+        marks = {}
+        for i, d in enumerate(dates.astype("datetime64[M]").astype(int)):
+            if i % step == 0:
+                year, month = divmod(int(d), 12)
+                marks[i] = f"{MONTH_NAMES[month]} {str(1970 + year)[2:]}"
+        return marks
+
+    def get_period_bounds(self, start, end, granularity="month"):
+        """Dates de début (incluse) et de fin (exclue) d'une plage de périodes."""
+        dates = self.timeseries.resample(granularity)["dates"]
+        return dates[start], TimeSeriesStore.next_periods(dates[end], granularity, 1)[0]
+
+    def get_range_totals(self, creator_id, platform, start, end, granularity="month"):
+        """
+        Totaux d'un créateur sur la plage de périodes [start, end] (indices inclus).
+        Deux lectures du tableau de sommes préfixes par métrique : prefix[end + 1] - prefix[start].
+        Pour une jauge (abonnés), le résultat est le gain net sur la plage.
+        """
+        ts = self.timeseries
+        row = ts.row_of.get(str(creator_id))
+        p_idx = ts.platform_slice(platform)
+        if row is None or not p_idx:
+            return {m: 0 for m in ts.metrics}
+        prefix = ts.resample(granularity)["prefix"]
+        totals = (prefix[row, p_idx, :, end + 1] - prefix[row, p_idx, :, start]).sum(axis=0)
+        return dict(zip(ts.metrics, totals.tolist()))
+
+    def get_period_share(self, platform, start, end, granularity="month"):
+        """
+        Part de l'activité de tous les créateurs qui tombe dans la plage [start, end], par métrique.
+        Sert de coefficient temporel pour les statistiques pays de l'accueil.
+        """
+        ts = self.timeseries
+        p_idx = ts.platform_slice(platform)
+        if not p_idx:
+            return {}
+        prefix_total = ts.resample(granularity)["prefix_total"][p_idx].sum(axis=0)
+        full = prefix_total[:, -1]
+        part = prefix_total[:, end + 1] - prefix_total[:, start]
+        share = np.divide(part, full, out=np.ones_like(full), where=full > 0)
+        return dict(zip(ts.metrics, share.tolist()))
+
+    def get_average_history(self, group_type, group_value, platform, metrics_list=None, granularity="month"):
         """
         Calcule l'historique moyen pour un groupe donné (Pays ou Tag).
         Utilisé pour les courbes de comparaison dans le Profil.
+        Moyenne vectorisée sur les lignes du cube de séries temporelles.
         """
-        relevant_creators = []
-        for c in self.creators:
-            if group_type == "country" and c.get("country") == group_value:
-                relevant_creators.append(c)
-            elif group_type == "tag" and group_value in c.get("tags", []):
-                relevant_creators.append(c)
-        
-        if not relevant_creators: return []
+        rows = [
+            i for i, c in enumerate(self.creators)
+            if (group_type == "country" and c.get("country") == group_value)
+            or (group_type == "tag" and group_value in c.get("tags", []))
+        ]
+        if not rows: return None
 
-        target_platforms = []
-        if platform == "combined":
-            target_platforms = ["youtube", "tiktok"]
-        elif platform.lower() in ["youtube", "tiktok"]:
-            target_platforms = [platform.lower()]
-        else:
-            return []
+        ts = self.timeseries
+        p_idx = ts.platform_slice(platform) if platform in ("combined", "youtube", "tiktok", "YouTube", "TikTok") else []
+        if not p_idx: return None
 
-        # Initialisation structure accumulation
-        month_names = ["Jan", "Fév", "Mar", "Avr", "Mai", "Jun", "Jul", "Aoû", "Sep", "Oct", "Nov", "Déc"]
-        monthly_totals = {month_names[i]: {} for i in range(12)}
-        metrics_to_sum = metrics_list if metrics_list else ["views", "likes", "shares", "comments", "followers", "videos"]
-        
-        for m_key in monthly_totals:
-            for met in metrics_to_sum:
-                monthly_totals[m_key][met] = [] 
-
-        # Accumulation
-        for c in relevant_creators:
-            for i in range(12):
-                m_key = month_names[i]
-                for met in metrics_to_sum:
-                    val = 0
-                    for p in target_platforms:
-                        hist = c.get("history", {}).get(p, [])
-                        if i < len(hist):
-                            record = hist[i]
-                            val += record.get(met, 0)
-                    
-                    monthly_totals[m_key][met].append(val)
-
-        # Moyennage
-        avg_history = []
-        for i in range(12):
-            m_key = month_names[i]
-            row = {"month": m_key}
-            for met in metrics_to_sum:
-                vals = monthly_totals[m_key][met]
-                row[met] = sum(vals) / len(vals) if vals else 0
-            avg_history.append(row)
-            
-        return avg_history
+        res = ts.resample(granularity)
+        block = res["levels"][rows][:, p_idx].sum(axis=1).mean(axis=0)
+        series = ts.to_series(res["dates"], block)
+        if metrics_list:
+            series["values"] = {m: v for m, v in series["values"].items() if m in metrics_list}
+        return series
 
 # ==============================================================================
-# 5. INSTANCIATION (SINGLETONS)
+# 12. INSTANCIATION (SINGLETONS)
 # ==============================================================================
 
 data_manager = DataManager()
@@ -0,0 +1,124 @@
+"""
+Page Corrélations.
+
+Ce module affiche la matrice de corrélation entre métriques (vues, likes, partages,
+commentaires, abonnés, vidéos et ratios dérivés) à travers les créateurs :
+1. Filtres (Pays, Tag, Plateforme) et source des données (totaux ou historiques mensuels).
+2. Carte de chaleur Plotly lue dans le cache du DataManager (une matrice par combinaison de filtres).
+La même matrice est exposée en JSON par l'API (/api/correlations, voir api.py).
+"""
+
+import dash
+from dash import html, dcc, callback, Input, Output
+import dash_bootstrap_components as dbc
+import plotly.graph_objs as go
+import numpy as np
+
+from functions import data_manager
+
+dash.register_page(__name__, path="/correlations", name="Corrélations")
+
+SOURCE_OPTIONS = [
+    {"label": "Totaux par créateur", "value": "totals"},
+    {"label": "Historiques mensuels", "value": "history"},
+]
+
+# ============================================================
+# 1. FONCTIONS UTILITAIRES (UI HELPERS)
+# ============================================================
+
+def make_filter(comp_id, label, values, placeholder_label="Tous"):
+    """Menu déroulant de filtre avec une option par défaut."""
+    return html.Div([
+        html.Label(label, className="small fw-bold text-muted mb-1"),
+        dcc.Dropdown(
+            id=comp_id,
+            options=[{"label": placeholder_label, "value": "all"}] + [{"label": v, "value": v} for v in values],
+            value="all",
+            clearable=False,
+            className="favorites-dropdown"
+        )
+    ])
+
+def build_heatmap(result):
+    """Carte de chaleur de la matrice de corrélation (cases vides si indéfinie)."""
+    matrix = result["matrix"]
+    text = [["" if np.isnan(v) else f"{v:.2f}" for v in row] for row in matrix]
+    fig = go.Figure(go.Heatmap(
+        z=np.where(np.isnan(matrix), None, matrix).tolist(),
+        x=result["labels"], y=result["labels"],
+        zmin=-1, zmax=1, colorscale="RdBu", reversescale=True,
+        text=text, texttemplate="%{text}", hovertemplate="%{y} / %{x} : %{z:.2f}<extra></extra>",
+        colorbar=dict(title="r")
+    ))
+    fig.update_layout(
+        template="plotly_white",
+        margin=dict(l=20, r=20, t=20, b=20),
+        yaxis=dict(autorange="reversed"),
+        height=620
+    )
+    return fig
+
+# ============================================================
+# 2. LAYOUT
+# ============================================================
+
+layout = html.Div(
+    className="main-container",
+    children=[
+        # En-tête
+        html.Div(
+            className="discovery-header-container",
+            children=[
+                html.H1("Corrélations", className="discovery-header-title display-5 fw-bold"),
+                html.P("Quelles métriques évoluent ensemble ?", className="lead text-muted")
+            ]
+        ),
+
+        # Filtres
+        html.Div(
+            className="search-filters-card",
+            children=dbc.Row([
+                dbc.Col(make_filter("corr-country", "Pays", data_manager.get_unique_values("country")), md=3),
+                dbc.Col(make_filter("corr-tag", "Tag", data_manager.get_unique_values("tags")), md=3),
+                dbc.Col(make_filter("corr-platform", "Plateforme", data_manager.home_platforms, "Toutes"), md=3),
+                dbc.Col(html.Div([
+                    html.Label("Données", className="small fw-bold text-muted mb-1"),
+                    dcc.Dropdown(id="corr-source", options=SOURCE_OPTIONS, value="totals",
+                                 clearable=False, className="favorites-dropdown")
+                ]), md=3),
+            ])
+        ),
+
+        # Carte de chaleur
+        dbc.Card(
+            dbc.CardBody([
+                html.Div(id="corr-sample-size", className="text-muted small mb-2"),
+                dcc.Graph(id="corr-heatmap", config={"displayModeBar": False})
+            ]),
+            className="border shadow-sm mt-3"
+        ),
+    ]
+)
+
+# ============================================================
+# 3. CALLBACKS
+# ============================================================
+
+@callback(
+    [Output("corr-heatmap", "figure"), Output("corr-sample-size", "children")],
+    [
+        Input("corr-country", "value"),
+        Input("corr-tag", "value"),
+        Input("corr-platform", "value"),
+        Input("corr-source", "value"),
+    ]
+)
+def update_correlation_heatmap(country, tag, platform, source):
+    """Affiche la matrice mise en cache pour la combinaison de filtres choisie."""
+    result = data_manager.get_correlation_matrix(country, tag, platform, source)
+    unit = "observations (créateur × mois)" if source == "history" else "créateurs"
+    note = f"Calculé sur {result['n']} {unit}."
+    if result["n"] < 3:
+        note += " Échantillon trop petit pour des corrélations fiables."
+    return build_heatmap(result), note
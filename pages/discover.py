@@ -5,6 +5,7 @@ Ce module affiche les tendances et nouveautés :
 1. Créateurs (cartes compactes).
 2. Hashtags/Tags (cartes simples).
 3. Vidéos (cartes vidéos).
+4. Profils de croissance (archétypes issus du clustering des historiques).
 Le contenu change dynamiquement via des onglets (Tabs).
 """
 
@@ -13,15 +14,13 @@ from dash import html, dcc, callback, Input, Output, State
 import dash_bootstrap_components as dbc
 
 # Import des données et composants réutilisables
-from constants import (
-    TRENDING_CREATORS, NEW_CREATORS, 
-    TRENDING_TOPICS, NEW_TAGS, 
-    TRENDING_VIDEOS, NEW_VIDEOS
-)
+from constants import NEW_CREATORS, NEW_VIDEOS, GROWTH_ARCHETYPES
 from functions import (
+    data_manager,
     render_creator_card_compact, 
     render_topic_card, 
-    render_video_card
+    render_video_card,
+    render_anomaly_card
 )
 
 dash.register_page(__name__, path="/discover", name="Découverte")
@@ -40,6 +39,9 @@ def build_grid(data, card_func, grid_type="creators", fav_list=None):
         grid_type: Type de grille pour ajuster la largeur des colonnes.
         fav_list: Liste des IDs favoris pour marquer les cœurs (créateurs uniquement).
     """
+    if not data:
+        return html.Div("Rien à afficher pour le moment.", className="text-muted small")
+
     if grid_type == "tags":
         # Les tags ont un layout CSS spécifique (Grid CSS)
         return html.Div(className="topics-grid", children=[card_func(x) for x in data])
@@ -108,7 +110,8 @@ layout = html.Div(
             className="dash-tabs mb-4",
             children=[
                 dcc.Tab(label="Tendances", value="trending"),
-                dcc.Tab(label="Nouveaux", value="new")
+                dcc.Tab(label="Nouveaux", value="new"),
+                dcc.Tab(label="Profils de croissance", value="archetypes")
             ]
         ),
 
@@ -139,17 +142,28 @@ def render_discover_tab(tab_value, auth_mode, fav_ids):
     # Note : On limite l'affichage aux premiers éléments ([:2], [:3]) pour ne pas surcharger la page
     
     if tab_value == "trending":
+        # Classements tenus à jour par le moteur de tendances (croissance récente des historiques)
+        sections_config = [
+            ("Créateurs en Tendance", "↗", data_manager.get_trending_creators(k=2), render_creator_card_compact, "creators", False),
+            ("Tags en Tendance", "🔥", data_manager.tag_trends.top(k=6), render_topic_card, "tags", True),
+            ("Vidéos en Tendance", "▶️", data_manager.get_trending_videos(k=3), render_video_card, "videos", False),
+            ("Alertes : pics et chutes", "⚠️", data_manager.get_recent_anomalies(k=4), render_anomaly_card, "anomalies", True),
+        ]
+    elif tab_value == "archetypes":
+        # Une section par archétype de croissance (étiquettes calculées par k-means dans le DataManager)
         sections_config = [
-            ("Créateurs en Tendance", "↗", TRENDING_CREATORS[:2], render_creator_card_compact, "creators", False),
-            ("Tags en Tendance", "🔥", TRENDING_TOPICS, render_topic_card, "tags", True),
-            ("Vidéos en Tendance", "▶️", TRENDING_VIDEOS[:3], render_video_card, "videos", False),
+            (label, icon, data_manager.get_archetype_creators(key, k=2), render_creator_card_compact, "creators", i % 2 == 1)
+            for i, (key, (label, icon)) in enumerate(GROWTH_ARCHETYPES.items())
         ]
     else: # tab == "new"
         sections_config = [
             ("Nouveaux Créateurs", "✨", NEW_CREATORS[:2], render_creator_card_compact, "creators", False),
-            ("Nouveaux Tags", "🏷️", NEW_TAGS, render_topic_card, "tags", True),
             ("Nouvelles Vidéos", "🆕", NEW_VIDEOS[:3], render_video_card, "videos", False),
         ]
+        # Section masquée tant qu'aucun tag n'est apparu dans la fenêtre courante
+        new_tags = data_manager.tag_trends.new_tags(k=4)
+        if new_tags:
+            sections_config.insert(1, ("Nouveaux Tags", "🏷️", new_tags, render_topic_card, "tags", True))
 
     # Génération du HTML
     html_sections = []
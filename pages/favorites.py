@@ -3,7 +3,7 @@ Page Mes Favoris.
 
 Ce module gère :
 1. L'affichage paginé des créateurs favoris de l'utilisateur.
-2. Un système de recommandations basées sur les tags des favoris.
+2. Un système de recommandations classées (tags, pays, langue, engagement des favoris).
 3. La suppression dynamique des favoris.
 4. La gestion de l'état "Non connecté" via une alerte.
 """
@@ -16,7 +16,7 @@ from dash.dependencies import ALL
 
 # Imports des données et composants
 from constants import ALL_CREATORS
-from functions import render_creator_card_compact
+from functions import data_manager, render_creator_card_compact
 
 dash.register_page(__name__, path="/favorites", name="Mes Favoris")
 
@@ -28,38 +28,19 @@ def get_creators_from_ids(ids_list):
     """Récupère les objets créateurs complets à partir d'une liste d'IDs."""
     if not ids_list: 
         return []
-    str_ids = [str(i) for i in ids_list]
+    str_ids = {str(i) for i in ids_list}
     return [c for c in ALL_CREATORS if str(c["id"]) in str_ids]
 
 def get_recommendations(current_favorites_ids):
     """
-    Génère des recommandations simples.
-    Logique : Trouve des créateurs non-favoris qui partagent au moins un tag
-    avec les favoris actuels.
+    Génère des recommandations classées.
+    Logique : score pondéré (tags, pays, langue, engagement) du profil moyen des favoris, calculé
+    par le DataManager sur l'union des voisins précalculés des favoris (ou sur tout le catalogue
+    tant que ces listes ne sont pas prêtes), top-k mis en cache par ensemble de favoris.
     """
     if not current_favorites_ids: 
         return []
-    
-    current_favs = get_creators_from_ids(current_favorites_ids)
-    fav_tags = set()
-    for c in current_favs:
-        fav_tags.update(c.get("tags", []))
-    
-    recommendations = []
-    str_fav_ids = [str(i) for i in current_favorites_ids]
-    
-    for c in ALL_CREATORS:
-        # On exclut ceux déjà favoris
-        if str(c["id"]) in str_fav_ids: 
-            continue
-        
-        # On vérifie l'intersection des tags
-        c_tags = set(c.get("tags", []))
-        if c_tags.intersection(fav_tags):
-            recommendations.append(c)
-            
-    # On limite à 4 recommandations arbitrairement
-    return recommendations[:4]
+    return data_manager.get_recommendations(current_favorites_ids)
 
 # ============================================================
 # 2. UI HELPERS (Locaux)
@@ -286,7 +267,7 @@ def render_favorites_page(fav_ids, auth_mode, fav_page, rec_page):
             className="section-header h5 fw-bold mb-2 d-flex align-items-center", 
             children=[html.Span("✨", className="me-2"), "Recommandé pour vous"]
         ),
-        html.P("Basé sur les thématiques de vos favoris.", className="text-muted small mb-3"),
+        html.P("Basé sur les thématiques, pays, langues et engagement de vos favoris.", className="text-muted small mb-3"),
         html.Div(rec_display, className="favorites-list-container"),
         make_pagination_controls("recommendations", rec_page, rec_total_pages)
     ], className="section-card-secondary p-4 rounded bg-light border"))
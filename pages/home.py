@@ -6,17 +6,21 @@ Ce module affiche :
 2. Une carte interactive du monde (Choropleth).
 3. Des filtres dynamiques (Plateforme, Thématique, Pays).
 4. Une logique de pondération des statistiques selon la plateforme sélectionnée.
+L'état des filtres est géré côté client (assets/home_filters.js).
 """
 
 import dash
-from dash import html, dcc, callback, Input, Output, State, callback_context
+from dash import html, dcc, callback, clientside_callback, ClientsideFunction, Input, Output, State, Patch
 import dash_bootstrap_components as dbc
 from dash.dependencies import ALL
 import plotly.express as px
+import plotly.graph_objects as go
+import numpy as np
+import pandas as pd
 
 # Imports des données et utilitaires
-from constants import THEMES, COUNTRY_STATS
-from functions import data_manager, render_kpi_card, short_number
+from constants import THEMES
+from functions import data_manager, render_kpi_card, short_number, short_numbers
 
 dash.register_page(__name__, path="/", name="Accueil")
 
@@ -30,13 +34,32 @@ MAP_DROPDOWN_OPTIONS = [
     {"label": "Nombre de créateurs", "value": "creators"},
 ]
 
+# Libellés des indicateurs de la carte
+MAP_LABELS = {item["value"]: item["label"] for item in MAP_DROPDOWN_OPTIONS}
+
 # ============================================================
 # 1. FONCTIONS UTILITAIRES (HELPERS UI)
 # ============================================================
 
-def render_platform_option(p_id, name, color, count, count_id):
+def build_filter_payload():
+    """
+    Données des filtres envoyées avec le layout (rendu des badges côté client).
+    Construites à chaque chargement de page : les pays ajoutés depuis le démarrage y figurent.
+    """
+    return {
+        "themes": THEMES,
+        "top_countries": [
+            {"iso": iso, "name": name}
+            for iso, name in data_manager.df_initial.sort_values("views", ascending=False)
+            .head(10)[["iso_alpha", "name"]].itertuples(index=False)
+        ],
+        "country_names": {iso: data["name"] for iso, data in data_manager.country_stats.items()},
+    }
+
+def render_platform_option(p_id, name, color, count, count_id, formatted=None):
     """
     Génère une ligne cliquable pour sélectionner une plateforme (TikTok/YouTube).
+    `formatted` : compteur déjà formaté en lot (short_numbers).
     """
     return html.Div(
         id=p_id,
@@ -60,7 +83,7 @@ def render_platform_option(p_id, name, color, count, count_id):
                 ),
                 dbc.Col(
                     html.Span(
-                        f"{short_number(count)} vidéos", 
+                        f"{formatted if formatted is not None else short_number(count)} vidéos", 
                         id=count_id, 
                         className="text-primary fw-bold"
                     ),
@@ -71,45 +94,15 @@ def render_platform_option(p_id, name, color, count, count_id):
         )
     )
 
-def render_filter_pill(label_prefix, value, kind, iso_value=None):
-    """
-    Crée un badge (pilule) représentant un filtre actif avec un bouton de fermeture.
-    Pour les pays, iso_value contient le code ISO tandis que value contient le nom affiché.
-    """
-    filter_value = iso_value if iso_value else value
-    return html.Span(
-        [
-            f"{label_prefix} : {value}",
-            html.Span(
-                " ✕",
-                id={"type": "remove-filter", "kind": kind, "value": filter_value},
-                className="filter-close ms-2"
-            )
-        ],
-        className="platform-filter-badge"
-    )
-
-def render_selectable_badge(text, type_id, id_key, is_selected):
-    """
-    Crée un badge cliquable (thème ou pays) avec gestion de l'état sélectionné.
-    """
-    css_class = "theme-badge selected" if is_selected else "theme-badge"
-    return dbc.Button(
-        text,
-        id={"type": type_id, **id_key},
-        className=css_class,
-        n_clicks=0,
-        size="sm"
-    )
-
-def render_stat_line(label, value):
+def render_stat_line(label, value, formatted=None):
     """
     Affiche une ligne de statistique simple (Label ..... Valeur).
+    `formatted` : valeur déjà formatée en lot (short_numbers).
     """
     return html.Div(
         [
             html.Span(label),
-            html.Span(short_number(value), className="fw-bold")
+            html.Span(formatted if formatted is not None else short_number(value), className="fw-bold")
         ],
         className="d-flex justify-content-between mb-1"
     )
@@ -128,211 +121,360 @@ def render_card_header(icon_cls, title):
         )
     )
 
+def build_base_map():
+    """
+    Figure de base de la carte du monde, construite à chaque chargement de page.
+    Échelle de couleurs et mise en page sont fixes : les callbacks ne modifient ensuite que
+    les pays, `z`, `customdata` et la plage de la barre de couleurs.
+    """
+    n = len(data_manager.country_isos)
+    fig = go.Figure(go.Choropleth(
+        locations=list(data_manager.country_isos),
+        locationmode="ISO-3",
+        z=[None] * n,
+        text=list(data_manager.country_names),
+        customdata=[["-", "-"]] * n,
+        coloraxis="coloraxis",
+        hovertemplate="<b>%{text}</b><br>Rang: %{customdata[0]}<br>Valeur: %{customdata[1]}<extra></extra>"
+    ))
+    fig.update_layout(
+        coloraxis=dict(
+            colorscale=px.colors.sequential.Blues,
+            colorbar=dict(title=dict(text=MAP_LABELS["views"]), tickformat=".2s")
+        ),
+        margin=dict(l=0, r=0, t=0, b=0),
+        geo=dict(
+            scope="world",
+            bgcolor="rgba(0,0,0,0)", 
+            showcountries=True, 
+            showframe=False, 
+            showcoastlines=False,
+            projection_type="natural earth"
+        ),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
+
+def build_map_columns(dff):
+    """
+    Colonnes de la carte pour tous les indicateurs, alignées sur les pays courants du DataManager :
+    {"isos", "names", "columns": {indicateur: {"z", "customdata", "cmin", "cmax"}}, "labels": {...}}.
+    Les pays exclus par les filtres ont une valeur nulle (non colorés).
+    """
+    isos = list(data_manager.country_isos)
+    indexed = dff.set_index("iso_alpha").reindex(isos) if not dff.empty else pd.DataFrame(index=isos)
+    present = indexed["views"].notna().to_numpy() if "views" in indexed else np.zeros(len(isos), dtype=bool)
+    ranks = indexed["rank_label"].tolist() if "rank_label" in indexed else ["-"] * len(isos)
+
+    columns = {}
+    for key in MAP_LABELS:
+        values = indexed[key].to_numpy(dtype=float) if key in indexed else np.full(len(isos), np.nan)
+        texts = short_numbers(values)
+        columns[key] = {
+            "z": [float(v) if p else None for v, p in zip(values, present)],
+            "customdata": [[r, t] if p else ["-", "-"] for r, t, p in zip(ranks, texts, present)],
+            "cmin": float(values[present].min()) if present.any() else None,
+            "cmax": float(values[present].max()) if present.any() else None,
+        }
+    return {"isos": isos, "names": list(data_manager.country_names), "columns": columns, "labels": MAP_LABELS}
+
+def render_drill_button(node, views_text):
+    """Bouton d'un nœud enfant (région ou pays) dans le panneau d'exploration."""
+    return dbc.Button(
+        [node["name"], html.Span(f" · {views_text} vues", className="text-muted ms-1")],
+        id={"type": "drill-node", "level": node["level"], "key": node["key"]},
+        className="theme-badge",
+        n_clicks=0,
+        size="sm"
+    )
+
+def render_drill_panel(node):
+    """
+    Panneau d'exploration : fil d'Ariane, sous-niveaux (régions ou pays)
+    et top créateurs du nœud (liens vers leur profil).
+    """
+    crumbs = []
+    for step in node["path"]:
+        crumbs.append(html.Span(
+            step["name"],
+            id={"type": "drill-node", "level": step["level"], "key": step["key"] or ""},
+            n_clicks=0,
+            className="text-primary drill-crumb"
+        ))
+        crumbs.append(html.Span(" › ", className="text-muted"))
+    crumbs.append(html.Span(node["name"], className="fw-bold"))
+
+    children_views = short_numbers([child["views"] for child in node["children"]])
+    top_views = short_numbers([views for _, views in node["top"]])
+    sub_label = "Régions" if node["level"] == "world" else "Pays"
+    return html.Div(
+        [
+            html.Div(crumbs, className="mb-3"),
+            html.Div(
+                [
+                    html.H6(sub_label, className="fw-bold mb-2"),
+                    html.Div(
+                        [render_drill_button(child, text) for child, text in zip(node["children"], children_views)],
+                        className="d-flex flex-wrap gap-2 mb-3"
+                    ),
+                ]
+            ) if node["children"] else None,
+            html.H6(f"Top créateurs · {node['name']}", className="fw-bold mb-2"),
+            html.Ol(
+                [
+                    html.Li([
+                        dcc.Link(c["name"], href=f"/profile/{c['id']}"),
+                        html.Span(f" · {text} vues", className="text-muted small")
+                    ])
+                    for (c, _), text in zip(node["top"], top_views)
+                ]
+            ) if node["top"] else html.Span("Aucun créateur pour ces filtres.", className="text-muted small"),
+        ]
+    )
+
 # ============================================================
 # 2. LAYOUT DE LA PAGE
 # ============================================================
 
-layout = html.Div(
-    className="main-container",
-    children=[
-        # --- Stores pour la gestion d'état ---
-        dcc.Store(id="platform-selection", data="all"),
-        dcc.Store(id="selected-theme", data=[]),
-        dcc.Store(id="selected-country", data=[]),
-
-        # --- En-tête ---
-        html.Div(
-            [
-                html.H1(
-                    ["Découvrez Vos ", html.Span("Créateurs", className="text-primary")],
-                    className="display-4 text-center"
-                ),
-                html.P(
-                    "Explorez le monde des créateurs de contenu.",
-                    className="lead text-center"
-                )
-            ],
-            className="my-4"
-        ),
-        
-        # --- Cartes KPIs (remplies par callback) ---
-        dbc.Row(id="stats-cards", className="g-3 my-3"),
-        
-        html.P(
-            ["Bienvenue dans votre espace d’exploration !", html.Br(), "Utilisez les filtres pour mettre à jour la carte."],
-            className="lead text-center"
-        ),
-
-        # --- Barre des Filtres Actifs ---
-        dbc.Card(
-            className="filters-active-card mb-4",
-            children=[
-                dbc.Row(
-                    [
-                        dbc.Col(
-                            html.Div(
-                                [
-                                    html.Span("Filtres actifs :", className="fw-semibold me-2"),
-                                    html.Span(id="active-filters", className="d-inline-flex flex-wrap gap-2")
-                                ]
+def layout(**kwargs):
+    """
+    Layout construit à chaque chargement de page : carte, filtres et plage de dates
+    reflètent les pays et périodes courants du DataManager.
+    """
+    platform_counts = [data_manager.global_platforms["tiktok"], data_manager.global_platforms["youtube"]]
+    platform_texts = short_numbers(platform_counts)
+    return html.Div(
+        className="main-container",
+        children=[
+            # --- Stores pour la gestion d'état ---
+            dcc.Store(id="platform-selection", data="all"),
+            dcc.Store(id="selected-theme", data=[]),
+            dcc.Store(id="selected-country", data=[]),
+            dcc.Store(id="home-filter-payload", data=build_filter_payload()),
+            dcc.Store(id="home-map-data"),
+
+            # --- En-tête ---
+            html.Div(
+                [
+                    html.H1(
+                        ["Découvrez Vos ", html.Span("Créateurs", className="text-primary")],
+                        className="display-4 text-center"
+                    ),
+                    html.P(
+                        "Explorez le monde des créateurs de contenu.",
+                        className="lead text-center"
+                    )
+                ],
+                className="my-4"
+            ),
+            
+            # --- Cartes KPIs (remplies par callback) ---
+            dbc.Row(id="stats-cards", className="g-3 my-3"),
+            
+            html.P(
+                ["Bienvenue dans votre espace d’exploration !", html.Br(), "Utilisez les filtres pour mettre à jour la carte."],
+                className="lead text-center"
+            ),
+
+            # --- Barre des Filtres Actifs ---
+            dbc.Card(
+                className="filters-active-card mb-4",
+                children=[
+                    dbc.Row(
+                        [
+                            dbc.Col(
+                                html.Div(
+                                    [
+                                        html.Span("Filtres actifs :", className="fw-semibold me-2"),
+                                        html.Span(id="active-filters", className="d-inline-flex flex-wrap gap-2")
+                                    ]
+                                ),
+                                md=10
                             ),
-                            md=10
-                        ),
-                        dbc.Col(
-                            html.Div(
-                                dbc.Button("Tout effacer", id="clear-filters", size="sm", color="light"),
-                                className="text-end"
+                            dbc.Col(
+                                html.Div(
+                                    dbc.Button("Tout effacer", id="clear-filters", size="sm", color="light"),
+                                    className="text-end"
+                                ),
+                                md=2
                             ),
-                            md=2
-                        ),
-                    ],
-                    className="align-items-center py-2 px-3"
-                )
-            ]
-        ),
-
-        # --- Sélecteur de Plateforme ---
-        dbc.Card(
-            className="p-3 mb-4 shadow-sm border",
-            children=[
-                html.Div(
-                    [
-                        html.I(className="bi bi-pie-chart-fill me-2"),
-                        html.Span("Répartition par Plateforme", className="fw-semibold")
-                    ],
-                    className="mb-3"
-                ),
-                render_platform_option(
-                    "select-tiktok", "TikTok", "#ff1493", 
-                    data_manager.global_platforms["tiktok"], "count-tiktok"
-                ),
-                render_platform_option(
-                    "select-youtube", "YouTube", "#ff0000", 
-                    data_manager.global_platforms["youtube"], "count-youtube"
-                ),
-            ]
-        ),
-
-        # --- Contenu Principal (Infos + Carte) ---
-        dbc.Row(
-            className="my-4",
-            children=[
-                # Colonne Gauche : Informations Textuelles
-                dbc.Col(
-                    dbc.Card(
+                        ],
+                        className="align-items-center py-2 px-3"
+                    )
+                ]
+            ),
+
+            # --- Plage de dates ---
+            dbc.Card(
+                className="p-3 mb-4 shadow-sm border",
+                children=[
+                    html.Div(
                         [
-                            render_card_header("bi bi-info-circle-fill", "Informations complémentaires"),
-                            dbc.CardBody(
-                                [
-                                    html.H6("Top catégories", className="fw-bold mb-2"), 
-                                    html.Div(id="theme-badge-container", className="d-flex flex-wrap gap-2 mb-3"),
-                                    
-                                    html.H6("Top 10 pays", className="fw-bold mb-2"), 
-                                    html.Div(id="country-badge-container", className="d-flex flex-wrap gap-2 mb-3"),
-                                    
-                                    html.H6("Stats filtrées", className="fw-bold mb-2"), 
-                                    html.Div(id="filtered-key-stats", className="small"),
-                                ]
-                            )
+                            html.I(className="bi bi-calendar-range me-2"),
+                            html.Span("Période", className="fw-semibold")
                         ],
-                        className="h-100 shadow-sm"
+                        className="mb-3"
                     ),
-                    lg=6
-                ),
-                # Colonne Droite : Carte du Monde
-                dbc.Col(
-                    dbc.Card(
+                    dcc.RangeSlider(
+                        id="home-date-range",
+                        min=0,
+                        max=max(1, data_manager.get_period_count()) - 1,
+                        step=1,
+                        value=[0, max(1, data_manager.get_period_count()) - 1],
+                        marks=data_manager.get_period_marks(),
+                        allowCross=False
+                    ),
+                ]
+            ),
+
+            # --- Sélecteur de Plateforme ---
+            dbc.Card(
+                className="p-3 mb-4 shadow-sm border",
+                children=[
+                    html.Div(
                         [
-                            render_card_header("bi bi-geo-alt-fill", "Répartition Géographique"),
-                            dbc.CardBody(
-                                [
-                                    dbc.Row(
-                                        [
-                                           dbc.Col(html.Label("Indicateur de la carte :", className="fw-bold mt-1"), width="auto"),
-                                           dbc.Col(dcc.Dropdown(id="map-indicator", options=MAP_DROPDOWN_OPTIONS, value="views", clearable=False, className="w-100")) 
-                                        ],
-                                        className="mb-3 align-items-center"
-                                    ),
-                                    html.Div(
-                                        dcc.Graph(
-                                            id="world-map",
-                                            config={"displayModeBar": False},
-                                            className="map-graph"
+                            html.I(className="bi bi-pie-chart-fill me-2"),
+                            html.Span("Répartition par Plateforme", className="fw-semibold")
+                        ],
+                        className="mb-3"
+                    ),
+                    render_platform_option(
+                        "select-tiktok", "TikTok", "#ff1493", 
+                        platform_counts[0], "count-tiktok", platform_texts[0]
+                    ),
+                    render_platform_option(
+                        "select-youtube", "YouTube", "#ff0000", 
+                        platform_counts[1], "count-youtube", platform_texts[1]
+                    ),
+                ]
+            ),
+
+            # --- Contenu Principal (Infos + Carte) ---
+            dbc.Row(
+                className="my-4",
+                children=[
+                    # Colonne Gauche : Informations Textuelles
+                    dbc.Col(
+                        dbc.Card(
+                            [
+                                render_card_header("bi bi-info-circle-fill", "Informations complémentaires"),
+                                dbc.CardBody(
+                                    [
+                                        html.H6("Top catégories", className="fw-bold mb-2"), 
+                                        html.Div(id="theme-badge-container", className="d-flex flex-wrap gap-2 mb-3"),
+                                        
+                                        html.H6("Top 10 pays", className="fw-bold mb-2"), 
+                                        html.Div(id="country-badge-container", className="d-flex flex-wrap gap-2 mb-3"),
+                                        
+                                        html.H6("Stats filtrées", className="fw-bold mb-2"), 
+                                        html.Div(id="filtered-key-stats", className="small"),
+                                    ]
+                                )
+                            ],
+                            className="h-100 shadow-sm"
+                        ),
+                        lg=6
+                    ),
+                    # Colonne Droite : Carte du Monde
+                    dbc.Col(
+                        dbc.Card(
+                            [
+                                render_card_header("bi bi-geo-alt-fill", "Répartition Géographique"),
+                                dbc.CardBody(
+                                    [
+                                        dbc.Row(
+                                            [
+                                               dbc.Col(html.Label("Indicateur de la carte :", className="fw-bold mt-1"), width="auto"),
+                                               dbc.Col(dcc.Dropdown(id="map-indicator", options=MAP_DROPDOWN_OPTIONS, value="views", clearable=False, className="w-100")) 
+                                            ],
+                                            className="mb-3 align-items-center"
                                         ),
-                                        className="map-container-div"
-                                    )
-                                ]
-                            )
+                                        html.Div(
+                                            dcc.Graph(
+                                                id="world-map",
+                                                figure=build_base_map(),
+                                                config={"displayModeBar": False},
+                                                className="map-graph"
+                                            ),
+                                            className="map-container-div"
+                                        )
+                                    ]
+                                )
+                            ],
+                            className="h-100 shadow-sm"
+                        ),
+                        lg=6
+                    ),
+                ]
+            ),
+
+            # --- Exploration géographique (région → pays → créateur) ---
+            dcc.Store(id="home-drill", data={"level": "world", "key": None}),
+            dbc.Card(
+                className="p-3 mb-4 shadow-sm border",
+                children=[
+                    dbc.Row(
+                        [
+                            dbc.Col(
+                                html.Div(
+                                    [
+                                        html.I(className="bi bi-diagram-3-fill me-2"),
+                                        html.Span("Exploration géographique", className="fw-semibold")
+                                    ]
+                                ),
+                                width="auto"
+                            ),
+                            dbc.Col(
+                                dbc.Switch(id="map-drill-mode", label="Clic sur la carte : explorer le pays", value=False),
+                                className="d-flex justify-content-end"
+                            ),
                         ],
-                        className="h-100 shadow-sm"
+                        className="align-items-center mb-3"
                     ),
-                    lg=6
-                ),
-            ]
-        ),
-    ]
-)
+                    html.Div(id="home-drill-panel")
+                ]
+            ),
+        ]
+    )
 
 # ============================================================
 # 3. CALLBACKS (LOGIQUE D'INTERACTION)
 # ============================================================
 
-@callback(
+# --- Gestion des filtres côté client (assets/home_filters.js) ---
+# L'état des filtres, les badges et les pilules ne dépendent que du store home-filter-payload :
+# seuls `update_visualizations` et le panneau d'exploration sollicitent le serveur.
+
+clientside_callback(
+    ClientsideFunction(namespace="home", function_name="platformStyle"),
     [Output("select-tiktok", "className"), Output("select-youtube", "className")],
     Input("platform-selection", "data")
 )
-def update_platform_style(platform):
-    """Met à jour le style visuel (sélectionné/non sélectionné) des boutons plateforme."""
-    base = "platform-option"
-    if platform == "TikTok":
-        return f"{base} selected", base
-    if platform == "YouTube":
-        return base, f"{base} selected"
-    return base, base
 
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace="home", function_name="themeBadges"),
     Output("theme-badge-container", "children"),
-    Input("selected-theme", "data")
+    Input("selected-theme", "data"),
+    State("home-filter-payload", "data")
 )
-def render_theme_badges(selected_list):
-    """Génère les badges de thématiques."""
-    selected_list = selected_list or []
-    return [render_selectable_badge(t, "theme-badge", {"name": t}, t in selected_list) for t in THEMES]
 
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace="home", function_name="countryBadges"),
     Output("country-badge-container", "children"),
-    Input("selected-country", "data")
+    Input("selected-country", "data"),
+    State("home-filter-payload", "data")
 )
-def render_country_badges(selected_iso_list):
-    """Génère les badges des pays (Top 10)."""
-    selected_iso_list = selected_iso_list or []
-    top_countries = data_manager.df_initial.sort_values("views", ascending=False).head(10)
-    return [
-        render_selectable_badge(row['name'], "country-badge", {"iso": row['iso_alpha']}, row['iso_alpha'] in selected_iso_list)
-        for _, row in top_countries.iterrows()
-    ]
 
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace="home", function_name="activeFilters"),
     Output("active-filters", "children"),
-    [Input("platform-selection", "data"), Input("selected-theme", "data"), Input("selected-country", "data")]
+    [Input("platform-selection", "data"), Input("selected-theme", "data"), Input("selected-country", "data")],
+    State("home-filter-payload", "data")
 )
-def update_active_filters_display(platform, themes, countries):
-    """Affiche les pilules de filtres actifs en haut de page."""
-    pills = []
-    if platform and platform != "all":
-        pills.append(render_filter_pill("Plateforme", platform, "platform"))
-    
-    country_map = {iso: data['name'] for iso, data in COUNTRY_STATS.items()}
-    
-    for t in (themes or []):
-        pills.append(render_filter_pill("Thème", t, "theme"))
-    for iso in (countries or []):
-        # Utiliser l'ISO comme valeur pour permettre la suppression correcte
-        pills.append(render_filter_pill("Pays", country_map.get(iso, iso), "country", iso_value=iso))
-        
-    return pills if pills else html.Span("Aucun filtre appliqué", className="text-muted small")
 
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace="home", function_name="manageFilters"),
     [Output("platform-selection", "data"), Output("selected-theme", "data"), Output("selected-country", "data")],
     [
         Input("select-tiktok", "n_clicks"),
@@ -343,98 +485,53 @@ def update_active_filters_display(platform, themes, countries):
         Input({"type": "country-badge", "iso": ALL}, "n_clicks"),
         Input("world-map", "clickData")
     ],
-    [State("platform-selection", "data"), State("selected-theme", "data"), State("selected-country", "data")],
+    [
+        State("platform-selection", "data"), State("selected-theme", "data"), State("selected-country", "data"),
+        State("map-drill-mode", "value")
+    ],
+    prevent_initial_call=True
+)
+
+# Navigation dans la hiérarchie d'exploration (clic carte en mode exploration, sous-niveaux, fil d'Ariane)
+clientside_callback(
+    ClientsideFunction(namespace="home", function_name="drillState"),
+    Output("home-drill", "data"),
+    [
+        Input("world-map", "clickData"),
+        Input({"type": "drill-node", "level": ALL, "key": ALL}, "n_clicks")
+    ],
+    [State("map-drill-mode", "value"), State("home-drill", "data")],
+    prevent_initial_call=True
+)
+
+@callback(
+    Output("home-drill-panel", "children"),
+    [
+        Input("home-drill", "data"),
+        Input("platform-selection", "data"),
+        Input("selected-theme", "data")
+    ]
+)
+def update_drill_panel(drill, platform, themes):
+    """Panneau d'exploration : lecture du nœud courant dans la hiérarchie précalculée."""
+    drill = drill or {"level": "world", "key": None}
+    node = data_manager.get_drill_node(drill.get("level", "world"), drill.get("key") or None, platform, themes)
+    return render_drill_panel(node)
+
+clientside_callback(
+    ClientsideFunction(namespace="home", function_name="mapIndicator"),
+    Output("world-map", "figure", allow_duplicate=True),
+    Input("map-indicator", "value"),
+    [State("home-map-data", "data"), State("world-map", "figure")],
     prevent_initial_call=True
 )
-def manage_all_filters(tk_click, yt_click, clear_click, rm_click, theme_click, country_click, map_click, 
-                      platform, themes, countries):
-    """Gestion centralisée de tous les clics modifiant les filtres."""
-    ctx = callback_context
-    
-    # Sécurité : initialiser les valeurs par défaut
-    platform = platform or "all"
-    themes = themes or []
-    countries = countries or []
-    
-    if not ctx.triggered:
-        return platform, themes, countries
-    
-    # Récupérer l'élément qui a déclenché le callback
-    trigger = ctx.triggered[0]
-    prop_id = trigger["prop_id"]
-    trig_id = ctx.triggered_id
-    
-    # Ignorer les clics invalides ou vides
-    if not prop_id or prop_id == "." or trig_id is None:
-        return platform, themes, countries
-    
-    # Pour les patterns matching avec ALL, vérifier que la valeur a changé
-    if "n_clicks" in prop_id and trigger["value"] == 0:
-        return platform, themes, countries
-
-    # Reset global
-    if trig_id == "clear-filters":
-        return "all", [], []
-
-    # Sélection plateforme
-    if trig_id == "select-tiktok":
-        return ("TikTok" if platform != "TikTok" else "all"), themes, countries
-    if trig_id == "select-youtube":
-        return ("YouTube" if platform != "YouTube" else "all"), themes, countries
-    
-    # Clic sur la carte
-    if trig_id == "world-map" and map_click:
-        try:
-            iso = map_click["points"][0]["location"]
-            if iso in countries:
-                new_countries = [c for c in countries if c != iso]
-            else:
-                new_countries = countries + [iso]
-            return platform, themes, new_countries
-        except (KeyError, IndexError, TypeError):
-            return platform, themes, countries
-
-    # Pattern matching pour suppression ou toggle de badges
-    if isinstance(trig_id, dict):
-        kind = trig_id.get("type")
-        
-        # Vérifier que le dictionnaire est valide
-        if not kind:
-            return platform, themes, countries
-            
-        # Suppression via la croix
-        if kind == "remove-filter":
-            k_filter = trig_id.get("kind")
-            val = trig_id.get("value")
-            if not k_filter or val is None:
-                return platform, themes, countries
-            if k_filter == "platform": 
-                platform = "all"
-            elif k_filter == "theme": 
-                themes = [t for t in themes if t != val]
-            elif k_filter == "country": 
-                countries = [c for c in countries if c != val]
-        
-        # Toggle Badges
-        elif kind == "theme-badge":
-            val = trig_id.get("name")
-            if val is None or val == "":
-                return platform, themes, countries
-            themes = [t for t in themes if t != val] if val in themes else themes + [val]
-            
-        elif kind == "country-badge":
-            val = trig_id.get("iso")
-            if val is None or val == "":
-                return platform, themes, countries
-            countries = [c for c in countries if c != val] if val in countries else countries + [val]
-            
-    return platform, themes, countries
 
 @callback(
     [
         Output("stats-cards", "children"), 
         Output("filtered-key-stats", "children"),
         Output("world-map", "figure"),
+        Output("home-map-data", "data"),
         Output("count-tiktok", "children"),
         Output("count-youtube", "children")
     ],
@@ -442,92 +539,64 @@ def manage_all_filters(tk_click, yt_click, clear_click, rm_click, theme_click, c
         Input("platform-selection", "data"),
         Input("selected-theme", "data"),
         Input("selected-country", "data"),
-        Input("map-indicator", "value")
-    ]
+        Input("home-date-range", "value")
+    ],
+    State("map-indicator", "value")
 )
-def update_visualizations(platform, themes, countries, indicator):
+def update_visualizations(platform, themes, countries, date_range, indicator):
     """
     Met à jour tous les graphiques et KPIs.
     Calcul dynamiquement les volumes TikTok vs YouTube selon les constantes.
+    La plage de dates pondère les volumes par la part d'activité de la période.
+    La carte n'est pas reconstruite : seules ses valeurs sont envoyées (Patch).
     """
-    # 1. Données filtrées pour les KPI (tient compte du filtre plateforme)
-    dff = data_manager.get_filtered_df(platform, themes, countries)
-    agg = data_manager.get_kpi_stats(dff)
-
-    # 2. Calcul du contexte global (TikTok vs YouTube)
-    # On recalcule sur le set "toutes plateformes" pour afficher les volumes à côté des boutons
-    dff_context = data_manager.get_filtered_df("all", themes, countries)
-    
-    tik_videos = 0
-    yt_videos = 0
-    
-    for _, row in dff_context.iterrows():
-        iso = row['iso_alpha']
-        raw_stats = COUNTRY_STATS.get(iso, {})
-        split = raw_stats.get("platform_split", {"TikTok": 0.5, "YouTube": 0.5})
-        
-        vid = row['videos']
-        tik_videos += vid * split.get("TikTok", 0)
-        yt_videos += vid * split.get("YouTube", 0)
-
-    # 3. Création des cartes KPI
+    # 1. KPI, données de la carte et volumes TikTok / YouTube en un seul calcul
+    home = data_manager.get_home_aggregates(platform, themes, countries, period=date_range)
+    dff = home["df"]
+    agg = home["kpis"]
+    tik_videos = home["platform_videos"]["tiktok"]
+    yt_videos = home["platform_videos"]["youtube"]
+    tik_label, yt_label = short_numbers([tik_videos, yt_videos])
+
+    # 2. Création des cartes KPI
     kpi_definitions = [
         ("Total vidéos", "videos"), ("Total vues", "views"), 
         ("Likes", "likes"), ("Partages", "shares"), 
         ("Commentaires", "comments"), ("Créateurs", "creators")
     ]
     
+    kpi_values = short_numbers([agg.get(key, 0) for _, key in kpi_definitions])
     kpi_cards = [
-        dbc.Col(render_kpi_card(label, short_number(agg.get(key, 0))), xs=6, md=4, lg=2)
-        for label, key in kpi_definitions
+        dbc.Col(render_kpi_card(label, text), xs=6, md=4, lg=2)
+        for (label, _), text in zip(kpi_definitions, kpi_values)
     ]
 
-    # 4. Stats latérales (format texte)
+    # 3. Stats latérales (format texte)
+    stat_definitions = [("Vues", "views"), ("Likes", "likes"), ("Partages", "shares"), ("Créateurs", "creators")]
+    stat_values = short_numbers([agg.get(k, 0) for _, k in stat_definitions])
     filtered_stats = [
-        render_stat_line(l, agg.get(k, 0)) 
-        for l, k in [("Vues", "views"), ("Likes", "likes"), ("Partages", "shares"), ("Créateurs", "creators")]
+        render_stat_line(l, agg.get(k, 0), text)
+        for (l, k), text in zip(stat_definitions, stat_values)
     ]
 
-    # 5. Carte du Monde
-    label_map = {item["value"]: item["label"] for item in MAP_DROPDOWN_OPTIONS}
-    legend_title = label_map.get(indicator, indicator)
-    
-    if dff.empty:
-        fig = px.choropleth(locations=[], locationmode="ISO-3")
-        fig.update_layout(template="plotly_white")
-    else:
-        dff['formatted_value'] = dff[indicator].apply(lambda x: short_number(x))
-        fig = px.choropleth(
-            dff, 
-            locations="iso_alpha", 
-            color=indicator, 
-            scope="world", 
-            hover_name="name",
-            hover_data=["rank_label", "formatted_value"],
-            color_continuous_scale=px.colors.sequential.Blues
-        )
-        fig.update_traces(
-            hovertemplate="<b>%{hovertext}</b><br>Rang: %{customdata[0]}<br>Valeur: %{customdata[1]}<extra></extra>"
-        )
-
-    fig.update_layout(
-        coloraxis_colorbar=dict(title=legend_title, tickformat=".2s"),
-        margin=dict(l=0, r=0, t=0, b=0),
-        geo=dict(
-            bgcolor="rgba(0,0,0,0)", 
-            showcountries=True, 
-            showframe=False, 
-            showcoastlines=False,
-            projection_type="natural earth"
-        ),
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-    )
+    # 4. Carte du Monde : toutes les colonnes d'indicateurs (pour le changement côté client)
+    #    et un Patch limité aux valeurs de l'indicateur courant
+    map_data = build_map_columns(dff)
+    column = map_data["columns"].get(indicator) or map_data["columns"]["views"]
+    fig = Patch()
+    fig["data"][0]["locations"] = map_data["isos"]
+    fig["data"][0]["text"] = map_data["names"]
+    fig["data"][0]["z"] = column["z"]
+    fig["data"][0]["customdata"] = column["customdata"]
+    fig["layout"]["coloraxis"]["cmin"] = column["cmin"]
+    fig["layout"]["coloraxis"]["cmax"] = column["cmax"]
+    fig["layout"]["coloraxis"]["colorbar"]["title"]["text"] = map_data["labels"].get(indicator, indicator)
 
     return (
         kpi_cards, 
         filtered_stats, 
         fig, 
-        f"{short_number(tik_videos)} vidéos", 
-        f"{short_number(yt_videos)} vidéos"
+        map_data,
+        f"{tik_label} vidéos", 
+        f"{yt_label} vidéos"
     )
\ No newline at end of file
@@ -8,31 +8,35 @@ Ce module gère l'affichage détaillé d'un créateur :
    - Vue générale (Graphique de progression).
    - Top Vidéos (Liste paginée et triable).
    - Analytique Avancée (Outils de comparaison et d'analyse fine).
+4. Créateurs similaires (forme des courbes de croissance).
 """
 
 import json
 import dash
-from dash import html, dcc, callback, Input, Output, State, callback_context, no_update
+from dash import html, dcc, callback, clientside_callback, Input, Output, State, callback_context, no_update
 import dash_bootstrap_components as dbc
 from dash.dependencies import ALL
 
 from functions import (
     get_creator_by_id, 
     render_creator_card_search, 
-    short_number, 
+    render_creator_card_compact, 
+    short_numbers,
     render_top_video_card,
     analytics_engine,
+    data_manager,
     get_platform_stats,
     render_kpi_card
 )
-from constants import TOP_VIDEOS
+from constants import TIME_GRANULARITIES, DERIVED_METRICS
 
 dash.register_page(__name__, path_template="/profile/<id>", name="Profil créateur")
 
 # Constantes locales pour les labels et options
 METRICS_LABELS = {
     "views": "Vues", "likes": "Likes", "shares": "Partages", 
-    "comments": "Commentaires", "followers": "Abonnés"
+    "comments": "Commentaires", "followers": "Abonnés",
+    **{k: d["label"] for k, d in DERIVED_METRICS.items()}
 }
 
 SORT_OPTIONS_VIDEOS = [
@@ -58,6 +62,8 @@ def layout(id=None, **kwargs):
             className="alert alert-danger m-4"
         )
 
+    n_periods = max(1, data_manager.get_period_count())
+
     return html.Div(
         className="main-container",
         children=[
@@ -76,6 +82,23 @@ def layout(id=None, **kwargs):
                 ],
                 className="mb-4"
             ),
+
+            # 2 bis. PLAGE DE DATES (KPIs et graphiques)
+            html.Div(
+                [
+                    html.Label("Période", className="fw-bold mb-2"),
+                    dcc.RangeSlider(
+                        id="profile-date-range",
+                        min=0,
+                        max=n_periods - 1,
+                        step=1,
+                        value=[0, n_periods - 1],
+                        marks=data_manager.get_period_marks(),
+                        allowCross=False
+                    )
+                ],
+                className="mb-4"
+            ),
             
             # 3. CONTENEUR KPI (Cartes de statistiques)
             html.Div(id="profile-kpi-container", className="mb-4"),
@@ -182,7 +205,8 @@ def layout(id=None, **kwargs):
                                                             options=[
                                                                 {"label": "Valeurs brutes", "value": "values"}, 
                                                                 {"label": "Progression (%)", "value": "progression"}, 
-                                                                {"label": "Ratios (KPI/KPI)", "value": "ratio"}
+                                                                {"label": "Ratios (KPI/KPI)", "value": "ratio"},
+                                                                {"label": "Formule personnalisée", "value": "formula"}
                                                             ], 
                                                             value="values", 
                                                             labelStyle={"display": "block", "marginBottom": "5px"},
@@ -193,8 +217,8 @@ def layout(id=None, **kwargs):
                                                         html.Label("Axe X (Temps)", className="fw-bold"), 
                                                         dcc.Dropdown(
                                                             id="an-x", 
-                                                            options=[{"label": "Temps (Mois)", "value": "time"}], 
-                                                            value="time", 
+                                                            options=[{"label": l, "value": k} for k, l in TIME_GRANULARITIES.items()], 
+                                                            value="month", 
                                                             clearable=False
                                                         ), 
                                                         
@@ -234,6 +258,25 @@ def layout(id=None, **kwargs):
                                                                 )
                                                             ]
                                                         ), 
+                                                        
+                                                        # Formule libre (Mode Formule)
+                                                        html.Div(
+                                                            id="an-formula-ui", 
+                                                            style={"display": "none"}, 
+                                                            children=[
+                                                                dcc.Input(
+                                                                    id="an-formula", 
+                                                                    type="text", 
+                                                                    value="(likes + shares + comments) / views * 100", 
+                                                                    debounce=True, 
+                                                                    className="form-control"
+                                                                ), 
+                                                                html.Div(
+                                                                    "Métriques : views, likes, shares, comments, followers, videos. Opérateurs : + - * / ( )", 
+                                                                    className="small text-muted mt-1"
+                                                                )
+                                                            ]
+                                                        ), 
                                                         html.Hr(), 
                                                         
                                                         html.Label("Filtre Plateforme", className="fw-bold"), 
@@ -253,7 +296,11 @@ def layout(id=None, **kwargs):
                                                             id="an-advanced", 
                                                             options=[
                                                                 {"label": " Afficher Tendance", "value": "reg"}, 
-                                                                {"label": " Afficher Prévision (+3 mois)", "value": "forecast"}
+                                                                {"label": " Afficher Prévision (+3 mois)", "value": "forecast"},
+                                                                {"label": " Moyenne mobile 3 périodes", "value": "ma3"},
+                                                                {"label": " Moyenne mobile 6 périodes", "value": "ma6"},
+                                                                {"label": " Moyenne mobile 12 périodes", "value": "ma12"},
+                                                                {"label": " Croissance glissante (3 périodes)", "value": "growth3"}
                                                             ], 
                                                             value=[], 
                                                             style={"marginTop": "15px"},
@@ -267,11 +314,26 @@ def layout(id=None, **kwargs):
                                                             options=[
                                                                 {"label": "Aucune comparaison", "value": "none"},
                                                                 {"label": "Moyenne du Pays", "value": "country"},
-                                                                {"label": "Moyenne de la Catégorie", "value": "tag"}
+                                                                {"label": "Moyenne de la Catégorie", "value": "tag"},
+                                                                {"label": "Créateurs choisis…", "value": "creators"}
                                                             ],
                                                             value="none",
                                                             clearable=False
                                                         ),
+                                                        html.Div(
+                                                            id="an-compare-creators-ui",
+                                                            style={"display": "none"},
+                                                            children=[
+                                                                dcc.Dropdown(
+                                                                    id="an-compare-creators",
+                                                                    options=[],
+                                                                    value=[],
+                                                                    multi=True,
+                                                                    placeholder=f"Jusqu'à {analytics_engine.max_compare} créateurs",
+                                                                    className="mt-2"
+                                                                )
+                                                            ]
+                                                        ),
 
                                                     ]
                                                 ), 
@@ -299,9 +361,19 @@ def layout(id=None, **kwargs):
                 ]
             ),
             
+            # 6. CRÉATEURS SIMILAIRES (forme des courbes de croissance)
+            html.Div(
+                className="section-card p-4 rounded-3 border mt-4",
+                children=[
+                    html.Div("Créateurs similaires", className="section-header h5 fw-bold mb-3"),
+                    html.Div(id="profile-similar-list")
+                ]
+            ),
+            
             # Stores de gestion d'état
             dcc.Store(id="profile-current-id", data=id),
-            dcc.Store(id="video-pagination-page", data=1)
+            dcc.Store(id="video-pagination-page", data=1),
+            dcc.Store(id="an-graph-width")
         ]
     )
 
@@ -371,25 +443,39 @@ def init_platform_selector(cid):
 
 @callback(
     Output("profile-kpi-container", "children"), 
-    [Input("profile-platform-global", "value"), Input("profile-current-id", "data")]
+    [
+        Input("profile-platform-global", "value"), 
+        Input("profile-current-id", "data"),
+        Input("profile-date-range", "value")
+    ]
 )
-def update_kpi_cards(platform, cid):
-    """Met à jour les cartes KPI en fonction de la plateforme sélectionnée."""
+def update_kpi_cards(platform, cid, date_range):
+    """
+    Met à jour les cartes KPI en fonction de la plateforme sélectionnée.
+    Si une plage de dates est choisie, les totaux sont lus dans les sommes préfixes (O(1)).
+    """
     creator = get_creator_by_id(cid)
     if not creator or not platform: 
         return []
     
-    stats = get_platform_stats(creator, platform)
+    period = data_manager.normalize_period(date_range)
+    if period:
+        stats = data_manager.get_range_totals(cid, platform, *period)
+        followers_label = "Abonnés gagnés"
+    else:
+        stats = get_platform_stats(creator, platform)
+        followers_label = "Abonnés"
     
     kpi_config = [
-        ("Abonnés", "followers"), ("Vues", "views"), ("Likes", "likes"),
+        (followers_label, "followers"), ("Vues", "views"), ("Likes", "likes"),
         ("Partages", "shares"), ("Vidéos", "videos"), ("Commentaires", "comments")
     ]
     
-    cards = []
-    for label, key in kpi_config:
-        val = short_number(stats.get(key, 0))
-        cards.append(dbc.Col(render_kpi_card(label, val), xs=6, md=4, lg=2))
+    values = short_numbers([stats.get(key, 0) for _, key in kpi_config])
+    cards = [
+        dbc.Col(render_kpi_card(label, val), xs=6, md=4, lg=2)
+        for (label, _), val in zip(kpi_config, values)
+    ]
         
     return dbc.Row(cards, className="g-3")
 
@@ -414,9 +500,13 @@ def switch_tabs(tab):
 
 @callback(
     Output("general-graph", "figure"), 
-    [Input("profile-platform-global", "value"), Input("profile-current-id", "data")]
+    [
+        Input("profile-platform-global", "value"), 
+        Input("profile-current-id", "data"),
+        Input("profile-date-range", "value")
+    ]
 )
-def update_general_graph(platform, cid):
+def update_general_graph(platform, cid, date_range):
     """Génère le graphique de progression global (Vue générale)."""
     creator = get_creator_by_id(cid)
     if not creator or not platform: 
@@ -425,7 +515,7 @@ def update_general_graph(platform, cid):
     metrics_to_show = ["views", "likes", "shares", "followers", "comments"]
     # Utilisation du moteur analytique avec des paramètres par défaut
     return analytics_engine.build_figure(
-        creator, "progression", "time", metrics_to_show, None, None, platform, []
+        creator, "progression", "month", metrics_to_show, None, None, platform, [], period=date_range
     )
 
 @callback(
@@ -449,19 +539,13 @@ def update_top_videos(platform, sort_val, prev, next, cid, current_page):
     if not creator: 
         return [], 1, ""
         
-    # 1. Agrégation des vidéos
-    videos = []
-    platforms_needed = ["TikTok", "YouTube"] if platform == "combined" else [platform]
-    for p in platforms_needed: 
-        videos.extend(TOP_VIDEOS.get(p, []))
-    
-    # 2. Tri
+    # 1. Index pré-trié des vidéos du créateur (plateforme ou "combined" = toutes plateformes)
+    total = data_manager.videos.count(cid, platform)
     metric, order = sort_val.split("_")
-    videos = sorted(videos, key=lambda x: x.get(metric, 0), reverse=(order == "desc"))
     
-    # 3. Pagination
+    # 2. Pagination
     per_page = 3
-    max_page = max(1, (len(videos) + per_page - 1) // per_page)
+    max_page = max(1, (total + per_page - 1) // per_page)
     
     ctx = callback_context
     if ctx.triggered and "vid-" in ctx.triggered[0]["prop_id"]:
@@ -473,8 +557,9 @@ def update_top_videos(platform, sort_val, prev, next, cid, current_page):
     else: 
         current_page = 1
         
+    # 3. Page courante : simple tranche de l'index trié
     start = (current_page - 1) * per_page
-    page_items = videos[start : start + per_page]
+    page_items = data_manager.videos.page(cid, platform, metric, order, current_page, per_page)
     
     # 4. Rendu
     cards = [render_top_video_card(v, start + i + 1) for i, v in enumerate(page_items)]
@@ -484,14 +569,80 @@ def update_top_videos(platform, sort_val, prev, next, cid, current_page):
     return cards, current_page, f"Page {current_page} / {max_page}"
 
 @callback(
-    [Output("an-multi-ui", "style"), Output("an-ratio-ui", "style")], 
+    Output("profile-similar-list", "children"),
+    [Input("profile-current-id", "data"), Input("auth-mode", "data"), Input("favorites-ids-store", "data")]
+)
+def update_similar_creators(cid, auth_mode, fav_ids):
+    """Créateurs dont la courbe de croissance a la forme la plus proche (voisins mis en cache)."""
+    similar = data_manager.get_similar_creators(cid, k=4)
+    if not similar:
+        return html.Div("Aucun créateur similaire.", className="text-muted fst-italic")
+    
+    my_favs = [str(x) for x in (fav_ids or [])] if auth_mode == "profile" else []
+    return dbc.Row(className="g-3", children=[
+        dbc.Col(md=6, lg=3, children=[
+            render_creator_card_compact(c, is_favorite=str(c["id"]) in my_favs),
+            html.Div(f"Similarité : {sim:.0%}", className="text-muted small text-center")
+        ])
+        for c, sim in similar
+    ])
+
+@callback(
+    [Output("an-multi-ui", "style"), Output("an-ratio-ui", "style"), Output("an-formula-ui", "style")], 
     Input("an-mode", "value")
 )
 def toggle_analytics_controls(mode):
-    """Affiche les contrôles adaptés au mode choisi (Sélecteur multiple vs Numérateur/Dénominateur)."""
+    """Affiche les contrôles adaptés au mode choisi (Sélecteur multiple, Numérateur/Dénominateur ou Formule)."""
+    hidden, shown = {"display": "none"}, {"display": "block"}
     if mode == "ratio":
-        return {"display": "none"}, {"display": "block"}
-    return {"display": "block"}, {"display": "none"}
+        return hidden, shown, hidden
+    if mode == "formula":
+        return hidden, hidden, shown
+    return shown, hidden, hidden
+
+@callback(
+    [Output("an-compare-creators-ui", "style"), Output("an-compare-creators", "options")],
+    [Input("an-compare", "value"), Input("an-compare-creators", "value")],
+    State("profile-current-id", "data")
+)
+def toggle_compare_creators(compare_val, selected, cid):
+    """Affiche le sélecteur de créateurs à comparer et bloque les choix au-delà du maximum."""
+    if compare_val != "creators":
+        return {"display": "none"}, no_update
+    selected = [str(s) for s in (selected or [])]
+    full = len(selected) >= analytics_engine.max_compare
+    options = [
+        {"label": c["name"], "value": str(c["id"]), "disabled": full and str(c["id"]) not in selected}
+        for c in data_manager.creators if str(c["id"]) != str(cid)
+    ]
+    return {"display": "block"}, options
+
+def parse_x_range(relayout):
+    """Extrait la fenêtre de zoom de l'axe X depuis relayoutData (None si vue complète)."""
+    if not relayout or relayout.get("xaxis.autorange"):
+        return None
+    if "xaxis.range[0]" in relayout and "xaxis.range[1]" in relayout:
+        return relayout["xaxis.range[0]"], relayout["xaxis.range[1]"]
+    if "xaxis.range" in relayout:
+        return tuple(relayout["xaxis.range"])
+    return None
+
+# Mesure côté client de la largeur réelle du graphique (budget de points LTTB)
+clientside_callback(
+    """
+    function(relayout, current) {
+        const el = document.getElementById('an-graph');
+        const width = el ? el.offsetWidth : 0;
+        if (!width || width === current) {
+            return window.dash_clientside.no_update;
+        }
+        return width;
+    }
+    """,
+    Output("an-graph-width", "data"),
+    Input("an-graph", "relayoutData"),
+    State("an-graph-width", "data")
+)
 
 @callback(
     Output("an-graph", "figure"),
@@ -504,15 +655,24 @@ def toggle_analytics_controls(mode):
         Input("analytics-platform-filter", "value"), 
         Input("an-advanced", "value"),
         Input("an-compare", "value"), 
-        Input("profile-current-id", "data")
+        Input("profile-current-id", "data"),
+        Input("an-graph", "relayoutData"),
+        Input("an-graph-width", "data"),
+        Input("profile-date-range", "value"),
+        Input("an-formula", "value"),
+        Input("an-compare-creators", "value")
     ]
 )
-def update_analytics_chart(mode, x, ym, rn, rd, platform, adv, compare_val, cid):
+def update_analytics_chart(mode, x, ym, rn, rd, platform, adv, compare_val, cid, relayout, width, date_range, formula,
+                           compare_ids):
     """
     Callback central du graphique analytique.
     Délègue la construction du graphique complexe à `analytics_engine`.
+    Un zoom (relayoutData) redemande les points en pleine résolution sur la fenêtre visible.
     """
     creator = get_creator_by_id(cid)
     return analytics_engine.build_figure(
-        creator, mode, x, ym, rn, rd, platform, adv, compare_mode=compare_val
+        creator, mode, x, ym, rn, rd, platform, adv, compare_mode=compare_val,
+        width=width, x_range=parse_x_range(relayout), period=date_range, formula=formula,
+        compare_ids=compare_ids
     )
\ No newline at end of file
@@ -2,8 +2,8 @@
 Page de Recherche.
 
 Ce module permet de rechercher des créateurs selon plusieurs critères :
-1. Filtres multiples (Plateforme, Région, Thème, Langue, etc.).
-2. Tri dynamique (Vues, Likes, Partages).
+1. Filtres multiples (Plateforme, Région, Thème, Langue, Archétype de croissance, etc.).
+2. Tri dynamique (Vues, Likes, Partages, métriques dérivées).
 3. Pagination des résultats.
 """
 
@@ -12,6 +12,7 @@ from dash import html, dcc, callback, Input, Output, State, callback_context
 import dash_bootstrap_components as dbc
 
 from functions import data_manager, render_creator_card_search
+from constants import DERIVED_METRICS, GROWTH_ARCHETYPES
 
 dash.register_page(__name__, path="/search", name="Recherche")
 
@@ -24,6 +25,9 @@ SORT_OPTIONS = [
     {"label": "Likes ↓", "value": "likes_desc"}, 
     {"label": "Likes ↑", "value": "likes_asc"},
     {"label": "Partages ↓", "value": "shares_desc"},
+] + [
+    {"label": f"{d['label']} {arrow}", "value": f"{k}_{order}"}
+    for k, d in DERIVED_METRICS.items() for arrow, order in (("↓", "desc"), ("↑", "asc"))
 ]
 
 # ============================================================
@@ -72,9 +76,10 @@ def build_filters_section():
             dbc.Row(
                 className="search-filter-row-spacer",
                 children=[
-                    dbc.Col(make_dropdown("search-language-dropdown", data_manager.get_unique_values("language")), md=4),
-                    dbc.Col(make_dropdown("search-certified-dropdown", [{"label": "Certifiés", "value": "oui"}, {"label": "Non certifiés", "value": "non"}], placeholder_label="Tous"), md=4),
-                    dbc.Col(make_dropdown("search-active-dropdown", [{"label": "Actifs", "value": "oui"}, {"label": "Inactifs", "value": "non"}], placeholder_label="Tous"), md=4),
+                    dbc.Col(make_dropdown("search-language-dropdown", data_manager.get_unique_values("language")), md=3),
+                    dbc.Col(make_dropdown("search-certified-dropdown", [{"label": "Certifiés", "value": "oui"}, {"label": "Non certifiés", "value": "non"}], placeholder_label="Tous"), md=3),
+                    dbc.Col(make_dropdown("search-active-dropdown", [{"label": "Actifs", "value": "oui"}, {"label": "Inactifs", "value": "non"}], placeholder_label="Tous"), md=3),
+                    dbc.Col(make_dropdown("search-archetype-dropdown", [{"label": f"{icon} {label}", "value": key} for key, (label, icon) in GROWTH_ARCHETYPES.items()], placeholder_label="Toutes croissances"), md=3),
                 ]
             ),
         ]
@@ -172,6 +177,7 @@ layout = html.Div(
         Input("search-language-dropdown", "value"),
         Input("search-certified-dropdown", "value"),
         Input("search-active-dropdown", "value"),
+        Input("search-archetype-dropdown", "value"),
         Input("search-sort-dropdown", "value"),
         Input("search-prev", "n_clicks"),
         Input("search-next", "n_clicks"),
@@ -183,7 +189,7 @@ layout = html.Div(
     ],
 )
 def update_search(
-    query, platform, region, theme, lang, certif, active, sort_value, 
+    query, platform, region, theme, lang, certif, active, archetype, sort_value, 
     prev_clicks, next_clicks, auth_status, fav_ids, current_page
 ):
     """
@@ -203,7 +209,7 @@ def update_search(
     my_favs = [str(uid) for uid in (fav_ids or [])] if is_logged_in else []
 
     # 2. Filtrage & Tri
-    filtered_list = data_manager.filter_creators(query, platform, region, theme, lang, certif, active)
+    filtered_list = data_manager.filter_creators(query, platform, region, theme, lang, certif, active, archetype)
     sorted_list = data_manager.sort_creators(filtered_list, sort_value)
 
     total = len(sorted_list)
@@ -0,0 +1,115 @@
+"""
+Page de Recherche de Vidéos.
+
+Ce module permet de rechercher des vidéos :
+1. Recherche plein texte (titre, @username du créateur, plateforme) via l'index inversé du DataManager.
+2. Filtres de plateforme, de durée et de vues.
+3. Classement : pertinence du texte (BM25) combinée aux vues.
+"""
+
+import dash
+from dash import html, dcc, callback, Input, Output
+import dash_bootstrap_components as dbc
+
+from functions import data_manager, render_video_card
+
+dash.register_page(__name__, path="/videos", name="Vidéos")
+
+# Configuration
+MAX_RESULTS = 24
+
+VIEWS_OPTIONS = [
+    {"label": "Toutes", "value": 0},
+    {"label": "≥ 100 k vues", "value": 100_000},
+    {"label": "≥ 1 M vues", "value": 1_000_000},
+    {"label": "≥ 5 M vues", "value": 5_000_000},
+]
+
+# Borne haute du curseur de durée (minutes), d'après les vidéos indexées
+MAX_DURATION_MIN = max(1, -(-max(data_manager.video_index.durations or [0]) // 60))
+
+# ============================================================
+# 1. LAYOUT
+# ============================================================
+
+layout = html.Div(
+    className="main-container",
+    children=[
+        # En-tête
+        html.Div(
+            className="search-header-container",
+            children=[
+                html.Div("Recherche de Vidéos", className="discovery-header-title"),
+                html.Div("Titres, créateurs et plateformes.", className="discovery-header-subtitle")
+            ]
+        ),
+
+        # Filtres
+        html.Div(
+            className="search-filters-card",
+            children=[
+                dcc.Input(
+                    id="video-query",
+                    type="text",
+                    placeholder="Rechercher une vidéo (ex: yoga, @lucas_fitpro)...",
+                    debounce=True,
+                    className="favorites-search-input"
+                ),
+                dbc.Row(
+                    className="search-filter-row-spacer",
+                    children=[
+                        dbc.Col(dcc.Dropdown(
+                            id="video-platform",
+                            options=[{"label": "Toutes", "value": "all"}]
+                                    + [{"label": p, "value": p} for p in data_manager.home_platforms],
+                            value="all", clearable=False, className="favorites-dropdown"
+                        ), md=3),
+                        dbc.Col(dcc.Dropdown(
+                            id="video-min-views", options=VIEWS_OPTIONS, value=0,
+                            clearable=False, className="favorites-dropdown"
+                        ), md=3),
+                        dbc.Col([
+                            html.Div("Durée (minutes)", className="small text-muted"),
+                            dcc.RangeSlider(
+                                id="video-duration", min=0, max=MAX_DURATION_MIN, step=1,
+                                value=[0, MAX_DURATION_MIN], allowCross=False,
+                                tooltip={"placement": "bottom", "always_visible": False}
+                            )
+                        ], md=6),
+                    ]
+                ),
+            ]
+        ),
+
+        html.Div(id="video-results-title", className="fw-bold text-secondary my-3"),
+        html.Div(id="video-results"),
+    ]
+)
+
+# ============================================================
+# 2. CALLBACKS
+# ============================================================
+
+@callback(
+    [Output("video-results", "children"), Output("video-results-title", "children")],
+    [
+        Input("video-query", "value"),
+        Input("video-platform", "value"),
+        Input("video-min-views", "value"),
+        Input("video-duration", "value"),
+    ]
+)
+def update_video_search(query, platform, min_views, duration):
+    """Interroge l'index plein texte avec les filtres et affiche les vidéos classées."""
+    low, high = duration or (0, MAX_DURATION_MIN)
+    # Curseur au maximum : pas de borne haute (les vidéos ajoutées depuis peuvent être plus longues)
+    bounds = (low * 60, None if high >= MAX_DURATION_MIN else high * 60)
+    results = data_manager.video_index.search(
+        query, platform=platform or "all", duration=bounds, views=(min_views or 0, None), k=MAX_RESULTS
+    )
+
+    if not results:
+        return html.Div("Aucune vidéo ne correspond à cette recherche.", className="text-muted fst-italic"), "Aucune vidéo"
+
+    cards = dbc.Row(className="g-3", children=[dbc.Col(render_video_card(v), md=4) for v, _ in results])
+    return cards, f"Vidéos ({len(results)})"
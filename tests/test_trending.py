@@ -0,0 +1,32 @@
+"""
+Tests de non-régression du moteur de tendances (TrendingEngine).
+"""
+
+from functions import TimeSeriesStore, TrendingEngine
+
+
+def make_creator(creator_id, tags, views):
+    """Créateur YouTube minimal dont l'historique mensuel de vues est `views`."""
+    return {
+        "id": creator_id,
+        "tags": tags,
+        "history": {"youtube": [{"views": v} for v in views]},
+    }
+
+
+def test_removed_tag_does_not_enter_tag_top_k():
+    # 15 créateurs "x" : les 10 premiers en croissance forte, les 5 derniers presque à plat
+    creators = [make_creator(i, ["x", "y"] if i == 0 else ["x"], [100, 200, 400]) for i in range(10)]
+    creators += [make_creator(i, ["x", "y"], [100, 101, 102]) for i in range(10, 15)]
+    timeseries = TimeSeriesStore(creators)
+    engine = TrendingEngine(timeseries, creators, ["YouTube"])
+    assert "14" not in [cid for cid, _ in engine.top_creators("all", "x")]
+
+    # Le créateur 14 perd le tag "x" et voit ses vues bondir
+    updated = make_creator(14, ["y"], [100, 101, 10_000])
+    creators[14] = updated
+    timeseries.rebuild(creators)
+    engine.upsert(updated)
+
+    assert "14" not in [cid for cid, _ in engine.top_creators("all", "x")]
+    assert engine.top_creators("all", "y")[0][0] == "14"